@@ -1,53 +1,410 @@
-from flask import Flask, render_template, jsonify
+from flask import Blueprint, Flask, Response, current_app, g, render_template, jsonify, request, send_file, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import and_, event, func, or_
+from sqlalchemy.exc import IntegrityError
+from datetime import datetime, timedelta
+import base64
+import cProfile
+import io
+import math
+import os
+import re
+import socket
+import sqlite3
+import threading
 import time
 import json
-from arbitrator_finder import search_arbitrator_cases
+from functools import lru_cache
+import http_pool
+import outbound_scheduler
+from arbitrator_finder import DEFAULT_BASE_URL, best_match, search_arbitrator_cases
+from conflict_rules import DEFAULT_ALIASES_PATH, DEFAULT_RULES_PATH, load_aliases, load_rules, prescreen
+import deadlines
+import dossier_index
+import migrations
+import model_cascade
+from party_index import PartyIndex, Posting
+from prompt_encoder import DEFAULT_TOKEN_BUDGET, encode_prompt
+from report_renderer import FORMATS as REPORT_FORMATS, ReportRenderer
+from single_flight import SingleFlight
+from tracing import end_trace, span, start_trace
 
-app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///arbitrators.db'
-db = SQLAlchemy(app)
+db = SQLAlchemy()
+bp = Blueprint('main', __name__)
 
-# Add your JusMundi API key here
-API_KEY = "your_api_key_here"  # TODO: Move to environment variable
+# Concurrent identical screenings within this process share one crawl
+screenings = SingleFlight()
+
+# Background report renderer of this process, created by init_worker
+reports = None
+
+def env_flag(name, default='0'):
+    return os.environ.get(name, default).lower() in ('1', 'true', 'yes', 'on')
+
+def database_url(url):
+    """SQLAlchemy URL for DATABASE_URL, accepting the postgres:// scheme hosting providers hand out."""
+    if url.startswith('postgres://'):
+        return 'postgresql://' + url[len('postgres://'):]
+    return url
+
+def load_config():
+    """Read the app configuration from environment variables."""
+    return {
+        # SQLite file by default; point at PostgreSQL to share data between web nodes
+        'SQLALCHEMY_DATABASE_URI': database_url(os.environ.get('DATABASE_URL', 'sqlite:///arbitrators.db')),
+        'DB_POOL_SIZE': int(os.environ.get('DB_POOL_SIZE', 5)),
+        'DB_MAX_OVERFLOW': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'DB_POOL_TIMEOUT': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        # Reconnect before server or proxy idle timeouts (e.g. PgBouncer) drop the connection
+        'DB_POOL_RECYCLE': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+        # PostgreSQL only: statements running longer are cancelled (0 disables)
+        'DB_STATEMENT_TIMEOUT_MS': int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 30000)),
+        # Rows fetched per round trip when large listings are streamed from a server-side cursor
+        'DB_STREAM_BATCH': int(os.environ.get('DB_STREAM_BATCH', 1000)),
+        # Applied to every SQLite connection; WAL lets readers run during bulk imports
+        'SQLITE_PRAGMAS': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'busy_timeout': 5000,
+            'cache_size': -64000,
+            'temp_store': 'MEMORY',
+        },
+        'JUSMUNDI_API_KEY': os.environ.get('JUSMUNDI_API_KEY', 'your_api_key_here'),
+        'JUSMUNDI_BASE_URL': os.environ.get('JUSMUNDI_BASE_URL', DEFAULT_BASE_URL),
+        'CONFLICT_RULES_PATH': os.environ.get('CONFLICT_RULES_PATH', DEFAULT_RULES_PATH),
+        'OPENAI_API_KEY': os.environ.get('OPENAI_API_KEY', ''),
+        'PROMPT_TOKEN_BUDGET': int(os.environ.get('PROMPT_TOKEN_BUDGET', DEFAULT_TOKEN_BUDGET)),
+        # Model tiers and escalation rules of the LLM classification
+        'MODEL_CASCADE_PATH': os.environ.get('MODEL_CASCADE_PATH', model_cascade.DEFAULT_POLICY_PATH),
+        'DOSSIER_INDEX_PATH': dossier_index.DEFAULT_INDEX_PATH,
+        'PARTY_ALIASES_PATH': os.environ.get('PARTY_ALIASES_PATH', DEFAULT_ALIASES_PATH),
+        # Debug switch: when set, requests with ?profile=1 are profiled to a .prof file here
+        'PROFILE_DIR': os.environ.get('PROFILE_DIR'),
+        'HTTP_POOL_CONNECTIONS': int(os.environ.get('HTTP_POOL_CONNECTIONS', 10)),
+        'HTTP_POOL_MAXSIZE': int(os.environ.get('HTTP_POOL_MAXSIZE', 20)),
+        # Coordinate identical screenings across worker processes through the database
+        'SCREENING_DB_LOCK': env_flag('SCREENING_DB_LOCK'),
+        # A screening is bounded by SEARCH_DEADLINE_SECONDS, so a lock held much longer
+        # belongs to a worker that died mid-screening
+        'SCREENING_LOCK_STALE_SECONDS': int(os.environ.get('SCREENING_LOCK_STALE_SECONDS', 60)),
+        'SCREENING_RESULT_TTL_SECONDS': int(os.environ.get('SCREENING_RESULT_TTL_SECONDS', 30)),
+        # Cases one screening crawls and stores; the paged case listing shows these
+        'SCREENING_MAX_CASES': int(os.environ.get('SCREENING_MAX_CASES', 40)),
+        # Time budget of one JusMundi search; past it the search returns partial results
+        'SEARCH_DEADLINE_SECONDS': float(os.environ.get('SEARCH_DEADLINE_SECONDS', 20)),
+        # The JusMundi key's whole quota (0 disables scheduling); init_worker splits it
+        # between the worker processes, see outbound_scheduler
+        'OUTBOUND_RATE': float(os.environ.get('OUTBOUND_RATE', 5)),
+        'OUTBOUND_BURST': int(os.environ.get('OUTBOUND_BURST', 10)),
+        'OUTBOUND_MAX_WAIT_SECONDS': float(os.environ.get('OUTBOUND_MAX_WAIT_SECONDS', 20)),
+        # Worker processes sharing the quota when the server does not say (gunicorn does)
+        'WEB_CONCURRENCY': int(os.environ.get('WEB_CONCURRENCY', 1)),
+        # Rendered conflict reports, one directory per arbitrator
+        'REPORT_DIR': os.environ.get('REPORT_DIR', 'reports'),
+        'REPORT_WORKERS': int(os.environ.get('REPORT_WORKERS', 2)),
+        'OUTBOUND_WEIGHTS': {
+            'interactive': int(os.environ.get('OUTBOUND_WEIGHT_INTERACTIVE', 8)),
+            'batch': int(os.environ.get('OUTBOUND_WEIGHT_BATCH', 1)),
+        },
+    }
+
+def engine_options(config):
+    """SQLAlchemy engine options for the configured database and pool settings."""
+    uri = config['SQLALCHEMY_DATABASE_URI']
+    if uri.startswith('sqlite') and (uri in ('sqlite://', 'sqlite:///') or ':memory:' in uri):
+        # In-memory SQLite lives on a single static connection
+        return {}
+    options = {
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': True,
+    }
+    if uri.startswith('postgresql'):
+        # Name connections per node in pg_stat_activity and bound runaway queries
+        settings = f"-c statement_timeout={config['DB_STATEMENT_TIMEOUT_MS']}"
+        options['connect_args'] = {
+            'application_name': f'mundi@{socket.gethostname()}'[:63],
+            'options': settings,
+        }
+    return options
+
+def create_app(config=None):
+    """
+    Build the Flask app.
+
+    Args:
+        config (dict, optional): Settings overriding the environment-driven defaults
+
+    Returns:
+        Flask: Configured application
+    """
+    app = Flask(__name__)
+    app.config.from_mapping(load_config())
+    if config:
+        app.config.update(config)
+    app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(app.config))
+
+    db.init_app(app)
+    with app.app_context():
+        if db.engine.dialect.name == 'sqlite':
+            set_sqlite_pragmas(db.engine, app.config['SQLITE_PRAGMAS'])
+    app.register_blueprint(bp)
+    init_worker(app)
+    return app
+
+def set_sqlite_pragmas(engine, pragmas):
+    """Run the configured PRAGMA statements on every new connection of engine."""
+    @event.listens_for(engine, 'connect')
+    def _on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+def init_worker(app, workers=None):
+    """
+    Give the current process its own HTTP session pool, outbound scheduler, report
+    renderer and database connection pool.
+
+    Call this after forking a worker from a preloaded app so no sockets are shared
+    with the parent.
+
+    Args:
+        workers (int, optional): Worker processes sharing the outbound quota
+            (default: the WEB_CONCURRENCY setting)
+    """
+    http_pool.configure(
+        pool_connections=app.config['HTTP_POOL_CONNECTIONS'],
+        pool_maxsize=app.config['HTTP_POOL_MAXSIZE'],
+    )
+    if app.config['OUTBOUND_RATE'] > 0:
+        # Each process holds its own bucket, so it gets an equal share of the key's quota
+        workers = max(1, workers or app.config['WEB_CONCURRENCY'])
+        outbound_scheduler.install(outbound_scheduler.FairScheduler(
+            rate=app.config['OUTBOUND_RATE'] / workers,
+            burst=max(1, app.config['OUTBOUND_BURST'] // workers),
+            weights=app.config['OUTBOUND_WEIGHTS'],
+            max_wait=app.config['OUTBOUND_MAX_WAIT_SECONDS'],
+        ))
+    else:
+        outbound_scheduler.install(None)
+    global reports
+    reports = ReportRenderer(app.config['REPORT_DIR'], workers=app.config['REPORT_WORKERS'])
+    with app.app_context():
+        db.engine.dispose(close=False)
 
 class Arbitrator(db.Model):
+    # The name is the natural key used by bulk imports to upsert
+    __table_args__ = (db.Index('ix_arbitrator_name', 'name', unique=True),)
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100), nullable=False)
     specialization = db.Column(db.String(200))
     experience_years = db.Column(db.Integer)
     cases_handled = db.Column(db.Integer)
 
-@app.route('/')
+class CaseRecord(db.Model):
+    """A case from the arbitrator's last screening, stored for paginated listing."""
+    __table_args__ = (
+        db.UniqueConstraint('arbitrator_id', 'case_id'),
+        # Serves the keyset pagination order of /api/arbitrators/<id>/cases
+        db.Index('ix_case_record_listing', 'arbitrator_id', 'start_date', 'id'),
+        # Keeps the max(fetched_at) version checks of the party and interval indexes cheap
+        db.Index('ix_case_record_fetched_at', 'fetched_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    arbitrator_id = db.Column(db.Integer, db.ForeignKey('arbitrator.id'), nullable=False)
+    individual = db.Column(db.String(200), nullable=False)
+    case_id = db.Column(db.String(64), nullable=False)
+    title = db.Column(db.String(500))
+    reference = db.Column(db.String(200))
+    organization = db.Column(db.String(100))
+    status = db.Column(db.String(100))
+    # ISO dates ('' when unknown) so they sort as text on every backend
+    start_date = db.Column(db.String(32), nullable=False, default='')
+    end_date = db.Column(db.String(32), nullable=False, default='')
+    parties = db.Column(db.Text, nullable=False, default='[]')
+    fetched_at = db.Column(db.DateTime, nullable=False)
+
+# Fields /api/arbitrators/<id>/cases can return, by name in the response
+CASE_FIELDS = {
+    'id': CaseRecord.case_id,
+    'individual': CaseRecord.individual,
+    'title': CaseRecord.title,
+    'reference': CaseRecord.reference,
+    'organization': CaseRecord.organization,
+    'status': CaseRecord.status,
+    'start_date': CaseRecord.start_date,
+    'end_date': CaseRecord.end_date,
+    'parties': CaseRecord.parties,
+}
+
+class ScreeningLock(db.Model):
+    """Cross-worker lock (and short-lived result) for one screening key."""
+    key = db.Column(db.String(255), primary_key=True)
+    owner = db.Column(db.String(100), nullable=False)
+    acquired_at = db.Column(db.DateTime, nullable=False)
+    finished_at = db.Column(db.DateTime)
+    result = db.Column(db.Text)
+
+@bp.before_app_request
+def begin_request_trace():
+    g.trace, g.trace_token = start_trace()
+    g.profiler = None
+    if current_app.config['PROFILE_DIR'] and request.args.get('profile') == '1':
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+@bp.after_app_request
+def finish_request_trace(response):
+    trace = g.pop('trace', None)
+    if trace is None:
+        return response
+    end_trace(g.pop('trace_token'))
+
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        os.makedirs(current_app.config['PROFILE_DIR'], exist_ok=True)
+        path = os.path.join(
+            current_app.config['PROFILE_DIR'],
+            f"{request.endpoint or 'unknown'}-{datetime.utcnow():%Y%m%dT%H%M%S%f}.prof",
+        )
+        profiler.dump_stats(path)
+        response.headers['X-Profile-File'] = os.path.basename(path)
+
+    response.headers['Server-Timing'] = trace.server_timing()
+    current_app.logger.info(json.dumps({
+        'event': 'request_trace',
+        'method': request.method,
+        'path': request.path,
+        'endpoint': request.endpoint,
+        'status': response.status_code,
+        'total_ms': round(trace.elapsed() * 1000, 2),
+        'stages': trace.summary(),
+    }))
+    return response
+
+@bp.route('/')
 def index():
     return render_template('index.html')
 
-@app.route('/api/arbitrators')
+@bp.route('/api/arbitrators')
 def get_arbitrators():
-    arbitrators = Arbitrator.query.all()
-    return jsonify([{
-        'id': a.id,
-        'name': a.name,
-        'specialization': a.specialization,
-        'experience_years': a.experience_years,
-        'cases_handled': a.cases_handled
-    } for a in arbitrators])
-
-@app.route('/api/conflicts/<int:arbitrator_id>')
-def get_conflicts(arbitrator_id):
-    arbitrator = Arbitrator.query.get_or_404(arbitrator_id)
-    
+    # Streamed from a server-side cursor so large rosters are never held in memory at once
+    rows = db.session.query(
+        Arbitrator.id, Arbitrator.name, Arbitrator.specialization,
+        Arbitrator.experience_years, Arbitrator.cases_handled,
+    ).order_by(Arbitrator.id).yield_per(current_app.config['DB_STREAM_BATCH'])
+
+    def generate():
+        yield '['
+        for i, row in enumerate(rows):
+            yield (',' if i else '') + json.dumps(row._asdict())
+        yield ']'
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+@bp.route('/healthz')
+def liveness():
+    return jsonify({'status': 'ok'})
+
+@bp.route('/readyz')
+def readiness():
     try:
-        # Call the arbitrator finder script
-        results = search_arbitrator_cases(API_KEY, arbitrator.name, max_cases=10)
-        
-        if not results:
-            return jsonify({
-                'status': 'no_results',
-                'message': f'No results found for arbitrator {arbitrator.name}'
-            })
+        version = migrations.current_version(db.session.connection())
+    except Exception as e:
+        return jsonify({'status': 'unavailable', 'message': str(e)}), 503
+    if version < migrations.HEAD:
+        # Keeps the load balancer off this node until `python migrations.py upgrade` has run
+        return jsonify({
+            'status': 'unavailable',
+            'message': f'Database schema is at version {version}, expected {migrations.HEAD}',
+        }), 503
+    return jsonify({'status': 'ready'})
+
+@bp.route('/api/llm/stats')
+def llm_stats():
+    """Calls, failures, escalations, tokens, cost and latency per cascade tier in this worker."""
+    return jsonify({'status': 'success', 'tiers': model_cascade.stats()})
+
+@lru_cache(maxsize=None)
+def cached_rules(path):
+    return load_rules(path)
+
+@lru_cache(maxsize=None)
+def cached_aliases(path):
+    return load_aliases(path)
 
-        # Format the results for display
+def prescreen_cases(individuals):
+    """Rule pre-screen with the configured rules and the party alias table the party index uses."""
+    config = current_app.config
+    return prescreen(individuals, cached_rules(config['CONFLICT_RULES_PATH']), aliases=cached_aliases(config['PARTY_ALIASES_PATH']))
+
+@lru_cache(maxsize=None)
+def cached_policy(path):
+    return model_cascade.load_policy(path)
+
+def store_cases(arbitrator_id, results):
+    """
+    Replace the stored cases of an arbitrator with those from a fresh screening.
+
+    Cases a partial screening could not fetch keep their stored copy.
+    """
+    now = datetime.utcnow()
+    missing = [str(case_id) for individual in results for case_id in individual.get('missing_case_ids', [])]
+    stale = CaseRecord.query.filter_by(arbitrator_id=arbitrator_id)
+    if missing:
+        stale = stale.filter(CaseRecord.case_id.notin_(missing))
+    stale.delete(synchronize_session=False)
+    seen = set(missing)
+    for individual in results:
+        for case in individual.get('cases', []):
+            if str(case['id']) in seen:
+                continue
+            seen.add(str(case['id']))
+            db.session.add(CaseRecord(
+                arbitrator_id=arbitrator_id,
+                individual=individual['name'],
+                case_id=str(case['id']),
+                title=case['title'],
+                reference=case['reference'],
+                organization=case['organization'],
+                status=case['status'],
+                start_date=case['startDate'] or '',
+                end_date=case['endDate'] or '',
+                parties=json.dumps(case['parties']),
+                fetched_at=now,
+            ))
+    db.session.commit()
+
+def screen_arbitrator(arbitrator_id, name, max_cases=10):
+    """Run a full JusMundi screening for one arbitrator and format it for display."""
+    suggestions = []
+    results = search_arbitrator_cases(
+        current_app.config['JUSMUNDI_API_KEY'],
+        name,
+        max_cases=max_cases,
+        base_url=current_app.config['JUSMUNDI_BASE_URL'],
+        suggestions=suggestions,
+    )
+    # Runners-up with a similar name are shown, but their cases belong to someone else
+    matched = best_match(results)
+    with span('store'):
+        store_cases(arbitrator_id, matched)
+
+    if not results:
+        return {
+            'status': 'no_results',
+            'message': f'No results found for arbitrator {name}',
+            'did_you_mean': suggestions,
+        }
+
+    # Format the results for display
+    with span('formatting'):
         formatted_results = []
         for individual in results:
             cases_info = []
@@ -64,23 +421,664 @@ def get_conflicts(arbitrator_id):
 
             formatted_results.append({
                 'name': individual['name'],
+                'best_match': individual.get('best_match', True),
                 'details': individual['details'],
                 'cases': cases_info
             })
 
-        return jsonify({
-            'status': 'success',
-            'arbitrator': arbitrator.name,
-            'results': formatted_results
-        })
+    with span('prescreen'):
+        screening = prescreen_cases(matched)
+
+    missing_case_ids = [case_id for individual in matched for case_id in individual.get('missing_case_ids', [])]
+    return {
+        'status': 'success',
+        'arbitrator': name,
+        'results': formatted_results,
+        'prescreen': screening,
+        # The search deadline ran out; these cases were found but not fetched
+        'partial': any(individual.get('partial') for individual in matched),
+        'missing_case_ids': missing_case_ids,
+        # Other individuals matching the name, ranked lower and not crawled
+        'did_you_mean': suggestions,
+    }
+
+def screen_arbitrator_locked(key, arbitrator_id, name, max_cases=10):
+    """
+    Run screen_arbitrator at most once across all workers sharing the database.
+
+    The first worker to insert the ScreeningLock row for key runs the screening and
+    stores its result on the row; the others poll the row and reuse that result.
+    A lock older than SCREENING_LOCK_STALE_SECONDS is taken over, and waiting stops
+    when the request's deadline passes.
+
+    Raises:
+        deadlines.DeadlineExceeded: If the deadline passes while another worker holds the lock
+    """
+    owner = f"{socket.gethostname()}:{os.getpid()}"
+    stale_after = timedelta(seconds=current_app.config['SCREENING_LOCK_STALE_SECONDS'])
+    result_ttl = timedelta(seconds=current_app.config['SCREENING_RESULT_TTL_SECONDS'])
+
+    while True:
+        try:
+            db.session.add(ScreeningLock(key=key, owner=owner, acquired_at=datetime.utcnow()))
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+        else:
+            break
+
+        # Another worker holds the key: reuse its result or wait for it
+        lock = db.session.get(ScreeningLock, key)
+        now = datetime.utcnow()
+        if lock is None:
+            continue
+        if lock.finished_at is not None:
+            if now - lock.finished_at <= result_ttl:
+                return json.loads(lock.result)
+            db.session.delete(lock)
+            db.session.commit()
+            continue
+        if now - lock.acquired_at > stale_after:
+            # The holder most likely died mid-screening
+            db.session.delete(lock)
+            db.session.commit()
+            continue
+        if deadlines.expired():
+            raise deadlines.DeadlineExceeded(f"Time budget exhausted waiting for the screening running on {lock.owner}")
+        # Read the row afresh next time, and let the next insert attempt use its key
+        db.session.expunge(lock)
+        left = deadlines.remaining()
+        time.sleep(0.5 if left is None else min(0.5, max(left, 0)))
+
+    try:
+        payload = screen_arbitrator(arbitrator_id, name, max_cases=max_cases)
+    except Exception:
+        db.session.rollback()
+        ScreeningLock.query.filter_by(key=key, owner=owner).delete()
+        db.session.commit()
+        raise
 
+    lock = db.session.get(ScreeningLock, key)
+    if lock is not None and lock.owner == owner:
+        lock.result = json.dumps(payload)
+        lock.finished_at = datetime.utcnow()
+        db.session.commit()
+    return payload
+
+def request_client():
+    """
+    The (user, job class) this request's outbound calls are charged to.
+
+    The user comes from the X-User header (else the client address); the job class
+    from ?class= or X-Job-Class, 'interactive' unless the caller says 'batch'.
+    """
+    user = request.headers.get('X-User') or request.remote_addr or 'anonymous'
+    job_class = request.args.get('class') or request.headers.get('X-Job-Class') or 'interactive'
+    if job_class not in current_app.config['OUTBOUND_WEIGHTS']:
+        raise ValueError(f"Unknown job class {job_class!r}")
+    return user, job_class
+
+def screening_calls(max_cases):
+    """Outbound calls a screening of one individual makes: search, lookup, pages, cases."""
+    return 2 + math.ceil(max_cases / 3) + max_cases
+
+def queued_response(queued):
+    """202 response telling the client to come back when the quota has room."""
+    return jsonify({
+        'status': 'queued',
+        'message': str(queued),
+        'position': queued.position,
+        'retry_after': queued.retry_after,
+    }), 202, {'Retry-After': str(queued.retry_after)}
+
+def run_screening(arbitrator, max_cases=None, client=('anonymous', 'interactive')):
+    """
+    Screen an arbitrator, sharing the work with identical screenings already running.
+
+    Args:
+        arbitrator (Arbitrator): Arbitrator to screen
+        max_cases (int, optional): Cases to crawl (default: SCREENING_MAX_CASES)
+        client (tuple): (user, job class) the outbound calls are charged to
+
+    Raises:
+        outbound_scheduler.Queued: If the outbound quota cannot take the screening now
+    """
+    if max_cases is None:
+        max_cases = current_app.config['SCREENING_MAX_CASES']
+    key = f"{arbitrator.name}|max_cases={max_cases}"
+    scheduler = outbound_scheduler.get_scheduler()
+    if scheduler is not None and key not in screenings.in_flight():
+        # Joining a running screening costs nothing, so only new crawls are admitted
+        scheduler.admit(*client, calls=screening_calls(max_cases))
+    # Covers the stages below when this request leads, or the wait when it joins another
+    with span('screening'), outbound_scheduler.client(*client), \
+            deadlines.deadline(current_app.config['SEARCH_DEADLINE_SECONDS']):
+        if current_app.config['SCREENING_DB_LOCK']:
+            payload, _ = screenings.do(key, screen_arbitrator_locked, key, arbitrator.id, arbitrator.name, max_cases)
+        else:
+            payload, _ = screenings.do(key, screen_arbitrator, arbitrator.id, arbitrator.name, max_cases)
+    return payload
+
+@bp.route('/api/conflicts/<int:arbitrator_id>')
+def get_conflicts(arbitrator_id):
+    arbitrator = Arbitrator.query.get_or_404(arbitrator_id)
+    try:
+        client = request_client()
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+    try:
+        payload = run_screening(arbitrator, client=client)
+        response = jsonify(payload)
+        if payload.get('status') in ('success', 'no_results') and not payload.get('partial'):
+            # Lets the page's result cache revalidate with If-None-Match
+            response.add_etag()
+            response = response.make_conditional(request)
+        return response
+
+    except outbound_scheduler.Queued as e:
+        return queued_response(e)
+    except deadlines.DeadlineExceeded as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 504
     except Exception as e:
         return jsonify({
             'status': 'error',
             'message': str(e)
         }), 500
 
+def encode_cursor(start_date, row_id):
+    return base64.urlsafe_b64encode(json.dumps([start_date, row_id]).encode()).decode()
+
+def decode_cursor(cursor):
+    start_date, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    return str(start_date), int(row_id)
+
+@bp.route('/api/arbitrators/<int:arbitrator_id>/cases')
+def get_arbitrator_cases(arbitrator_id):
+    """
+    List an arbitrator's cases, newest first, one page at a time.
+
+    Query parameters: cursor (from the previous page's next_cursor), limit (max 100),
+    fields (comma-separated subset of CASE_FIELDS), organization, status, date_from
+    and date_to (YYYY-MM-DD, on the start date) and refresh=1 to screen again.
+    """
+    arbitrator = Arbitrator.query.get_or_404(arbitrator_id)
+    args = request.args
+
+    try:
+        limit = min(max(int(args.get('limit', 20)), 1), 100)
+        fields = args.get('fields')
+        fields = [f.strip() for f in fields.split(',') if f.strip()] if fields else list(CASE_FIELDS)
+        unknown = [f for f in fields if f not in CASE_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        for bound in ('date_from', 'date_to'):
+            if args.get(bound) and not re.fullmatch(r'\d{4}-\d{2}-\d{2}', args[bound]):
+                raise ValueError(f"{bound} must be YYYY-MM-DD")
+        cursor = decode_cursor(args['cursor']) if args.get('cursor') else None
+        client = request_client()
+    except (ValueError, TypeError) as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+    stored = db.session.query(CaseRecord.id).filter_by(arbitrator_id=arbitrator.id).first()
+    if stored is None or args.get('refresh') == '1':
+        try:
+            run_screening(arbitrator, client=client)
+        except outbound_scheduler.Queued as e:
+            return queued_response(e)
+        except deadlines.DeadlineExceeded as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 504
+        except Exception as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 500
+
+    query = db.session.query(CaseRecord.id.label('_id'), CaseRecord.start_date.label('_start'), *(CASE_FIELDS[f].label(f) for f in fields)) \
+        .filter(CaseRecord.arbitrator_id == arbitrator.id)
+    if args.get('organization'):
+        query = query.filter(CaseRecord.organization == args['organization'])
+    if args.get('status'):
+        query = query.filter(CaseRecord.status == args['status'])
+    if args.get('date_from'):
+        query = query.filter(CaseRecord.start_date >= args['date_from'])
+    if args.get('date_to'):
+        # Compare the date part only so timestamps on date_to itself are included
+        query = query.filter(func.substr(CaseRecord.start_date, 1, 10) <= args['date_to'])
+    if cursor:
+        start_date, row_id = cursor
+        query = query.filter(or_(
+            CaseRecord.start_date < start_date,
+            and_(CaseRecord.start_date == start_date, CaseRecord.id < row_id),
+        ))
+
+    rows = query.order_by(CaseRecord.start_date.desc(), CaseRecord.id.desc()).limit(limit + 1).all()
+    page = rows[:limit]
+
+    cases = []
+    for row in page:
+        case = {f: getattr(row, f) for f in fields}
+        if 'parties' in case:
+            case['parties'] = json.loads(case['parties'])
+        cases.append(case)
+
+    next_cursor = encode_cursor(page[-1]._start, page[-1]._id) if len(rows) > limit else None
+    return jsonify({
+        'status': 'success',
+        'arbitrator': arbitrator.name,
+        'cases': cases,
+        'next_cursor': next_cursor,
+    })
+
+@bp.route('/api/dossiers/search')
+def search_dossiers():
+    """Ranked full-text search over saved research dossiers (?q=phrase or FTS5 query)."""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'status': 'error', 'message': 'q is required'}), 400
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 100)
+
+    try:
+        results = dossier_index.search(query, limit=limit, path=current_app.config['DOSSIER_INDEX_PATH'])
+    except sqlite3.OperationalError as e:
+        # Malformed FTS5 expressions surface as OperationalError
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+    return jsonify({'status': 'success', 'query': query, **results})
+
+# Reverse party index over all stored cases, rebuilt when the stored cases change
+_party_index = {'version': None, 'index': None}
+_party_index_lock = threading.Lock()
+
+def get_party_index():
+    """Return the party index for the current CaseRecord contents, rebuilding it if stale."""
+    version = db.session.query(func.count(CaseRecord.id), func.max(CaseRecord.id), func.max(CaseRecord.fetched_at)).one()
+    version = tuple(version)
+    with _party_index_lock:
+        if _party_index['version'] == version:
+            return _party_index['index']
+
+        index = PartyIndex(cached_aliases(current_app.config['PARTY_ALIASES_PATH']))
+        rows = db.session.query(
+            CaseRecord.arbitrator_id, Arbitrator.name, CaseRecord.case_id, CaseRecord.title,
+            CaseRecord.reference, CaseRecord.start_date, CaseRecord.parties,
+        ).join(Arbitrator, Arbitrator.id == CaseRecord.arbitrator_id)
+        for arbitrator_id, name, case_id, title, reference, start_date, parties in rows.yield_per(current_app.config['DB_STREAM_BATCH']):
+            for party in json.loads(parties):
+                index.add(Posting(arbitrator_id, name, case_id, title, reference, start_date, party.get('name', ''), party.get('role', '')))
+
+        _party_index.update(version=version, index=index)
+        return index
+
+# Appointment interval index over all stored cases, rebuilt like the party index
+_intervals = {'version': None, 'index': None}
+_intervals_lock = threading.Lock()
+
+def get_appointment_intervals():
+    """Return the interval index for the current CaseRecord contents and roster."""
+    # numpy is only loaded once availability is first queried
+    from appointment_intervals import AppointmentIntervals
+
+    version = tuple(db.session.query(func.count(CaseRecord.id), func.max(CaseRecord.id), func.max(CaseRecord.fetched_at)).one()) \
+        + (Arbitrator.query.count(),)
+    with _intervals_lock:
+        if _intervals['version'] == version:
+            return _intervals['index']
+
+        rows = db.session.query(
+            CaseRecord.arbitrator_id, CaseRecord.case_id, CaseRecord.start_date, CaseRecord.end_date, CaseRecord.status,
+        )
+        roster = [arbitrator_id for (arbitrator_id,) in db.session.query(Arbitrator.id).order_by(Arbitrator.id)]
+        index = AppointmentIntervals(rows.yield_per(current_app.config['DB_STREAM_BATCH']), arbitrators=roster)
+        _intervals.update(version=version, index=index)
+        return index
+
+@bp.route('/api/availability')
+def get_availability():
+    """
+    Caseload of the whole roster for appointment planning.
+
+    Query parameters: date (YYYY-MM-DD, default today), days (planning window,
+    default 365) and max_concurrent (default 3). Returns, per arbitrator, the cases
+    ongoing on date and the peak number of concurrent cases in the window, and the
+    arbitrators whose peak stays below max_concurrent.
+    """
+    on = request.args.get('date') or datetime.utcnow().strftime('%Y-%m-%d')
+    if not re.fullmatch(r'\d{4}-\d{2}-\d{2}', on):
+        return jsonify({'status': 'error', 'message': 'date must be YYYY-MM-DD'}), 400
+    days = min(max(request.args.get('days', 365, type=int), 1), 3660)
+    max_concurrent = max(request.args.get('max_concurrent', 3, type=int), 1)
+
+    intervals = get_appointment_intervals()
+    try:
+        with span('intervals'):
+            ongoing = intervals.ongoing(on)
+            peak, active = intervals.peak_concurrent(on, days)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+    names = dict(db.session.query(Arbitrator.id, Arbitrator.name))
+    screened = {arbitrator_id for (arbitrator_id,) in db.session.query(CaseRecord.arbitrator_id).distinct()}
+    arbitrators = [{
+        'id': arbitrator_id,
+        'name': names.get(arbitrator_id),
+        'ongoing': int(ongoing[i]),
+        'peak_concurrent': int(peak[i]),
+        'cases_in_window': int(active[i]),
+        'available': bool(peak[i] < max_concurrent),
+        # Without stored cases the caseload is unknown rather than zero
+        'screened': arbitrator_id in screened,
+    } for i, arbitrator_id in enumerate(intervals.arbitrators)]
+
+    return jsonify({
+        'status': 'success',
+        'date': on,
+        'days': days,
+        'max_concurrent': max_concurrent,
+        'arbitrators': arbitrators,
+        'available': [a['id'] for a in arbitrators if a['available'] and a['screened']],
+        'undated_cases': intervals.skipped,
+    })
+
+@bp.route('/api/screening', methods=['POST'])
+def screen_new_case():
+    """
+    Screen the parties of a new dispute against the whole roster.
+
+    Body: {"parties": [names]}
+    """
+    body = request.get_json(silent=True) or {}
+    parties = body.get('parties') or []
+    if body.get('counsel'):
+        # Stored cases hold parties only; a party hit is no evidence about counsel
+        return jsonify({'status': 'error', 'message': 'Counsel cannot be screened: stored cases have no counsel data'}), 400
+    if not isinstance(parties, list) or not parties:
+        return jsonify({'status': 'error', 'message': 'Provide a list of "parties"'}), 400
+
+    result = get_party_index().screen(parties)
+    screened = db.session.query(func.count(func.distinct(CaseRecord.arbitrator_id))).scalar()
+    return jsonify({
+        'status': 'success',
+        **result,
+        # Only arbitrators with stored cases can be matched
+        'coverage': {'screened': screened, 'roster': Arbitrator.query.count()},
+    })
+
+def report_data(arbitrator):
+    """
+    Structured report contents from the arbitrator's stored cases, or None if there are none.
+
+    Only what the report says about the cases goes in here, since the report's data
+    version is a digest of it; the fetch time changes on every screening and is
+    passed to the template separately (see report_status).
+    """
+    rows = CaseRecord.query.filter_by(arbitrator_id=arbitrator.id) \
+        .order_by(CaseRecord.start_date.desc(), CaseRecord.id.desc()).all()
+    if not rows:
+        return None
+
+    cases = [{
+        'id': row.case_id,
+        'title': row.title,
+        'reference': row.reference,
+        'organization': row.organization,
+        'status': row.status,
+        'startDate': row.start_date,
+        'endDate': row.end_date,
+        'parties': json.loads(row.parties),
+    } for row in rows]
+    screening = prescreen_cases([{'name': arbitrator.name, 'cases': cases}])
+    return {
+        'arbitrator': {'id': arbitrator.id, 'name': arbitrator.name, 'specialization': arbitrator.specialization},
+        'cases': cases,
+        'prescreen': screening,
+    }
+
+def report_filename(arbitrator, fmt):
+    slug = re.sub(r'[^a-z0-9]+', '-', arbitrator.name.lower()).strip('-') or str(arbitrator.id)
+    return f"conflict-report-{slug}.{fmt}"
+
+def report_status(arbitrator, fmt):
+    """Ensure the arbitrator's report for the current data is rendered or rendering."""
+    data = report_data(arbitrator)
+    if data is None:
+        return {'id': arbitrator.id, 'name': arbitrator.name, 'format': fmt, 'state': 'missing',
+                'message': 'No stored cases; run a screening first'}, None
+    fetched_at = db.session.query(func.max(CaseRecord.fetched_at)).filter(CaseRecord.arbitrator_id == arbitrator.id).scalar()
+    context = {'fetched_at': fetched_at.strftime('%Y-%m-%d %H:%M UTC') if fetched_at else None}
+    state, path, version = reports.ensure(arbitrator.id, data, fmt, context=context)
+    status = {'id': arbitrator.id, 'name': arbitrator.name, 'format': fmt, 'state': state, 'version': version,
+              'url': f"/api/arbitrators/{arbitrator.id}/report.{fmt}"}
+    if state == 'failed':
+        status['message'] = path
+    return status, path if state == 'ready' else None
+
+@bp.route('/api/arbitrators/<int:arbitrator_id>/report.<fmt>')
+def get_report(arbitrator_id, fmt):
+    """Download the arbitrator's conflict report, or 202 while it is being rendered."""
+    arbitrator = Arbitrator.query.get_or_404(arbitrator_id)
+    if fmt not in REPORT_FORMATS:
+        return jsonify({'status': 'error', 'message': f'Unknown report format {fmt!r}'}), 400
+
+    status, path = report_status(arbitrator, fmt)
+    if status['state'] == 'missing':
+        return jsonify({'status': 'error', 'message': status['message']}), 404
+    if status['state'] == 'failed':
+        return jsonify({'status': 'error', 'message': status['message']}), 500
+    if path is None:
+        return jsonify({'status': 'rendering', **status}), 202, {'Retry-After': '1'}
+
+    return send_file(path, mimetype=REPORT_FORMATS[fmt], as_attachment=request.args.get('download') == '1',
+                     download_name=report_filename(arbitrator, fmt), etag=status['version'])
+
+@bp.route('/api/reports', methods=['POST'])
+def render_reports():
+    """
+    Start rendering reports ahead of download.
+
+    Body: {"arbitrator_ids": [ids], "formats": ["html", "pdf"]}
+    """
+    body = request.get_json(silent=True) or {}
+    ids = body.get('arbitrator_ids') or []
+    formats = body.get('formats') or list(REPORT_FORMATS)
+    if not isinstance(ids, list) or not ids or any(f not in REPORT_FORMATS for f in formats):
+        return jsonify({'status': 'error', 'message': 'Provide "arbitrator_ids" and formats among html, pdf'}), 400
+
+    statuses = []
+    for arbitrator in Arbitrator.query.filter(Arbitrator.id.in_(ids)).order_by(Arbitrator.name):
+        for fmt in formats:
+            statuses.append(report_status(arbitrator, fmt)[0])
+    return jsonify({'status': 'success', 'reports': statuses})
+
+@bp.route('/api/reports/bundle')
+def download_report_bundle():
+    """
+    Download the reports of several arbitrators as one zip (?ids=1,2,3&format=pdf).
+
+    Answers 202 with the per-report states until every report is rendered. The zip
+    holds the ready reports and a manifest listing those that could not be made.
+    """
+    fmt = request.args.get('format', 'pdf')
+    try:
+        ids = [int(i) for i in request.args.get('ids', '').split(',') if i.strip()]
+    except ValueError:
+        ids = []
+    if not ids or fmt not in REPORT_FORMATS:
+        return jsonify({'status': 'error', 'message': 'Provide ids=1,2,... and format=html or pdf'}), 400
+
+    arbitrators = Arbitrator.query.filter(Arbitrator.id.in_(ids)).order_by(Arbitrator.name).all()
+    results = [(arbitrator, *report_status(arbitrator, fmt)) for arbitrator in arbitrators]
+    statuses = [status for _, status, _ in results]
+    if any(status['state'] == 'rendering' for status in statuses):
+        return jsonify({'status': 'rendering', 'reports': statuses}), 202, {'Retry-After': '2'}
+
+    # Imported here to keep it off the app's startup path
+    import zipfile
+
+    buffer = io.BytesIO()
+    # PDFs are already compressed
+    compression = zipfile.ZIP_STORED if fmt == 'pdf' else zipfile.ZIP_DEFLATED
+    with zipfile.ZipFile(buffer, 'w', compression) as bundle:
+        for arbitrator, status, path in results:
+            if path is not None:
+                bundle.write(path, report_filename(arbitrator, fmt))
+        bundle.writestr('manifest.json', json.dumps(statuses, indent=2))
+    buffer.seek(0)
+    return send_file(buffer, mimetype='application/zip', as_attachment=True,
+                     download_name=f"conflict-reports-{fmt}.zip")
+
+def sse_event(data, event=None):
+    """Encode one Server-Sent Events message."""
+    message = f"event: {event}\n" if event else ""
+    return message + f"data: {json.dumps(data)}\n\n"
+
+def log_cascade(arbitrator, analysis):
+    """Log one line per cascade with the tiers asked, their latency and cost."""
+    current_app.logger.info(json.dumps({
+        'event': 'llm_cascade',
+        'arbitrator_id': arbitrator.id,
+        'classification': analysis['classification'],
+        'tier': analysis['tier'],
+        'calls': [{k: call[k] for k in ('tier', 'model', 'latency_ms', 'prompt_tokens', 'completion_tokens', 'cost_usd', 'escalated', 'error')}
+                  for call in analysis['calls']],
+    }))
+
+@bp.route('/api/conflicts/<int:arbitrator_id>/classification')
+def classify_arbitrator(arbitrator_id):
+    """
+    Structured conflict classification of the arbitrator's stored cases.
+
+    Settled by the rule pre-screen when it can be; otherwise the cases go through
+    the model cascade, cheapest tier first. The response lists each tier asked
+    with its latency and cost.
+    """
+    arbitrator = Arbitrator.query.get_or_404(arbitrator_id)
+    try:
+        client = request_client()
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+    data = report_data(arbitrator)
+    if data is None:
+        try:
+            run_screening(arbitrator, client=client)
+        except outbound_scheduler.Queued as e:
+            return queued_response(e)
+        except deadlines.DeadlineExceeded as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 504
+        except Exception as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 500
+        data = report_data(arbitrator)
+        if data is None:
+            return jsonify({'status': 'no_results', 'message': f'No cases found for {arbitrator.name}'})
+
+    screening = data['prescreen']
+    if screening['decided']:
+        return jsonify({
+            'status': 'success',
+            'arbitrator': arbitrator.name,
+            'classification': screening['classification'],
+            'source': 'rules',
+            'findings': screening['findings'],
+        })
+
+    individuals = [{'id': arbitrator.id, 'name': arbitrator.name, 'cases': data['cases']}]
+    try:
+        prompt = encode_prompt(individuals, budget=current_app.config['PROMPT_TOKEN_BUDGET'])
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+    try:
+        with span('llm_cascade'):
+            analysis = model_cascade.classify_conflicts(
+                prompt['text'],
+                api_key=current_app.config['OPENAI_API_KEY'],
+                policy=cached_policy(current_app.config['MODEL_CASCADE_PATH']),
+            )
+    except Exception as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 502
+
+    log_cascade(arbitrator, analysis)
+    return jsonify({
+        'status': 'success',
+        'arbitrator': arbitrator.name,
+        'source': 'llm',
+        'prompt_tokens': prompt['tokens'],
+        **analysis,
+    })
+
+@bp.route('/api/conflicts/<int:arbitrator_id>/analysis/stream')
+def stream_analysis(arbitrator_id):
+    """
+    Stream the conflict classification of the arbitrator's stored cases.
+
+    Takes the same path as /classification: the rule pre-screen result comes
+    first, and when it settles the classification no model is asked. Otherwise
+    each tier's answer is relayed as 'token' events while it is generated, a
+    'tier' event closes each tier, and the parsed classification comes last.
+    """
+    arbitrator = Arbitrator.query.get_or_404(arbitrator_id)
+    config = current_app.config
+    try:
+        client = request_client()
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+
+    def generate():
+        try:
+            data = report_data(arbitrator)
+            if data is None:
+                yield sse_event({'message': 'Collecting cases...'}, event='status')
+                run_screening(arbitrator, client=client)
+                data = report_data(arbitrator)
+            if data is None:
+                yield sse_event({'message': f'No cases found for {arbitrator.name}'}, event='error')
+                return
+
+            screening = data['prescreen']
+            yield sse_event(screening, event='prescreen')
+            if screening['decided']:
+                yield sse_event({'classification': screening['classification'], 'source': 'rules',
+                                 'findings': screening['findings']}, event='classification')
+                yield sse_event({}, event='done')
+                return
+
+            individuals = [{'id': arbitrator.id, 'name': arbitrator.name, 'cases': data['cases']}]
+            prompt = encode_prompt(individuals, budget=config['PROMPT_TOKEN_BUDGET'])
+            yield sse_event({
+                'message': f"Classifying {prompt['cases']} of {prompt['cases_available']} cases...",
+                'tokens': prompt['tokens'],
+            }, event='status')
+            calls = []
+            answer = None
+            with span('llm_cascade'):
+                for kind, data, answer in model_cascade.iter_cascade(
+                    prompt['text'],
+                    api_key=config['OPENAI_API_KEY'],
+                    policy=cached_policy(config['MODEL_CASCADE_PATH']),
+                    stream=True,
+                ):
+                    if kind == 'tier':
+                        calls.append(data)
+                    yield sse_event(data, event=kind)
+            analysis = model_cascade.finish_cascade(answer, calls)
+            log_cascade(arbitrator, analysis)
+            yield sse_event(dict(analysis, source='llm', prompt_tokens=prompt['tokens']), event='classification')
+        except outbound_scheduler.Queued as e:
+            yield sse_event({'message': str(e), 'position': e.position, 'retry_after': e.retry_after}, event='queued')
+            return
+        except Exception as e:
+            yield sse_event({'message': str(e)}, event='error')
+            return
+        yield sse_event({}, event='done')
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        # Proxies must pass chunks through as they arrive
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+    )
+
 if __name__ == '__main__':
+    # Development server; use wsgi.py with gunicorn for production
+    app = create_app()
     with app.app_context():
-        db.create_all()
-    app.run(debug=True, port=5001) 
\ No newline at end of file
+        migrations.upgrade(db.engine, log=print)
+    app.run(debug=env_flag('FLASK_DEBUG', '1'), port=int(os.environ.get('PORT', 5001)))
+
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Roster-wide appointment analytics over an arbitrator x case x party matrix.
+
+Builds sparse incidence matrices from fetched case data (the individuals returned by
+arbitrator_finder.search_arbitrator_cases) and computes, for every arbitrator at once:
+
+- repeat appointments: cases in a look-back window (IBA: three years) shared with the same party
+- co-arbitrator frequencies: how often two arbitrators sat on the same case
+- party-side exposure: how often each party appeared as claimant or respondent before them
+"""
+
+import argparse
+import json
+import sys
+
+import numpy as np
+from scipy import sparse
+
+from conflict_rules import DEFAULT_ALIASES_PATH, load_aliases, parse_date, party_key
+
+# IBA Guidelines look back three years for repeat appointments
+DEFAULT_WINDOW_DAYS = 3 * 365 + 1
+
+
+def party_side(role):
+    """Map a party role to 'claimant', 'respondent' or None."""
+    role = (role or "").lower()
+    if "claimant" in role or "applicant" in role:
+        return "claimant"
+    if "respondent" in role:
+        return "respondent"
+    return None
+
+
+class AppointmentMatrices:
+    def __init__(self, individuals, aliases=None):
+        """
+        Index the arbitrators, cases and parties in fetched case data.
+
+        Args:
+            individuals (list): Individuals as returned by search_arbitrator_cases,
+                                each with 'name' and 'cases' (with 'id', 'startDate',
+                                'endDate' and 'parties')
+            aliases (dict, optional): Party alias table from conflict_rules.load_aliases
+                                      (default: party_aliases.json)
+        """
+        if aliases is None:
+            aliases = load_aliases()
+        self.arbitrators = []
+        self.cases = []
+        self.parties = []
+        self.party_names = []
+        arbitrator_index = {}
+        case_index = {}
+        party_index = {}
+        starts = []
+        ends = []
+
+        appointment_rows, appointment_cols = [], []
+        party_rows, party_cols, party_sides = [], [], []
+        side_codes = {"claimant": 1, "respondent": 2, None: 3}
+
+        for individual in individuals:
+            name = individual["name"]
+            if name not in arbitrator_index:
+                arbitrator_index[name] = len(self.arbitrators)
+                self.arbitrators.append(name)
+            a = arbitrator_index[name]
+
+            for case in individual.get("cases", []):
+                case_id = str(case["id"])
+                if case_id not in case_index:
+                    c = case_index[case_id] = len(self.cases)
+                    self.cases.append(case_id)
+                    starts.append(parse_date(case.get("startDate")))
+                    ends.append(parse_date(case.get("endDate")))
+                    for party in case.get("parties", []):
+                        key = party_key(party.get("name", ""), aliases)
+                        if not key:
+                            continue
+                        if key not in party_index:
+                            party_index[key] = len(self.parties)
+                            self.parties.append(key)
+                            self.party_names.append(party["name"])
+                        party_rows.append(c)
+                        party_cols.append(party_index[key])
+                        party_sides.append(side_codes[party_side(party.get("role"))])
+                appointment_rows.append(a)
+                appointment_cols.append(case_index[case_id])
+
+        shape_ac = (len(self.arbitrators), len(self.cases))
+        shape_cp = (len(self.cases), len(self.parties))
+
+        # arbitrator x case, 1 where the arbitrator sat on the case
+        self.appointments = sparse.csr_matrix(
+            (np.ones(len(appointment_rows), dtype=np.int32), (appointment_rows, appointment_cols)),
+            shape=shape_ac,
+        )
+        self.appointments.data[:] = 1  # duplicate appointments collapse to one
+
+        # case x party, one matrix per side; the union is the plain incidence matrix
+        party_sides = np.asarray(party_sides, dtype=np.int8)
+        party_rows = np.asarray(party_rows, dtype=np.int64)
+        party_cols = np.asarray(party_cols, dtype=np.int64)
+
+        def side_matrix(mask):
+            m = sparse.csr_matrix(
+                (np.ones(int(mask.sum()), dtype=np.int32), (party_rows[mask], party_cols[mask])),
+                shape=shape_cp,
+            )
+            m.data[:] = 1
+            return m
+
+        self.claimants = side_matrix(party_sides == side_codes["claimant"])
+        self.respondents = side_matrix(party_sides == side_codes["respondent"])
+        self.case_parties = side_matrix(np.ones(len(party_sides), dtype=bool))
+
+        # Missing or malformed dates (None) become NaT
+        self.case_start = np.array(starts, dtype="datetime64[D]")
+        self.case_end = np.array(ends, dtype="datetime64[D]")
+
+    def window_mask(self, as_of=None, window_days=DEFAULT_WINDOW_DAYS):
+        """Boolean mask of cases that started within window_days before as_of (inclusive)."""
+        as_of = np.datetime64(as_of, "D") if as_of is not None else np.datetime64("today", "D")
+        start = as_of - np.timedelta64(window_days, "D")
+        valid = ~np.isnat(self.case_start)
+        mask = np.zeros(len(self.cases), dtype=bool)
+        mask[valid] = (self.case_start[valid] >= start) & (self.case_start[valid] <= as_of)
+        return mask
+
+
+def repeat_appointments(matrices, as_of=None, window_days=DEFAULT_WINDOW_DAYS):
+    """
+    Count, for every arbitrator and party, the cases in the window they shared.
+
+    Returns:
+        scipy.sparse.csr_matrix: arbitrator x party counts; entries >= 2 are repeat appointments
+    """
+    mask = matrices.window_mask(as_of, window_days).astype(np.int32)
+    windowed = matrices.appointments @ sparse.diags(mask, dtype=np.int32)
+    return (windowed @ matrices.case_parties).tocsr()
+
+
+def co_arbitrator_frequency(matrices):
+    """
+    Count how often each pair of arbitrators sat on the same case.
+
+    Returns:
+        scipy.sparse.csr_matrix: Symmetric arbitrator x arbitrator counts with a zero diagonal
+    """
+    co = (matrices.appointments @ matrices.appointments.T).tolil()
+    co.setdiag(0)
+    co = co.tocsr()
+    co.eliminate_zeros()
+    return co
+
+
+def party_side_exposure(matrices):
+    """
+    Count each party's appearances as claimant and as respondent before each arbitrator.
+
+    Returns:
+        tuple: (claimant, respondent) arbitrator x party csr matrices
+    """
+    claimant = (matrices.appointments @ matrices.claimants).tocsr()
+    respondent = (matrices.appointments @ matrices.respondents).tocsr()
+    return claimant, respondent
+
+
+def _top_entries(row, labels, limit):
+    """Largest entries of one sparse row as (label, count) pairs."""
+    order = np.argsort(-row.data, kind="stable")[:limit]
+    return [(labels[row.indices[i]], int(row.data[i])) for i in order]
+
+
+def summarize(individuals, as_of=None, window_days=DEFAULT_WINDOW_DAYS, min_repeats=2, limit=10, aliases=None):
+    """
+    Compute the analytics for the whole roster in one batch.
+
+    Args:
+        individuals (list): Individuals as returned by search_arbitrator_cases
+        as_of (str, optional): Reference date (YYYY-MM-DD) for the look-back window (default: today)
+        window_days (int, optional): Length of the look-back window (default: three years)
+        min_repeats (int, optional): Cases shared with a party to count as a repeat appointment
+        limit (int, optional): Maximum entries listed per arbitrator
+        aliases (dict, optional): Party alias table (default: party_aliases.json)
+
+    Returns:
+        list: One summary dict per arbitrator
+    """
+    matrices = AppointmentMatrices(individuals, aliases)
+    repeats = repeat_appointments(matrices, as_of, window_days)
+    repeats.data[repeats.data < min_repeats] = 0
+    repeats.eliminate_zeros()
+    co = co_arbitrator_frequency(matrices)
+    claimant, respondent = party_side_exposure(matrices)
+
+    total_cases = np.asarray(matrices.appointments.sum(axis=1)).ravel()
+    claimant_cases = np.asarray((matrices.appointments @ matrices.claimants).sign().sum(axis=1)).ravel()
+    respondent_cases = np.asarray((matrices.appointments @ matrices.respondents).sign().sum(axis=1)).ravel()
+
+    summaries = []
+    for a, name in enumerate(matrices.arbitrators):
+        summaries.append({
+            "arbitrator": name,
+            "cases": int(total_cases[a]),
+            "repeat_appointments": [
+                {"party": party, "cases": count}
+                for party, count in _top_entries(repeats.getrow(a), matrices.party_names, limit)
+            ],
+            "co_arbitrators": [
+                {"name": other, "cases": count}
+                for other, count in _top_entries(co.getrow(a), matrices.arbitrators, limit)
+            ],
+            "party_exposure": {
+                "claimant": [
+                    {"party": party, "cases": count}
+                    for party, count in _top_entries(claimant.getrow(a), matrices.party_names, limit)
+                ],
+                "respondent": [
+                    {"party": party, "cases": count}
+                    for party, count in _top_entries(respondent.getrow(a), matrices.party_names, limit)
+                ],
+                "distinct_claimants": int(claimant_cases[a]),
+                "distinct_respondents": int(respondent_cases[a]),
+            },
+        })
+    return summaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute repeat-appointment analytics for a roster")
+    parser.add_argument("path", help="JSON file with a list of individuals as returned by search_arbitrator_cases")
+    parser.add_argument("--as-of", help="Reference date YYYY-MM-DD (default: today)")
+    parser.add_argument("--window-days", type=int, default=DEFAULT_WINDOW_DAYS, help="Look-back window in days (default: three years)")
+    parser.add_argument("--min-repeats", type=int, default=2, help="Shared cases that make a repeat appointment (default: 2)")
+    parser.add_argument("--aliases", default=DEFAULT_ALIASES_PATH, help="Party alias table (default: party_aliases.json)")
+    args = parser.parse_args()
+
+    with open(args.path, encoding="utf-8") as f:
+        individuals = json.load(f)
+
+    summaries = summarize(individuals, args.as_of, args.window_days, args.min_repeats,
+                          aliases=load_aliases(args.aliases))
+    json.dump(summaries, sys.stdout, indent=2, ensure_ascii=False)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Interval index of appointment periods for availability and caseload planning.
+
+Every case an arbitrator sat on is an interval from its start date to its end date
+(open-ended while the case is pending). The intervals of the whole roster are kept
+in sorted numpy arrays keyed by (arbitrator, day), so both questions below are
+answered for every arbitrator at once with a couple of searchsorted/cumsum passes:
+
+- how many cases each arbitrator has ongoing on a given date
+- the peak number of concurrent cases each arbitrator has in a planning window
+"""
+
+import argparse
+import json
+import sys
+from datetime import date
+
+import numpy as np
+
+from conflict_rules import CONCLUDED_STATUSES
+
+# Sentinel end day for cases that are still running (far past 9999-12-31)
+OPEN_END = 10_000_000
+
+# Day numbers are shifted to be positive inside the (arbitrator, day) sort keys
+DAY_SHIFT = 1_000_000
+KEY_STRIDE = DAY_SHIFT + OPEN_END + 2
+
+DEFAULT_WINDOW_DAYS = 365
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def to_day(value):
+    """Day number of the leading YYYY-MM-DD of an API date, or None when missing."""
+    if not value:
+        return None
+    try:
+        return date.fromisoformat(str(value)[:10]).toordinal() - EPOCH_ORDINAL
+    except ValueError:
+        return None
+
+
+def case_end_day(start, end_date, status):
+    """
+    Last day of a case, OPEN_END while it runs.
+
+    Concluded cases without an end date are taken to have ended when they started so
+    they never count as ongoing; cases with neither an end date nor a concluded status
+    are treated as still running, which is the safe assumption for availability.
+    """
+    end = to_day(end_date)
+    if end is not None:
+        return max(end, start)
+    status = (status or "").lower()
+    if any(s in status for s in CONCLUDED_STATUSES):
+        return start
+    return OPEN_END
+
+
+class AppointmentIntervals:
+    def __init__(self, appointments, arbitrators=()):
+        """
+        Index appointment periods.
+
+        Args:
+            appointments (iterable): (arbitrator, case_id, start_date, end_date, status)
+                tuples; cases without a start date cannot be placed and are skipped
+            arbitrators (iterable, optional): Roster to report on, including those
+                without any cases (default: those appearing in appointments)
+        """
+        self.arbitrators = list(dict.fromkeys(arbitrators))
+        index = {a: i for i, a in enumerate(self.arbitrators)}
+        owners, starts, ends = [], [], []
+        seen = set()
+        self.skipped = 0
+
+        for arbitrator, case_id, start_date, end_date, status in appointments:
+            if (arbitrator, case_id) in seen:
+                continue
+            seen.add((arbitrator, case_id))
+            start = to_day(start_date)
+            if start is None:
+                self.skipped += 1
+                continue
+            if arbitrator not in index:
+                index[arbitrator] = len(self.arbitrators)
+                self.arbitrators.append(arbitrator)
+            owners.append(index[arbitrator])
+            starts.append(start)
+            ends.append(case_end_day(start, end_date, status))
+
+        self.owner = np.asarray(owners, dtype=np.int64)
+        self.start = np.asarray(starts, dtype=np.int64)
+        self.end = np.asarray(ends, dtype=np.int64)
+
+        # Per-arbitrator sorted start and end days, flattened into (arbitrator, day)
+        # keys so one searchsorted call covers the whole roster
+        self._start_keys = np.sort(self.owner * KEY_STRIDE + self.start + DAY_SHIFT)
+        self._end_keys = np.sort(self.owner * KEY_STRIDE + self.end + DAY_SHIFT)
+        self._base = np.arange(len(self.arbitrators), dtype=np.int64) * KEY_STRIDE
+
+    def __len__(self):
+        return len(self.start)
+
+    def ongoing(self, date):
+        """
+        Count the cases each arbitrator has ongoing on date.
+
+        Args:
+            date (str): YYYY-MM-DD
+
+        Returns:
+            numpy.ndarray: Counts aligned with self.arbitrators
+        """
+        day = to_day(date)
+        if day is None:
+            raise ValueError(f"Invalid date {date!r}")
+        key = self._base + day + DAY_SHIFT
+        # Started on or before the day, minus ended before it
+        started = np.searchsorted(self._start_keys, key, side="right") \
+            - np.searchsorted(self._start_keys, self._base, side="left")
+        ended = np.searchsorted(self._end_keys, key, side="left") \
+            - np.searchsorted(self._end_keys, self._base, side="left")
+        return started - ended
+
+    def ongoing_for(self, arbitrator, date):
+        """Number of cases one arbitrator has ongoing on date."""
+        return int(self.ongoing(date)[self.arbitrators.index(arbitrator)])
+
+    def peak_concurrent(self, date, days=DEFAULT_WINDOW_DAYS):
+        """
+        Peak number of simultaneous cases per arbitrator within [date, date + days).
+
+        Returns:
+            tuple: (peak, active) arrays aligned with self.arbitrators, where active
+                   counts the cases overlapping the window at all
+        """
+        first = to_day(date)
+        if first is None:
+            raise ValueError(f"Invalid date {date!r}")
+        last = first + days - 1
+
+        overlaps = (self.start <= last) & (self.end >= first)
+        owner = self.owner[overlaps]
+        # +1 on the first day inside the window, -1 the day after the last one
+        opens = np.maximum(self.start[overlaps], first)
+        closes = np.minimum(self.end[overlaps], last) + 1
+
+        event_owner = np.concatenate([owner, owner])
+        event_day = np.concatenate([opens, closes])
+        event_delta = np.concatenate([np.ones(len(owner), np.int64), -np.ones(len(owner), np.int64)])
+        # Closing events sort before openings on the same day so back-to-back cases do not overlap
+        order = np.lexsort((event_delta, event_day, event_owner))
+        running = np.cumsum(event_delta[order])  # returns to 0 at the end of each arbitrator
+
+        peak = np.zeros(len(self.arbitrators), dtype=np.int64)
+        if len(order):
+            owners_sorted = event_owner[order]
+            group_starts = np.flatnonzero(np.r_[True, owners_sorted[1:] != owners_sorted[:-1]])
+            peak[owners_sorted[group_starts]] = np.maximum.reduceat(running, group_starts)
+        active = np.bincount(owner, minlength=len(self.arbitrators))
+        return peak, active
+
+    def available(self, max_concurrent, date, days=DEFAULT_WINDOW_DAYS):
+        """Arbitrators whose caseload never reaches max_concurrent within the window."""
+        peak, _ = self.peak_concurrent(date, days)
+        return [a for a, p in zip(self.arbitrators, peak) if p < max_concurrent]
+
+    @classmethod
+    def from_individuals(cls, individuals):
+        """Index the cases of individuals as returned by search_arbitrator_cases."""
+        return cls(
+            (individual["name"], str(case["id"]), case.get("startDate"), case.get("endDate"), case.get("status"))
+            for individual in individuals
+            for case in individual.get("cases", [])
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Caseload and availability of a roster over time")
+    parser.add_argument("path", help="JSON file with a list of individuals as returned by search_arbitrator_cases")
+    parser.add_argument("--date", default=str(np.datetime64("today", "D")), help="Reference date YYYY-MM-DD (default: today)")
+    parser.add_argument("--days", type=int, default=DEFAULT_WINDOW_DAYS, help="Planning window in days (default: 365)")
+    parser.add_argument("--max-concurrent", type=int, default=3, help="Concurrent cases that make an arbitrator unavailable (default: 3)")
+    args = parser.parse_args()
+
+    with open(args.path, encoding="utf-8") as f:
+        intervals = AppointmentIntervals.from_individuals(json.load(f))
+
+    ongoing = intervals.ongoing(args.date)
+    peak, active = intervals.peak_concurrent(args.date, args.days)
+    rows = [
+        {
+            "arbitrator": name,
+            "ongoing": int(ongoing[i]),
+            "peak_concurrent": int(peak[i]),
+            "cases_in_window": int(active[i]),
+            "available": bool(peak[i] < args.max_concurrent),
+        }
+        for i, name in enumerate(intervals.arbitrators)
+    ]
+    json.dump(rows, sys.stdout, indent=2, ensure_ascii=False)
+    print()
+
+
+if __name__ == "__main__":
+    main()
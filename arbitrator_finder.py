@@ -11,12 +11,34 @@ import sys
 import json
 import io
 import locale
-from supabase import create_client, Client
-import supabase
-from llama_cloud_services import LlamaParse
 import time
-from llama_index.core import SimpleDirectoryReader
-from openai import OpenAI
+from difflib import SequenceMatcher
+import deadlines
+import http_pool
+import outbound_scheduler
+from tracing import span
+from conflict_rules import DEFAULT_RULES_PATH, load_rules, normalize_name, prescreen
+from model_cascade import DEFAULT_POLICY_PATH, classify_conflicts, load_policy
+from prompt_encoder import DEFAULT_TOKEN_BUDGET, encode_prompt
+
+DEFAULT_BASE_URL = "https://api.jusmundi.com/stanford"
+
+# Name-matched individuals that get the full lookup and case crawl; the rest are
+# returned as "did you mean" suggestions
+DEFAULT_TOP_K = 2
+
+# Runners-up are only crawled when their score is this close to the best match's,
+# i.e. when the name alone cannot tell them apart
+AMBIGUOUS_SCORE_MARGIN = 0.05
+
+# Decisions fetched by the name search, to count how often each candidate appears
+CANDIDATE_SEARCH_COUNT = 10
+
+TRIBUNAL_ROLES = ("arbitrator", "president", "chair", "umpire")
+
+# Case fetches slower than this percentile of recent ones get a hedged duplicate
+HEDGE_PERCENTILE = 95
+case_latency = http_pool.LatencyTracker()
 
 def get_mock_data(name):
     """Return mock data for testing when no API key is provided"""
@@ -60,7 +82,93 @@ def get_mock_data(name):
         ]
     }]
 
-def search_arbitrator_cases(api_key, name, max_cases=10, output_file=None):
+def score_candidate(query, name, role="", appearances=1):
+    """
+    Score how likely a name-matched individual is the arbitrator being searched for.
+    
+    Args:
+        query (str): Name that was searched for
+        name (str): Candidate's name
+        role (str, optional): Candidate's role in the decisions found
+        appearances (int, optional): Number of decisions found that list the candidate
+        
+    Returns:
+        float: Name similarity (0-1) plus bonuses for a tribunal role and frequency
+    """
+    score = SequenceMatcher(None, normalize_name(query), normalize_name(name)).ratio()
+    if any(r in (role or "").lower() for r in TRIBUNAL_ROLES):
+        score += 0.25
+    score += 0.15 * min(appearances, 5) / 5
+    return round(score, 4)
+
+def rank_candidates(name, search_data):
+    """
+    Rank the individuals of a name search response without fetching anything else.
+    
+    Args:
+        name (str): Name that was searched for
+        search_data (dict): JSON:API response of the decisions name search
+        
+    Returns:
+        list: Candidates ({id, name, role, appearances, score}) whose name contains
+              the query, best first
+    """
+    appearances = {}
+    roles = {}
+    for decision in search_data.get("data", []):
+        related = decision.get("relationships", {}).get("individuals", {}).get("data") or []
+        for ref in related:
+            appearances[ref["id"]] = appearances.get(ref["id"], 0) + 1
+            role = (ref.get("meta") or {}).get("role")
+            if role:
+                roles[ref["id"]] = role
+
+    candidates = []
+    for item in search_data.get("included", []):
+        if item["type"] != "individuals":
+            continue
+        individual_name = item["attributes"].get("name", "")
+        # Case-insensitive substring match
+        if name.lower() not in individual_name.lower():
+            continue
+        role = roles.get(item["id"]) or item["attributes"].get("role", "")
+        count = appearances.get(item["id"], 1)
+        candidates.append({
+            "id": item["id"],
+            "name": individual_name,
+            "role": role,
+            "appearances": count,
+            "score": score_candidate(name, individual_name, role, count),
+        })
+
+    candidates.sort(key=lambda c: (-c["score"], c["name"]))
+    return candidates
+
+def select_candidates(candidates, top_k=DEFAULT_TOP_K):
+    """
+    Split ranked candidates into those worth crawling and the rest.
+
+    The best match is always crawled; the next ones only while their score ties
+    or nearly ties with it, up to top_k in all.
+
+    Returns:
+        tuple: (candidates to expand, best first; remaining candidates)
+    """
+    if not candidates or top_k < 1:
+        return [], candidates
+    best = candidates[0]["score"]
+    expand = [candidates[0]]
+    for candidate in candidates[1:top_k]:
+        if best - candidate["score"] > AMBIGUOUS_SCORE_MARGIN:
+            break
+        expand.append(candidate)
+    return expand, candidates[len(expand):]
+
+def best_match(individuals):
+    """The individuals a screening may attribute cases to: only the best name match."""
+    return [individual for individual in individuals if individual.get("best_match", True)]
+
+def search_arbitrator_cases(api_key, name, max_cases=10, output_file=None, base_url=DEFAULT_BASE_URL, top_k=DEFAULT_TOP_K, suggestions=None):
     """
     Search for an arbitrator by name and find up to the specified number of their cases.
     
@@ -69,223 +177,308 @@ def search_arbitrator_cases(api_key, name, max_cases=10, output_file=None):
         name (str): Name of the arbitrator to search for
         max_cases (int, optional): Maximum number of cases to retrieve per arbitrator (default: 10)
         output_file (str, optional): File to save results in JSON format
+        base_url (str, optional): JusMundi API root (default: DEFAULT_BASE_URL)
+        top_k (int, optional): Most candidates to expand; beyond the best match only
+            those scoring within AMBIGUOUS_SCORE_MARGIN of it (default: DEFAULT_TOP_K)
+        suggestions (list, optional): Receives the lower-ranked candidates, unexpanded,
+            as "did you mean" stubs
         
     Returns:
-        str: Result string containing all output
+        list: Matching individuals, each with their details and cases, best first.
+              Only the first carries "best_match": True; the others are different
+              people whose names could not be told apart from it. When the
+              deadline bound with deadlines.deadline() runs out, individuals whose
+              search was cut short carry "partial": True and the "missing_case_ids"
+              that were found but not fetched
+        
+    Raises:
+        deadlines.DeadlineExceeded: If the deadline runs out before the name search answers
+        requests.RequestException: If the name search fails
     """
-<<<<<<< HEAD:arbitrator-finder.py
-    result = ""  # Initialize result string
-=======
     # Return mock data if no API key is provided
     if not api_key or api_key == "your_api_key_here":
         return get_mock_data(name)
 
->>>>>>> 372bdb64b2657d3b0191952ea9e52a19d0a2bc87:arbitrator_finder.py
-    base_url = "https://api.jusmundi.com/stanford"
+    session = http_pool.get_session()
     headers = {
         "X-API-Key": api_key,
         "Accept": "application/json"
     }
     
-    result += f"Searching for individual: '{name}'\n"
-    
     # Step 1: Search for decisions with individuals matching the name
     search_url = f"{base_url}/decisions"
     params = {
         "search": name,
         "fields": "individuals.name",  # Focus search on individual names
-        "count": 1,
+        "count": CANDIDATE_SEARCH_COUNT,
         "page": 1,
         "include": "individuals"  # Include individuals in the response
     }
     
+    # Find matching individuals
     try:
-        # Find matching individuals
-        response = requests.get(search_url, headers=headers, params=params)
-        response.raise_for_status()
-        search_data = response.json()
-
-        result += "search_data:\n"
-        result += f"{search_data}\n\n"
+        outbound_scheduler.wait_turn()
+        with span("name_search"):
+            response = session.get(search_url, headers=headers, params=params, timeout=deadlines.request_timeout())
+            response.raise_for_status()
+            search_data = response.json()
+    except requests.Timeout as e:
+        if deadlines.expired():
+            raise deadlines.DeadlineExceeded("Search time budget exhausted during the name search") from e
+        raise
+    
+    # Rank the individuals matching the name and expand only the best, plus any
+    # runner-up that matches about as well
+    expand, rest = select_candidates(rank_candidates(name, search_data), top_k)
+    if suggestions is not None:
+        suggestions.extend(rest)
+    
+    individuals = {}
+    for position, candidate in enumerate(expand):
+        individual_id = candidate["id"]
+        
+        # Get full individual details
+        individual_url = f"{base_url}/individuals/{individual_id}"
+        try:
+            outbound_scheduler.wait_turn()
+            with span("individual_lookup"):
+                individual_response = session.get(individual_url, headers=headers, timeout=deadlines.request_timeout())
+        except (deadlines.DeadlineExceeded, requests.Timeout):
+            # Known by name only; nothing about their cases could be fetched
+            individuals[individual_id] = {
+                "id": individual_id,
+                "name": candidate["name"],
+                "best_match": position == 0,
+                "details": {},
+                "cases": [],
+                "partial": True,
+                "missing_case_ids": [],
+            }
+            continue
+        
+        if individual_response.status_code == 200:
+            individual_data = individual_response.json()
+            individuals[individual_id] = {
+                "id": individual_id,
+                "name": candidate["name"],
+                "best_match": position == 0,
+                "details": individual_data.get("data", {}).get("attributes", {}),
+                "cases": []
+            }
+    
+    if not individuals:
+        return []
         
-        # Extract individuals matching the name
-        individuals = {}
+    # Step 2: For each individual, find up to 10 decisions they're involved in
+    for individual_id, individual in individuals.items():
+        if individual.get("partial"):
+            continue
+        #result += f"\nFinding cases for: {individual['name']} (ID: {individual_id})\n"
         
-        if "included" in search_data:
-            for item in search_data["included"]:
-                if item["type"] == "individuals":
-                    individual_id = item["id"]
-                    individual_name = item["attributes"].get("name", "")
-                    
-                    # Case-insensitive substring match
-                    if name.lower() in individual_name.lower():
-                        # Get full individual details
-                        individual_url = f"{base_url}/individuals/{individual_id}"
-                        individual_response = requests.get(individual_url, headers=headers)
-                        
-                        if individual_response.status_code == 200:
-                            individual_data = individual_response.json()
-                            individuals[individual_id] = {
-                                "id": individual_id,
-                                "name": individual_name,
-                                "details": individual_data.get("data", {}).get("attributes", {}),
-                                "cases": []
-                            }
+        # Get decisions (paginated)
+        page = 1
+        case_ids = set()  # Use set to avoid duplicates
         
-        if not individuals:
-            #result += f"No individuals found matching '{name}'\n"
-            return result
-            
-        # Step 2: For each individual, find up to 10 decisions they're involved in
-        for individual_id, individual in individuals.items():
-            #result += f"\nFinding cases for: {individual['name']} (ID: {individual_id})\n"
+        while len(case_ids) < max_cases:
+            decisions_url = f"{base_url}/decisions"
+            params = {
+                "search": individual["name"],
+                "fields": "individuals.name",
+                "include": "cases",  # Include case information
+                "page": page,
+                "count": 3
+            }
             
-            # Get decisions (paginated)
-            page = 1
-            case_ids = set()  # Use set to avoid duplicates
+            try:
+                outbound_scheduler.wait_turn()
+                with span("pagination"):
+                    decisions_response = session.get(decisions_url, headers=headers, params=params, timeout=deadlines.request_timeout())
+            except (deadlines.DeadlineExceeded, requests.Timeout):
+                # More cases may exist beyond those found so far
+                individual["partial"] = True
+                break
             
-            while len(case_ids) < max_cases:
-                decisions_url = f"{base_url}/decisions"
-                params = {
-                    "search": individual["name"],
-                    "fields": "individuals.name",
-                    "include": "cases",  # Include case information
-                    "page": page,
-                    "count": 3
-                }
-                
-                decisions_response = requests.get(decisions_url, headers=headers, params=params)
+            if decisions_response.status_code != 200:
+                break
                 
-                if decisions_response.status_code != 200:
-                    break
-                    
-                decisions_data = decisions_response.json()
-                decisions = decisions_data.get("data", [])
-                
-                if not decisions:
-                    break
-                
-                # Extract case IDs from included data
-                if "included" in decisions_data:
-                    for item in decisions_data["included"]:
-                        if item["type"] == "cases":
-                            case_ids.add(item["id"])
-                            #result += f"Found case: {item['id']}\n"
-                            # Break once we have 10 cases
-                            if len(case_ids) >= max_cases:
-                                break
-                
-                # Check if we have enough cases or if there are more pages
-                if len(case_ids) >= max_cases or page >= decisions_data.get("meta", {}).get("totalPages", 0):
-                    break
-                    
-                page += 1
+            decisions_data = decisions_response.json()
+            decisions = decisions_data.get("data", [])
+            
+            if not decisions:
+                break
+            
+            # Extract case IDs from included data
+            if "included" in decisions_data:
+                for item in decisions_data["included"]:
+                    if item["type"] == "cases":
+                        case_ids.add(item["id"])
+                        #result += f"Found case: {item['id']}\n"
+                        # Break once we have 10 cases
+                        if len(case_ids) >= max_cases:
+                            break
             
-            # Step 3: Get details for each case (limited to 10)
-            for i, case_id in enumerate(list(case_ids)[:max_cases]):
-                case_url = f"{base_url}/cases/{case_id}"
-                params = {
-                    "include": "parties"  # Include parties in the response
-                }
-                case_response = requests.get(case_url, headers=headers, params=params)
+            # Check if we have enough cases or if there are more pages
+            if len(case_ids) >= max_cases or page >= decisions_data.get("meta", {}).get("totalPages", 0):
+                break
                 
-                if case_response.status_code == 200:
-                    case_data = case_response.json().get("data", {})
-                    case_attributes = case_data.get("attributes", {})
-                    
-                    # Extract parties information
-                    parties = []
-                    if "included" in case_response.json():
-                        for item in case_response.json()["included"]:
-                            if item["type"] == "parties":
-                                party_attributes = item.get("attributes", {})
-                                party_name = party_attributes.get("name", "Unnamed Party")
-                                party_role = party_attributes.get("role", "Unknown Role")
-                                party_type = party_attributes.get("type", "Unknown Type")
-                                parties.append({
-                                    "name": party_name,
-                                    "role": party_role,
-                                    "type": party_type
-                                })
-                    
-                    individual["cases"].append({
-                        "id": case_id,
-                        "title": case_attributes.get("title", "Untitled Case"),
-                        "reference": case_attributes.get("reference", ""),
-                        "status": case_attributes.get("status", ""),
-                        "startDate": case_attributes.get("startDate", ""),
-                        "endDate": case_attributes.get("endDate", ""),
-                        "organization": case_attributes.get("organization", ""),
-                        "parties": parties
-                    })
+            page += 1
         
-        # Step 4: Display and return results
-        for idx, (_, individual) in enumerate(individuals.items(), 1):
-            result += f"\nArbitrator {idx}:\n"
-            result += f"ID: {individual['id']}\n"
-            result += f"Name: {individual['name']}\n"
+        # Step 3: Get details for each case (limited to 10)
+        missing_case_ids = []
+        for i, case_id in enumerate(list(case_ids)[:max_cases]):
+            case_url = f"{base_url}/cases/{case_id}"
+            params = {
+                "include": "parties"  # Include parties in the response
+            }
+            try:
+                outbound_scheduler.wait_turn()
+                with span("case_details"):
+                    case_response, _ = http_pool.hedged_get(
+                        case_url,
+                        headers=headers,
+                        params=params,
+                        timeout=deadlines.request_timeout(),
+                        hedge_after=case_latency.percentile(HEDGE_PERCENTILE),
+                        allow_hedge=outbound_scheduler.try_turn,
+                        tracker=case_latency,
+                    )
+            except (deadlines.DeadlineExceeded, requests.Timeout):
+                missing_case_ids.append(case_id)
+                continue
             
-            # Display individual details
-            if individual['details']:
-                result += "Details:\n"
+            if case_response.status_code == 200:
+                case_data = case_response.json().get("data", {})
+                case_attributes = case_data.get("attributes", {})
                 
-                # Check for specific important fields first
-                important_fields = ["firm", "company", "organization", "nationality", "role", "type"]
-                for field in important_fields:
-                    if field in individual['details'] and individual['details'][field]:
-                        result += f"  {field.capitalize()}: {individual['details'][field]}\n"
+                # Extract parties information
+                parties = []
+                if "included" in case_response.json():
+                    for item in case_response.json()["included"]:
+                        if item["type"] == "parties":
+                            party_attributes = item.get("attributes", {})
+                            party_name = party_attributes.get("name", "Unnamed Party")
+                            party_role = party_attributes.get("role", "Unknown Role")
+                            party_type = party_attributes.get("type", "Unknown Type")
+                            parties.append({
+                                "name": party_name,
+                                "role": party_role,
+                                "type": party_type
+                            })
                 
-                # Then display any other details
-                for key, value in individual['details'].items():
-                    if value and key not in important_fields:  # Only show non-empty values that weren't already displayed
-                        result += f"  {key}: {value}\n"
+                individual["cases"].append({
+                    "id": case_id,
+                    "title": case_attributes.get("title", "Untitled Case"),
+                    "reference": case_attributes.get("reference", ""),
+                    "status": case_attributes.get("status", ""),
+                    "startDate": case_attributes.get("startDate", ""),
+                    "endDate": case_attributes.get("endDate", ""),
+                    "organization": case_attributes.get("organization", ""),
+                    "parties": parties
+                })
+        
+        if missing_case_ids:
+            individual["partial"] = True
+        if individual.get("partial"):
+            individual["missing_case_ids"] = missing_case_ids
+
+    return list(individuals.values())
+
+def format_search_results(name, individuals):
+    """
+    Format the individuals returned by search_arbitrator_cases as plain text.
+    
+    Args:
+        name (str): Name that was searched for
+        individuals (list): Individuals returned by search_arbitrator_cases
+        
+    Returns:
+        str: Result string containing all output
+    """
+    result = f"Searching for individual: '{name}'\n"
+    
+    # Step 4: Display and return results
+    for idx, individual in enumerate(individuals, 1):
+        result += f"\nArbitrator {idx}:\n"
+        result += f"ID: {individual['id']}\n"
+        result += f"Name: {individual['name']}\n"
+        
+        # Display individual details
+        if individual['details']:
+            result += "Details:\n"
             
-            # Display cases
-            cases = individual.get("cases", [])
-            if cases:
-                #result += f"\nInvolved in {len(cases)} case(s) (Limited to first {max_cases}):\n"
-                for i, case in enumerate(cases, 1):
-                    result += f"\nCase {i}:\n"
-                    result += f"  Title: {case['title']}\n"
-                    result += f"  ID: {case['id']}\n"
-                    if case["reference"]:
-                        result += f"  Reference: {case['reference']}\n"
-                    if case["organization"]:
-                        pass
-                        #result += f"  Organization: {case['organization']}\n"
-                    if case["status"]:
-                        result += f"  Status: {case['status']}\n"
-                    if case["startDate"]:
-                        pass
-                        #result += f"  Start Date: {case['startDate']}\n"
-                    if case["endDate"]:
-                        pass
-                        #result += f"  End Date: {case['endDate']}\n"
-                    
-                    # Display parties information
-                    if case["parties"]:
-                        result += f"  Parties involved:\n"
-                        for party in case["parties"]:
-                            result += f"    - {party['name']} ({party['role']}, {party['type']})\n"
-                    else:
-                        pass
-                        #result += "  Parties: No party information available\n"
-            else:
-                pass
-                #result += "\nNo cases found for this individual\n"
+            # Check for specific important fields first
+            important_fields = ["firm", "company", "organization", "nationality", "role", "type"]
+            for field in important_fields:
+                if field in individual['details'] and individual['details'][field]:
+                    result += f"  {field.capitalize()}: {individual['details'][field]}\n"
             
-            #result += "-" * 60 + "\n"
+            # Then display any other details
+            for key, value in individual['details'].items():
+                if value and key not in important_fields:  # Only show non-empty values that weren't already displayed
+                    result += f"  {key}: {value}\n"
         
+        # Display cases
+        cases = individual.get("cases", [])
+        if cases:
+            #result += f"\nInvolved in {len(cases)} case(s) (Limited to first {max_cases}):\n"
+            for i, case in enumerate(cases, 1):
+                result += f"\nCase {i}:\n"
+                result += f"  Title: {case['title']}\n"
+                result += f"  ID: {case['id']}\n"
+                if case["reference"]:
+                    result += f"  Reference: {case['reference']}\n"
+                if case["organization"]:
+                    pass
+                    #result += f"  Organization: {case['organization']}\n"
+                if case["status"]:
+                    result += f"  Status: {case['status']}\n"
+                if case["startDate"]:
+                    pass
+                    #result += f"  Start Date: {case['startDate']}\n"
+                if case["endDate"]:
+                    pass
+                    #result += f"  End Date: {case['endDate']}\n"
+                
+                # Display parties information
+                if case["parties"]:
+                    result += f"  Parties involved:\n"
+                    for party in case["parties"]:
+                        result += f"    - {party['name']} ({party['role']}, {party['type']})\n"
+                else:
+                    pass
+                    #result += "  Parties: No party information available\n"
+        else:
+            pass
+            #result += "\nNo cases found for this individual\n"
         
-            
-    except requests.RequestException as e:
-        result += f"Error: {str(e)}\n"
-        sys.exit(1)
+        #result += "-" * 60 + "\n"
     
     return result
 
+def format_prescreen(screening):
+    """
+    Format a conflict_rules.prescreen result as plain text.
+    
+    Args:
+        screening (dict): Result of prescreen
+        
+    Returns:
+        str: Classification, triggered rules and their evidence
+    """
+    result = f"Rule-based classification: {screening['classification'] or 'UNDETERMINED'}\n"
+    for finding in screening["findings"]:
+        result += f"\n[{finding['classification']}] {finding['description']} ({finding['reference']})\n"
+        for case in finding["evidence"]:
+            result += f"  - {case['title']} ({case['reference'] or case['id']}, {case['startDate'] or 'no start date'})\n"
+            for party in case.get("parties", []):
+                result += f"      {party}\n"
+    if screening["ambiguous"]:
+        result += f"\n{len(screening['ambiguous'])} case(s) lack the data needed for a rule-based decision\n"
+    return result
+
 def main():
     result = ""
+    individuals = None
 
     # Fix potential encoding issues by setting stdout to use UTF-8
     # This handles special characters in names and text content
@@ -296,12 +489,34 @@ def main():
     parser.add_argument("--name", required=True, help="Name of the arbitrator to search for")
     parser.add_argument("--max-cases", type=int, default=10, help="Maximum number of cases to retrieve per arbitrator (default: 10)")
     parser.add_argument("--output", help="Output file to save results (JSON format)")
+    parser.add_argument("--top-k", type=int, default=DEFAULT_TOP_K, help=f"Most name matches to fetch cases for; runners-up only when their match is ambiguous (default: {DEFAULT_TOP_K})")
     parser.add_argument("--no-get")
+    parser.add_argument("--deadline", type=float, default=60, help="Time budget for the case search in seconds (default: 60)")
+    parser.add_argument("--token-budget", type=int, default=DEFAULT_TOKEN_BUDGET, help=f"Maximum prompt tokens of case data sent to the model (default: {DEFAULT_TOKEN_BUDGET})")
+    parser.add_argument("--rules", default=DEFAULT_RULES_PATH, help="Conflict rule set used before asking the LLM (default: conflict_rules.json)")
+    parser.add_argument("--policy", default=DEFAULT_POLICY_PATH, help="Model cascade policy for the LLM classification (default: model_cascade.json)")
 
     args = parser.parse_args()
     
     if(not args.no_get):
-        result = search_arbitrator_cases(args.api_key, args.name, args.max_cases, args.output)
+        suggestions = []
+        try:
+            with deadlines.deadline(args.deadline):
+                individuals = search_arbitrator_cases(args.api_key, args.name, args.max_cases, args.output, top_k=args.top_k, suggestions=suggestions)
+        except (requests.RequestException, deadlines.DeadlineExceeded) as e:
+            print(f"Error: {str(e)}", file=sys.stderr)
+            sys.exit(1)
+        result = format_search_results(args.name, individuals)
+        for individual in individuals:
+            if individual.get("partial"):
+                print(f"Warning: search for {individual['name']} ran out of time; "
+                      f"missing cases: {', '.join(map(str, individual['missing_case_ids'])) or 'unknown'}", file=sys.stderr)
+        if suggestions:
+            print("Did you mean: " + ", ".join(f"{s['name']} ({s['role'] or 'unknown role'})" for s in suggestions))
+        
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(individuals, f, indent=2, ensure_ascii=False)
 
         #print(result)
 
@@ -311,27 +526,50 @@ def main():
         file.write(result)
         file.close()
 
+    elif args.output:
+        with open(args.output, encoding='utf-8') as f:
+            individuals = json.load(f)
+
     result = ""
     with open("output.txt", "r") as file:
         for line in file:
             result += line
 
+    # Similar names ranked below the best match are other people; their cases are
+    # listed above but are not this arbitrator's
+    if individuals is not None:
+        individuals = best_match(individuals)
+
+    # Settle whatever the structured data can decide before paying for an LLM call
+    if individuals is not None:
+        screening = prescreen(individuals, load_rules(args.rules))
+        print(format_prescreen(screening))
+        if screening["decided"]:
+            return
+
+    # Send the compact encoding of the cases rather than the human-readable report
+    if individuals is not None:
+        try:
+            prompt = encode_prompt(individuals, budget=args.token_budget)
+        except ValueError as e:
+            print(f"Error: {str(e)}", file=sys.stderr)
+            sys.exit(1)
+        result = prompt["text"]
+        print(f"Prompt: {prompt['tokens']} tokens{'' if prompt['exact'] else ' (estimated)'}, "
+              f"{prompt['cases']} of {prompt['cases_available']} cases")
+
     # Path to your file
     file_path = "output.txt"
     print("Asking chat gippity")
-    system_prompt = "Be Concise. Using the international standard for arbitration conflicts of interest with the Kingdom of Norway, determine if there are any conflicts of interest and if there are classify them as RED GREEN or YELLOW and cite your sources"
-    client = OpenAI(api_key="")
-    detailed = False
-    response = client.chat.completions.create(
-                model="gpt-4o-mini",  # Using a capable model for analysis
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": result[:10000]}
-                ],
-                temperature=0.7,  # Higher temperature for more creative and comprehensive exploration
-                max_tokens=4000 if detailed else 1000  # Higher token limit for detailed responses
-    )
-    print(response.choices[0].message.content)
+    analysis = classify_conflicts(result, api_key="", policy=load_policy(args.policy))
+    for call in analysis["calls"]:
+        outcome = call["error"] or ("escalated: " + call["escalation_reason"] if call["escalated"] else "accepted")
+        print(f"  {call['tier']} ({call['model']}): {call['latency_ms']:.0f} ms, "
+              f"{call['prompt_tokens']}+{call['completion_tokens']} tokens, ${call['cost_usd']:.4f} - {outcome}")
+    print(f"LLM classification: {analysis['classification']} (confidence {analysis['confidence']:.2f}, {analysis['tier']} tier)")
+    for finding in analysis["findings"]:
+        print(f"  [{finding['classification']}] {finding['description']} (cases: {', '.join(finding['case_ids']) or 'none'})")
+    print(analysis["rationale"])
 
     # # Send the request
     # response = requests.post(
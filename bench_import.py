@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark for the web app.
+
+Imports a module in fresh interpreters with `-X importtime` and checks that the
+import cost owned by this repo stays under a budget. Framework packages the app
+cannot start without (Flask, SQLAlchemy, requests) are reported but not counted
+against the budget, and heavy optional integrations must not be imported at all.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+# Packages every web worker needs regardless of what this repo does at import time
+FRAMEWORK_PACKAGES = {
+    "flask", "flask_sqlalchemy", "sqlalchemy", "werkzeug", "jinja2", "markupsafe",
+    "itsdangerous", "click", "blinker", "requests", "urllib3", "dotenv",
+}
+
+# Integrations that must only be loaded by the functions that use them
+FORBIDDEN_PACKAGES = {
+    "openai", "supabase", "llama_cloud_services", "llama_index", "numpy", "scipy",
+}
+
+
+def parse_importtime(stderr):
+    """
+    Parse `-X importtime` output into (name, depth, self_us, cumulative_us) rows.
+
+    Rows are returned in the order Python prints them, i.e. children before parents.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, raw_name = line.split(":", 1)[1].split("|")
+        # Nesting is encoded as two spaces per level after the single separator space
+        depth = (len(raw_name) - len(raw_name.lstrip(" ")) - 1) // 2
+        rows.append((raw_name.strip(), depth, int(self_us), int(cumulative_us)))
+    return rows
+
+
+def measure(module):
+    """
+    Import module in a fresh interpreter and summarise where the time went.
+
+    Returns:
+        dict: Total, framework and repo-owned import time (ms) plus every module loaded
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{proc.stderr}")
+
+    rows = parse_importtime(proc.stderr)
+    root = next(row for row in reversed(rows) if row[0] == module)
+    root_depth = root[1]
+
+    # Walk the tree from the root down (reverse print order) and skip whole subtrees
+    # that belong to a framework package
+    owned_us = 0
+    framework_us = 0
+    skip_below = None
+    subtree = list(reversed(rows[:rows.index(root) + 1]))
+    for position, (name, depth, self_us, cumulative_us) in enumerate(subtree):
+        if position > 0 and depth <= root_depth:
+            # Modules printed before the root's subtree were imported at interpreter startup
+            break
+        if skip_below is not None:
+            if depth > skip_below:
+                continue
+            skip_below = None
+        if name.split(".")[0] in FRAMEWORK_PACKAGES:
+            framework_us += cumulative_us
+            skip_below = depth
+            continue
+        owned_us += self_us
+
+    return {
+        "total_ms": root[3] / 1000,
+        "framework_ms": framework_us / 1000,
+        "owned_ms": owned_us / 1000,
+        "modules": {name for name, _, _, _ in rows},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the import time of the web app against a budget")
+    parser.add_argument("--module", default="app", help="Module to import (default: app)")
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh interpreters to sample (default: 5)")
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="Budget for repo-owned import time in ms (default: 50)")
+    args = parser.parse_args()
+
+    samples = [measure(args.module) for _ in range(args.runs)]
+    total = statistics.median(s["total_ms"] for s in samples)
+    framework = statistics.median(s["framework_ms"] for s in samples)
+    owned = statistics.median(s["owned_ms"] for s in samples)
+    loaded = set().union(*(s["modules"] for s in samples))
+    forbidden = sorted(name for name in loaded if name.split(".")[0] in FORBIDDEN_PACKAGES)
+
+    print(f"import {args.module}: median of {args.runs} runs")
+    print(f"  total:     {total:8.1f} ms")
+    print(f"  framework: {framework:8.1f} ms")
+    print(f"  owned:     {owned:8.1f} ms (budget {args.budget_ms:.1f} ms)")
+
+    failed = False
+    if owned > args.budget_ms:
+        print(f"FAIL: repo-owned import time {owned:.1f} ms exceeds budget {args.budget_ms:.1f} ms")
+        failed = True
+    if forbidden:
+        print(f"FAIL: heavy integrations imported at startup: {', '.join(forbidden)}")
+        failed = True
+    if not failed:
+        print("OK")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
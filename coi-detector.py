@@ -1,12 +1,33 @@
 import os
+import argparse
+import hashlib
 import json
 from openai import OpenAI
 import time
 from datetime import datetime
+from dossier_index import index_dossier, remove_dossier
+import model_cascade
+from prompt_encoder import encode_prompt
+
+# Model used by each collection step; override per step with the models argument
+DEFAULT_MODELS = {
+    "information": "gpt-4o-mini",
+    "research": "gpt-4-turbo-preview",
+    "connections": "gpt-4-turbo-preview",
+}
 
 class ArbitratorInfoCollector:
-    def __init__(self, api_key=None):
-        """Initialize the information collector with OpenAI API key."""
+    def __init__(self, api_key=None, models=None, policy=None):
+        """
+        Initialize the information collector with OpenAI API key.
+        
+        Args:
+            api_key (str): OpenAI API key
+            models (dict): Models to use per step, overriding DEFAULT_MODELS
+            policy (dict): Model cascade policy for classify_conflicts (default: model_cascade.json)
+        """
+        self.models = {**DEFAULT_MODELS, **(models or {})}
+        self.policy = policy
         # Use provided API key or get from environment variable
         self.api_key = ""
         if not self.api_key:
@@ -14,7 +35,44 @@ class ArbitratorInfoCollector:
         
         self.client = OpenAI(api_key=self.api_key)
         
-    def collect_information(self, arbitrator_data, detailed=True):
+    def classify_conflicts(self, text):
+        """
+        Classify conflicts in case or dossier text through the model cascade.
+        
+        Args:
+            text (str): Information to classify, e.g. from prompt_encoder.encode_prompt
+        
+        Returns:
+            dict: Classification with confidence, the tier that gave it and the
+                  latency and cost of every tier asked (see model_cascade.classify_conflicts)
+        """
+        return model_cascade.classify_conflicts(text, policy=self.policy, client=self.client)
+    
+    def _complete(self, on_chunk=None, **request):
+        """
+        Run a chat completion and return the generated text.
+        
+        Args:
+            on_chunk (callable, optional): Called with each piece of text as it is
+                                           generated; the request is streamed when given
+            **request: Arguments for chat.completions.create
+        
+        Returns:
+            str: The full response text
+        """
+        if on_chunk is None:
+            response = self.client.chat.completions.create(**request)
+            return response.choices[0].message.content
+        
+        pieces = []
+        for chunk in self.client.chat.completions.create(stream=True, **request):
+            if chunk.choices and chunk.choices[0].delta.content:
+                piece = chunk.choices[0].delta.content
+                pieces.append(piece)
+                on_chunk(piece)
+        return "".join(pieces)
+        
+    def collect_information(self, arbitrator_data, detailed=True, on_chunk=None):
         """
         Collect comprehensive information about the arbitrator without making severity judgments.
         
@@ -22,6 +80,7 @@ class ArbitratorInfoCollector:
             arbitrator_data (dict): Dictionary containing arbitrator information
                                    including at minimum their name
             detailed (bool): Whether to collect highly detailed information
+            on_chunk (callable): Optional callback receiving the response as it streams in
         
         Returns:
             dict: Comprehensive information about the arbitrator
@@ -89,8 +148,9 @@ class ArbitratorInfoCollector:
         
         try:
             # Call the OpenAI API with higher token limit for more detailed response
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",  # Using a capable model for analysis
+            information = self._complete(
+                on_chunk,
+                model=self.models["information"],
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_message}
@@ -99,9 +159,6 @@ class ArbitratorInfoCollector:
                 max_tokens=4000 if detailed else 2000  # Higher token limit for detailed responses
             )
             
-            # Parse the response
-            information = response.choices[0].message.content
-            
             # Store the raw information
             raw_data = {
                 "timestamp": datetime.now().isoformat(),
@@ -114,7 +171,7 @@ class ArbitratorInfoCollector:
         except Exception as e:
             return {"error": str(e)}
     
-    def web_research(self, arbitrator_data, research_depth="extensive"):
+    def web_research(self, arbitrator_data, research_depth="extensive", on_chunk=None):
         """
         Conduct extensive web research on the arbitrator to gather all possible information.
         Uses OpenAI's browsing capability for comprehensive data collection.
@@ -122,6 +179,7 @@ class ArbitratorInfoCollector:
         Args:
             arbitrator_data (dict): Dictionary containing arbitrator information
             research_depth (str): Level of research depth ("basic", "standard", "extensive")
+            on_chunk (callable): Optional callback receiving the raw findings as they stream in
         
         Returns:
             dict: Comprehensive information from web sources
@@ -171,8 +229,9 @@ class ArbitratorInfoCollector:
         
         try:
             # Call the OpenAI API with the browsing capability for extensive research
-            response = self.client.chat.completions.create(
-                model="gpt-4-turbo-preview",  # Ensure this is a model with browsing capability
+            raw_findings = self._complete(
+                on_chunk,
+                model=self.models["research"],  # Ensure this is a model with browsing capability
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": f"Conduct exhaustive research on arbitrator: {name}{context}\n\nFind ALL possible information. Do not filter or judge relevance - include EVERYTHING. Be methodical and thorough."}
@@ -187,39 +246,38 @@ class ArbitratorInfoCollector:
                 "timestamp": datetime.now().isoformat(),
                 "arbitrator_name": name,
                 "research_depth": research_depth,
-                "raw_findings": response.choices[0].message.content,
+                "raw_findings": raw_findings,
                 "metadata": {
-                    "model": "gpt-4-turbo-preview",
+                    "model": self.models["research"],
                     "temperature": 0.7,
                     "max_tokens": max_tokens
                 }
             }
             
             # Organize the findings into categories (optional second call)
-            categories_response = self.client.chat.completions.create(
-                model="gpt-4-turbo-preview",
+            findings["categorized_findings"] = self._complete(
+                model=self.models["research"],
                 messages=[
                     {"role": "system", "content": "You are an assistant that organizes raw research findings into categories while preserving ALL details. Do not summarize or omit any information."},
-                    {"role": "user", "content": f"Organize these raw findings into categories while preserving ALL details and information:\n\n{response.choices[0].message.content}"}
+                    {"role": "user", "content": f"Organize these raw findings into categories while preserving ALL details and information:\n\n{raw_findings}"}
                 ],
                 temperature=0.3,
                 max_tokens=4000
             )
             
-            findings["categorized_findings"] = categories_response.choices[0].message.content
-            
             return findings
             
         except Exception as e:
             return {"error": str(e), "details": "This functionality requires a model with browsing capability."}
 
-    def search_across_entities(self, arbitrator_data, entities_list):
+    def search_across_entities(self, arbitrator_data, entities_list, on_chunk=None):
         """
         Search for connections between the arbitrator and a list of entities (companies, people, etc.)
         
         Args:
             arbitrator_data (dict): Dictionary containing arbitrator information
             entities_list (list): List of entities to check for connections
+            on_chunk (callable): Optional callback receiving the connections as they stream in
             
         Returns:
             dict: All found connections between arbitrator and entities
@@ -247,8 +305,9 @@ class ArbitratorInfoCollector:
         
         try:
             # Call the OpenAI API with browsing to find connections
-            response = self.client.chat.completions.create(
-                model="gpt-4-turbo-preview",
+            connections_found = self._complete(
+                on_chunk,
+                model=self.models["connections"],
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": f"Find ALL possible connections between arbitrator {name} and the following entities:\n\n{entities_formatted}\n\nBe exhaustive and report EVERYTHING you find, including sources."}
@@ -263,7 +322,7 @@ class ArbitratorInfoCollector:
                 "timestamp": datetime.now().isoformat(),
                 "arbitrator_name": name,
                 "entities_searched": entities_list,
-                "connections_found": response.choices[0].message.content
+                "connections_found": connections_found
             }
             
             return connections
@@ -271,13 +330,14 @@ class ArbitratorInfoCollector:
         except Exception as e:
             return {"error": str(e)}
 
-    def save_to_file(self, data, filename=None):
+    def save_to_file(self, data, filename=None, index=True):
         """
         Save collected information to a JSON file.
         
         Args:
             data (dict): The data to save
             filename (str): Optional filename, defaults to arbitrator name and timestamp
+            index (bool): Whether to update the full-text dossier index with the saved text
             
         Returns:
             str: Path to the saved file
@@ -289,50 +349,182 @@ class ArbitratorInfoCollector:
             
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
+        
+        if index:
+            try:
+                index_dossier(data, filename)
+            except Exception as e:
+                # The file is saved; a broken index must not lose the research
+                print(f"Warning: Could not index {filename}: {e}")
             
         return filename
 
 
+# Bump a stage's version when its prompt or settings change so every dossier recomputes it
+PROMPT_VERSIONS = {"basic_information": 1, "web_research": 1, "entity_connections": 1}
+
+# Stage files written next to the master file when a stage is recomputed
+STAGE_FILES = {
+    "basic_information": "basic_info.json",
+    "web_research": "web_research.json",
+    "entity_connections": "entity_connections.json",
+}
+
+
+def fingerprint(*inputs):
+    """Digest of a stage's inputs, independent of key order."""
+    canonical = json.dumps(inputs, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+def case_set(individuals):
+    """
+    The JusMundi cases of a saved search as sorted (id, status, party names) entries.
+    
+    Args:
+        individuals (list): Individuals as saved by arbitrator_finder --output
+    """
+    cases = {}
+    for individual in individuals:
+        for case in individual.get("cases", []):
+            parties = sorted(party.get("name", "") for party in case.get("parties") or [])
+            cases[str(case["id"])] = (str(case["id"]), case.get("status") or "", parties)
+    return [cases[case_id] for case_id in sorted(cases)]
+
+
+def load_dossier(path):
+    """The master dossier previously saved at path, or None."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def build_dossier(collector, arbitrator_data, entities_list, individuals=None, previous=None, force=False, on_chunk=None, log=None):
+    """
+    Build an arbitrator's master dossier, recomputing only the stages whose inputs changed.
+    
+    Each stage stores a fingerprint of its inputs (arbitrator data, entities, JusMundi
+    case set, model and prompt version). A stage of the previous dossier is reused when
+    its fingerprint still matches and it did not fail, so a roster refresh only pays
+    for arbitrators whose underlying data moved.
+    
+    Args:
+        collector (ArbitratorInfoCollector): Collector running the stages
+        arbitrator_data (dict): Arbitrator information, including at minimum the name
+        entities_list (list): Entities to check for connections
+        individuals (list): Saved JusMundi search; the parties of its cases are checked as entities too
+        previous (dict): Master dossier from the last run
+        force (bool): Recompute every stage
+        on_chunk (callable): Optional callback receiving stage output as it streams in
+        log (callable): Called with a progress message per stage
+    
+    Returns:
+        tuple: (master dossier, names of the recomputed stages)
+    """
+    previous = previous or {}
+    log = log or (lambda message: None)
+    cases = case_set(individuals or [])
+    entities = list(dict.fromkeys(list(entities_list) + [name for _, _, parties in cases for name in parties if name]))
+    
+    stages = [
+        ("basic_information", (arbitrator_data, collector.models["information"]),
+         lambda: collector.collect_information(arbitrator_data, detailed=False, on_chunk=on_chunk)),
+        ("web_research", (arbitrator_data, collector.models["research"]),
+         lambda: collector.web_research(arbitrator_data, research_depth="extensive", on_chunk=on_chunk)),
+        ("entity_connections", (arbitrator_data, entities, cases, collector.models["connections"]),
+         lambda: collector.search_across_entities(arbitrator_data, entities, on_chunk=on_chunk)),
+    ]
+    
+    master_data = {
+        "timestamp": datetime.now().isoformat(),
+        "arbitrator_data": arbitrator_data,
+        "case_ids": [case_id for case_id, _, _ in cases],
+    }
+    recomputed = []
+    for name, inputs, compute in stages:
+        stage_fingerprint = fingerprint(name, PROMPT_VERSIONS[name], *inputs)
+        last = previous.get(name)
+        if not force and isinstance(last, dict) and last.get("fingerprint") == stage_fingerprint and "error" not in last:
+            log(f"{name}: inputs unchanged, reusing previous result")
+            master_data[name] = last
+            continue
+        log(f"{name}: computing...")
+        result = compute()
+        result["fingerprint"] = stage_fingerprint
+        master_data[name] = result
+        recomputed.append(name)
+    
+    if not recomputed:
+        # Nothing moved; keep the previous dossier as it was, timestamp included
+        return previous, recomputed
+    return master_data, recomputed
+
+
+def read_list(path):
+    """Entities from a JSON list or a file with one name per line."""
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".json"):
+            return json.load(f)
+        return [line.strip() for line in f if line.strip()]
+
+
 # Example usage
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build or refresh an arbitrator's conflict dossier")
+    parser.add_argument("--arbitrator", help="JSON file with the arbitrator data (default: built-in example)")
+    parser.add_argument("--entities", help="Entities to check for connections (JSON list or one per line)")
+    parser.add_argument("--cases", help="JusMundi search saved with arbitrator_finder.py --output")
+    parser.add_argument("--force", action="store_true", help="Recompute every stage even if its inputs are unchanged")
+    parser.add_argument("--classify", action="store_true", help="Also classify the --cases through the model cascade")
+    args = parser.parse_args()
+    if args.classify and not args.cases:
+        parser.error("--classify needs --cases")
+    
     # Example arbitrator data - can be minimal or extensive as available
     arbitrator_data = {
         "name": "Charles Poncet",
         "title": "Arbitrator",
         "location": "Switzerland"
     }
+    if args.arbitrator:
+        with open(args.arbitrator, encoding="utf-8") as f:
+            arbitrator_data = json.load(f)
     
     # Example list of entities to check for connections
-    entities_list = [
-            
-    ]
+    entities_list = read_list(args.entities) if args.entities else []
     
-    # Initialize the collector
-    collector = ArbitratorInfoCollector()
+    individuals = None
+    if args.cases:
+        with open(args.cases, encoding="utf-8") as f:
+            individuals = json.load(f)
     
-    # Basic information collection
-    print("Collecting basic information...")
-    basic_info = collector.collect_information(arbitrator_data, detailed=False)
-    collector.save_to_file(basic_info, "basic_info.json")
+    master_path = f"{arbitrator_data['name'].replace(' ', '_')}_master_data.json"
     
-    # Extensive web research
-    print("Conducting web research...")
-    web_info = collector.web_research(arbitrator_data, research_depth="extensive")
-    collector.save_to_file(web_info, "web_research.json")
-    
-    # Connection search
-    print("Searching for entity connections...")
-    connections = collector.search_across_entities(arbitrator_data, entities_list)
-    collector.save_to_file(connections, "entity_connections.json")
+    # Initialize the collector
+    collector = ArbitratorInfoCollector()
     
-    # Combine all information into a master file
-    master_data = {
-        "timestamp": datetime.now().isoformat(),
-        "arbitrator_data": arbitrator_data,
-        "basic_information": basic_info,
-        "web_research": web_info,
-        "entity_connections": connections
-    }
+    show = lambda piece: print(piece, end="", flush=True)
+    master_data, recomputed = build_dossier(
+        collector, arbitrator_data, entities_list, individuals,
+        previous=load_dossier(master_path), force=args.force, on_chunk=show, log=print,
+    )
+    if not recomputed:
+        print(f"Nothing changed; {master_path} is up to date")
+    else:
+        print()
+        # Stage files hold the same text as the master file, which alone is indexed
+        for stage in recomputed:
+            collector.save_to_file(master_data[stage], STAGE_FILES[stage], index=False)
+            try:
+                remove_dossier(STAGE_FILES[stage])
+            except Exception as e:
+                print(f"Warning: Could not update the index for {STAGE_FILES[stage]}: {e}")
+        master_file = collector.save_to_file(master_data, master_path)
+        print(f"Recomputed {', '.join(recomputed)}; all data saved to {master_file}")
     
-    master_file = collector.save_to_file(master_data, f"{arbitrator_data['name'].replace(' ', '_')}_master_data.json")
-    print(f"All data collected and saved to {master_file}")
\ No newline at end of file
+    if args.classify:
+        prompt = encode_prompt(individuals)
+        print(f"Classifying {prompt['cases']} of {prompt['cases_available']} cases ({prompt['tokens']} tokens)")
+        print(json.dumps(collector.classify_conflicts(prompt["text"]), indent=2))
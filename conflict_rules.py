@@ -0,0 +1,278 @@
+"""
+Deterministic conflict pre-screen over structured case and party records.
+
+A configurable rule set (see conflict_rules.json) is evaluated against the cases
+returned by search_arbitrator_cases. Each triggered rule yields a RED/YELLOW/GREEN
+finding with the cases that triggered it as evidence. Only results the rules cannot
+settle (cases with missing party or date data) need to go to the LLM.
+
+Party names are compared by canonical key (party_key): case, accents, punctuation,
+state prefixes and corporate suffixes are removed, then the name is mapped through
+party_aliases.json. The party index and appointment_analytics use the same keys,
+so they all agree on which parties are the same. A party whose name only contains
+a rule party (or one of its aliases) as a phrase, such as "Ministry of Petroleum
+and Energy of the Kingdom of Norway", is a near match: its case is left ambiguous
+for the LLM rather than counted as evidence or ignored.
+"""
+
+import json
+import os
+import re
+import unicodedata
+from datetime import date, datetime, timedelta
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "conflict_rules.json")
+DEFAULT_ALIASES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "party_aliases.json")
+
+STATE_PREFIXES = (
+    "the", "kingdom of", "republic of", "federal republic of", "state of",
+    "government of", "principality of", "sultanate of", "commonwealth of",
+)
+CORPORATE_SUFFIXES = (
+    "ltd", "limited", "inc", "incorporated", "llc", "llp", "plc", "corp", "corporation",
+    "co", "company", "sa", "s a", "ag", "gmbh", "bv", "b v", "nv", "asa", "as", "ab",
+    "spa", "s p a", "srl", "sarl", "holding", "holdings",
+)
+
+# Most severe first
+SEVERITY = {"RED": 3, "YELLOW": 2, "GREEN": 1}
+
+PENDING_STATUSES = ("pending", "ongoing", "active")
+CONCLUDED_STATUSES = ("concluded", "completed", "closed", "discontinued", "settled")
+
+
+def load_rules(path=DEFAULT_RULES_PATH):
+    """
+    Load and validate a rule set.
+
+    Returns:
+        list: Rule dicts
+    """
+    with open(path, encoding="utf-8") as f:
+        rules = json.load(f)["rules"]
+
+    for rule in rules:
+        if rule.get("classification") not in SEVERITY:
+            raise ValueError(f"Rule {rule.get('id')} has invalid classification {rule.get('classification')!r}")
+        if not rule.get("parties"):
+            raise ValueError(f"Rule {rule.get('id')} must list at least one party name")
+    return rules
+
+
+def normalize_name(name):
+    """Lowercase a name and reduce it to space-separated words."""
+    return " ".join(re.findall(r"\w+", (name or "").casefold()))
+
+
+def _strip_accents(text):
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+
+
+def normalize_party_name(name):
+    """Reduce a party name to lowercase words without state prefixes or corporate suffixes."""
+    words = normalize_name(_strip_accents(name or ""))
+
+    changed = True
+    while changed and words:
+        changed = False
+        for prefix in STATE_PREFIXES:
+            if words.startswith(prefix + " "):
+                words = words[len(prefix) + 1:]
+                changed = True
+        for suffix in CORPORATE_SUFFIXES:
+            if words.endswith(" " + suffix):
+                words = words[:-len(suffix) - 1]
+                changed = True
+    return words
+
+
+def load_aliases(path=DEFAULT_ALIASES_PATH):
+    """
+    Load the party alias table.
+
+    Returns:
+        dict: Normalized alias -> canonical key
+    """
+    with open(path, encoding="utf-8") as f:
+        table = json.load(f)
+
+    aliases = {}
+    for canonical, names in table.items():
+        key = normalize_party_name(canonical)
+        aliases[key] = key
+        for name in names:
+            aliases[normalize_party_name(name)] = key
+    return aliases
+
+
+def party_key(name, aliases):
+    """Canonical key of a party name: normalized, then mapped through the alias table."""
+    normalized = normalize_party_name(name)
+    return aliases.get(normalized, normalized)
+
+
+def rule_phrases(keys, aliases):
+    """Phrases whose presence in a party name makes it a near match for keys."""
+    return {phrase for phrase, key in aliases.items() if key in keys} | set(keys)
+
+
+def match_party(name, keys, phrases, aliases):
+    """
+    How a party name matches a rule's parties.
+
+    Args:
+        name (str): Party name from a case
+        keys (set): Canonical keys of the rule's parties
+        phrases (set): Their phrases, from rule_phrases
+
+    Returns:
+        str: 'exact' when the name's canonical key is one of keys, 'near' when the
+             name contains one of the phrases as whole words, else None
+    """
+    if party_key(name, aliases) in keys:
+        return "exact"
+    words = f" {normalize_name(_strip_accents(name or ''))} "
+    if any(f" {phrase} " in words for phrase in phrases):
+        return "near"
+    return None
+
+
+def parse_date(value):
+    """Parse the leading YYYY-MM-DD of an API date, or return None."""
+    try:
+        return datetime.strptime(str(value)[:10], "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+
+
+def case_is_pending(case):
+    """True/False when the case status or end date settles it, None when unknown."""
+    status = (case.get("status") or "").lower()
+    if any(s in status for s in PENDING_STATUSES):
+        return True
+    if any(s in status for s in CONCLUDED_STATUSES) or case.get("endDate"):
+        return False
+    return None
+
+
+def evaluate_rule(rule, cases, as_of, aliases):
+    """
+    Evaluate one rule against an arbitrator's cases.
+
+    Returns:
+        tuple: (evidence, ambiguous) lists of case summaries that matched, and of
+               cases the rule could not decide because data was missing or a
+               party only nearly matched
+    """
+    keys = {party_key(name, aliases) for name in rule["parties"]} - {""}
+    phrases = rule_phrases(keys, aliases)
+    role = (rule.get("role") or "").lower()
+    since = as_of - timedelta(days=round(365.25 * rule["within_years"])) if rule.get("within_years") else None
+
+    evidence = []
+    ambiguous = []
+    for case in cases:
+        parties = case.get("parties") or []
+        if not parties:
+            ambiguous.append(case_summary(case, None))
+            continue
+
+        matched, near = [], []
+        for p in parties:
+            if role not in (p.get("role") or "").lower():
+                continue
+            match = match_party(p.get("name"), keys, phrases, aliases)
+            if match == "exact":
+                matched.append(p)
+            elif match == "near":
+                near.append(p)
+        if not matched and not near:
+            continue
+
+        if since is not None:
+            started = parse_date(case.get("startDate"))
+            if started is None:
+                ambiguous.append(case_summary(case, matched or near))
+                continue
+            if started < since or started > as_of:
+                continue
+
+        if rule.get("pending"):
+            pending = case_is_pending(case)
+            if pending is None:
+                ambiguous.append(case_summary(case, matched or near))
+                continue
+            if not pending:
+                continue
+
+        if matched:
+            evidence.append(case_summary(case, matched))
+        else:
+            # Probably the same party under a longer name; the rules cannot tell
+            ambiguous.append(case_summary(case, near))
+    return evidence, ambiguous
+
+
+def case_summary(case, matched_parties):
+    """Evidence record for one case."""
+    summary = {
+        "id": case.get("id"),
+        "title": case.get("title"),
+        "reference": case.get("reference"),
+        "startDate": case.get("startDate"),
+        "endDate": case.get("endDate"),
+        "status": case.get("status"),
+    }
+    if matched_parties:
+        summary["parties"] = [f"{p.get('name')} ({p.get('role')})" for p in matched_parties]
+    return summary
+
+
+def prescreen(individuals, rules=None, as_of=None, aliases=None):
+    """
+    Classify conflicts from structured case data alone.
+
+    Args:
+        individuals (list): Individuals as returned by search_arbitrator_cases
+        rules (list, optional): Rules as returned by load_rules (default: conflict_rules.json)
+        as_of (date, optional): Reference date for time windows (default: today)
+        aliases (dict, optional): Party alias table as from load_aliases (default: party_aliases.json)
+
+    Returns:
+        dict: 'classification' (RED/YELLOW/GREEN or None), 'decided' (False when the
+              leftovers need LLM review), 'findings' with evidence, and 'ambiguous' cases
+    """
+    rules = load_rules() if rules is None else rules
+    aliases = load_aliases() if aliases is None else aliases
+    as_of = as_of or date.today()
+    cases = [case for individual in individuals for case in individual.get("cases", [])]
+
+    findings = []
+    ambiguous = {}
+    for rule in rules:
+        evidence, unsure = evaluate_rule(rule, cases, as_of, aliases)
+        for case in unsure:
+            ambiguous.setdefault(case["id"], case)
+        if len(evidence) >= rule.get("min_cases", 1):
+            findings.append({
+                "rule": rule["id"],
+                "classification": rule["classification"],
+                "description": rule.get("description", ""),
+                "reference": rule.get("reference", ""),
+                "evidence": evidence,
+            })
+
+    findings.sort(key=lambda f: -SEVERITY[f["classification"]])
+    classification = findings[0]["classification"] if findings else None
+    if classification is None and cases and not ambiguous:
+        # Every case had the data the rules need and none involved the parties
+        classification = "GREEN"
+
+    # Missing data can only make things worse, so a RED finding stands on its own
+    decided = classification == "RED" or (classification is not None and not ambiguous)
+    return {
+        "classification": classification,
+        "decided": decided,
+        "findings": findings,
+        "ambiguous": list(ambiguous.values()),
+    }
@@ -0,0 +1,71 @@
+"""
+Per-search time budgets propagated to every outbound call.
+
+A search binds a deadline with `with deadline(seconds):`. Code below it asks
+request_timeout() for the timeout of each HTTP call, which is the time left (capped
+per call), and raises DeadlineExceeded once the budget is spent, so no upstream
+call can hold a request longer than the budget. Outside a deadline, calls get the
+default per-call timeout.
+"""
+
+import contextvars
+import time
+from contextlib import contextmanager
+
+# (connect, read) timeout for calls made without a deadline
+DEFAULT_TIMEOUT = (5.0, 30.0)
+
+# Below this, starting another call is pointless
+MIN_CALL_SECONDS = 0.05
+
+_current = contextvars.ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """The time budget of the current search is spent."""
+
+
+@contextmanager
+def deadline(seconds):
+    """Give the enclosed block a time budget; nested deadlines can only shorten it."""
+    expires_at = time.monotonic() + seconds
+    outer = _current.get()
+    if outer is not None:
+        expires_at = min(expires_at, outer)
+    token = _current.set(expires_at)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def remaining():
+    """Seconds left in the current deadline, or None outside one."""
+    expires_at = _current.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+def expired():
+    """True once the current deadline has passed."""
+    left = remaining()
+    return left is not None and left < MIN_CALL_SECONDS
+
+
+def request_timeout(default=DEFAULT_TIMEOUT):
+    """
+    Timeout for the next outbound call.
+
+    Returns:
+        tuple: (connect, read) seconds, shortened to the time left in the deadline
+
+    Raises:
+        DeadlineExceeded: If the deadline has passed
+    """
+    left = remaining()
+    if left is None:
+        return default
+    if left < MIN_CALL_SECONDS:
+        raise DeadlineExceeded("Search time budget exhausted")
+    return (min(default[0], left), min(default[1], left))
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+SQLite FTS5 full-text index over collected research dossiers.
+
+Every dossier saved by ArbitratorInfoCollector is indexed incrementally: its text
+fields (raw_information, raw_findings, categorized_findings, connections_found) are
+replaced in the index under the file they were saved to. Searches are ranked with
+bm25 and return highlighted snippets.
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+from contextlib import closing
+
+DEFAULT_INDEX_PATH = os.environ.get("DOSSIER_INDEX_PATH", "dossiers.db")
+
+# Dossier fields holding free text worth searching
+TEXT_FIELDS = ("raw_information", "raw_findings", "categorized_findings", "connections_found")
+
+SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS dossier_fts USING fts5(
+    arbitrator,
+    field,
+    content,
+    source UNINDEXED,
+    saved_at UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2'
+)
+"""
+
+# Column numbers in dossier_fts, for snippet()
+CONTENT_COLUMN = 2
+
+
+def connect(path=DEFAULT_INDEX_PATH):
+    """Open the index, creating the FTS5 table on first use."""
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA busy_timeout=5000")
+    try:
+        conn.execute(SCHEMA)
+    except sqlite3.OperationalError as e:
+        conn.close()
+        raise RuntimeError(f"SQLite was built without FTS5 support: {e}")
+    return conn
+
+
+def extract_texts(data, arbitrator=None):
+    """
+    Yield (arbitrator, field, text) for every text field in a dossier.
+
+    Master files nest the individual dossiers, so the walk is recursive.
+    """
+    if isinstance(data, dict):
+        arbitrator = (
+            data.get("arbitrator_name")
+            or (data.get("arbitrator_data") or {}).get("name")
+            or arbitrator
+        )
+        for key, value in data.items():
+            if key in TEXT_FIELDS and isinstance(value, str) and value.strip():
+                yield arbitrator or "", key, value
+            elif isinstance(value, (dict, list)):
+                yield from extract_texts(value, arbitrator)
+    elif isinstance(data, list):
+        for item in data:
+            yield from extract_texts(item, arbitrator)
+
+
+def index_dossier(data, source, path=DEFAULT_INDEX_PATH):
+    """
+    Replace the indexed text of one saved dossier.
+
+    Args:
+        data (dict): Dossier as saved by ArbitratorInfoCollector.save_to_file
+        source (str): File the dossier was saved to; re-saving it replaces its rows
+        path (str): Index database
+
+    Returns:
+        int: Number of text fields indexed
+    """
+    source = os.path.abspath(source)
+    saved_at = data.get("timestamp", "") if isinstance(data, dict) else ""
+    rows = [
+        (arbitrator, field, text, source, saved_at)
+        for arbitrator, field, text in extract_texts(data)
+    ]
+    with closing(connect(path)) as conn, conn:
+        conn.execute("DELETE FROM dossier_fts WHERE source = ?", (source,))
+        conn.executemany(
+            "INSERT INTO dossier_fts (arbitrator, field, content, source, saved_at) VALUES (?, ?, ?, ?, ?)",
+            rows,
+        )
+    return len(rows)
+
+
+def remove_dossier(source, path=DEFAULT_INDEX_PATH):
+    """
+    Drop the indexed text of one saved dossier.
+
+    Returns:
+        int: Number of text fields removed
+    """
+    with closing(connect(path)) as conn, conn:
+        return conn.execute("DELETE FROM dossier_fts WHERE source = ?", (os.path.abspath(source),)).rowcount
+
+
+def to_match_query(query):
+    """
+    Turn user input into an FTS5 MATCH expression.
+
+    Input using FTS5 syntax (double quotes, AND/OR/NOT, NEAR) is passed through;
+    anything else is searched as a single phrase, so "Lenz & Staehelin" works as typed.
+    """
+    if '"' in query or re.search(r"\b(AND|OR|NOT|NEAR)\b", query):
+        return query
+    return '"' + query.replace('"', '""') + '"'
+
+
+def search(query, limit=20, path=DEFAULT_INDEX_PATH, highlight=("[", "]")):
+    """
+    Ranked full-text search across all dossiers.
+
+    Args:
+        query (str): Phrase, or an FTS5 boolean/phrase expression
+        limit (int): Maximum number of hits
+        path (str): Index database
+        highlight (tuple): Markers placed around matched terms in snippets
+
+    Returns:
+        dict: 'hits' (best first, with snippet) and the distinct 'arbitrators' hit
+    """
+    with closing(connect(path)) as conn:
+        rows = conn.execute(
+            f"""
+            SELECT arbitrator, field, source, saved_at,
+                   snippet(dossier_fts, {CONTENT_COLUMN}, ?, ?, '…', 16),
+                   bm25(dossier_fts) AS score
+            FROM dossier_fts
+            WHERE dossier_fts MATCH ?
+            ORDER BY score
+            LIMIT ?
+            """,
+            (highlight[0], highlight[1], to_match_query(query), limit),
+        ).fetchall()
+
+    hits = [
+        {
+            "arbitrator": arbitrator,
+            "field": field,
+            "source": os.path.basename(source),
+            "saved_at": saved_at,
+            "snippet": snippet,
+            # bm25 is lower-is-better; flip it so larger means more relevant
+            "score": -score,
+        }
+        for arbitrator, field, source, saved_at, snippet, score in rows
+    ]
+    arbitrators = list(dict.fromkeys(hit["arbitrator"] for hit in hits))
+    return {"hits": hits, "arbitrators": arbitrators}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index and search research dossiers")
+    parser.add_argument("--index-path", default=DEFAULT_INDEX_PATH, help="Index database (default: dossiers.db)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    index_parser = subparsers.add_parser("index", help="Index saved dossier JSON files")
+    index_parser.add_argument("files", nargs="+", help="Dossier files to (re)index")
+
+    search_parser = subparsers.add_parser("search", help="Search the index")
+    search_parser.add_argument("query", help="Phrase or FTS5 query")
+    search_parser.add_argument("--limit", type=int, default=20, help="Maximum number of hits (default: 20)")
+
+    args = parser.parse_args()
+
+    if args.command == "index":
+        for filename in args.files:
+            with open(filename, encoding="utf-8") as f:
+                count = index_dossier(json.load(f), filename, args.index_path)
+            print(f"Indexed {count} field(s) from {filename}")
+    else:
+        results = search(args.query, args.limit, args.index_path)
+        for hit in results["hits"]:
+            print(f"{hit['score']:6.2f}  {hit['arbitrator']}  {hit['field']}  ({hit['source']})")
+            print(f"        {hit['snippet']}")
+        print(f"\nArbitrators: {', '.join(results['arbitrators']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
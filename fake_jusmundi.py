@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the JusMundi API with configurable latency.
+
+Serves the endpoints search_arbitrator_cases uses (name search, individual,
+paginated decisions and case details) with deterministic data derived from the
+requested names and ids, so the web app can be exercised end to end without the
+real API or its quota. Every response is delayed by a random upstream latency,
+and a share of requests can be made to fail, to see how the app behaves when
+JusMundi is slow or flaky.
+
+    python fake_jusmundi.py --port 8765 --latency-ms 300
+    JUSMUNDI_BASE_URL=http://127.0.0.1:8765 python app.py
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Decisions per page of the paginated case search, as requested by the app
+PAGE_SIZE = 3
+
+PARTIES = ["Kingdom of Norway", "Republic of Ecuador", "Acme Energy AS", "Nordic Holdings Ltd", "United Mexican States"]
+STATUSES = ["Pending", "Concluded", "Discontinued"]
+
+
+def stable_id(*parts):
+    """Short id derived from parts, the same on every run."""
+    return hashlib.sha1("|".join(map(str, parts)).encode("utf-8")).hexdigest()[:10]
+
+
+class FakeJusMundi:
+    def __init__(self, latency_ms=200.0, jitter_ms=100.0, error_rate=0.0, cases_per_arbitrator=12, seed=None):
+        """
+        Configure the fake API.
+
+        Args:
+            latency_ms (float): Mean added latency per request
+            jitter_ms (float): Latency varies uniformly within +/- this much
+            error_rate (float): Share of requests answered with 503
+            cases_per_arbitrator (int): Cases every searched name has
+            seed (int, optional): Seed for reproducible latencies and errors
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.cases_per_arbitrator = cases_per_arbitrator
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.requests = 0
+        self.errors = 0
+        self.max_in_flight = 0
+        self.server = None
+
+    def delay(self):
+        """Sleep for one upstream latency; True when the request should fail."""
+        with self._lock:
+            latency = max(0.0, self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms))
+            failed = self._random.random() < self.error_rate
+        time.sleep(latency / 1000)
+        return failed
+
+    def name_search(self, name):
+        individual_id = stable_id("individual", name)
+        return {
+            "data": [{"relationships": {"individuals": {"data": [{"id": individual_id, "meta": {"role": "arbitrator"}}]}}}],
+            "included": [{"type": "individuals", "id": individual_id, "attributes": {"name": name}}],
+        }
+
+    def decisions(self, name, page):
+        total_pages = max(1, -(-self.cases_per_arbitrator // PAGE_SIZE))
+        first = (page - 1) * PAGE_SIZE
+        case_ids = [stable_id("case", name, n) for n in range(first, min(first + PAGE_SIZE, self.cases_per_arbitrator))]
+        return {
+            "data": [{"id": stable_id("decision", case_id)} for case_id in case_ids],
+            "included": [{"type": "cases", "id": case_id} for case_id in case_ids],
+            "meta": {"totalPages": total_pages},
+        }
+
+    def case(self, case_id):
+        n = int(case_id, 16)
+        year = 2005 + n % 19
+        concluded = n % 3 != 0
+        parties = [
+            {"type": "parties", "id": stable_id(case_id, role), "attributes": {"name": PARTIES[(n >> shift) % len(PARTIES)], "role": role, "type": kind}}
+            for role, kind, shift in (("Claimant", "Company", 3), ("Respondent", "State", 7))
+        ]
+        return {
+            "data": {"id": case_id, "attributes": {
+                "title": f"Case {case_id}",
+                "reference": f"ARB/{year % 100:02d}/{n % 97}",
+                "status": STATUSES[n % len(STATUSES)],
+                "startDate": f"{year}-{1 + n % 12:02d}-01",
+                "endDate": f"{year + 2}-06-30" if concluded else "",
+                "organization": "ICSID" if n % 2 else "PCA",
+            }},
+            "included": parties,
+        }
+
+    def respond(self, path, query):
+        """Response body for a request, or None for unknown paths."""
+        parts = path.strip("/").split("/")
+        if parts == ["decisions"]:
+            name = query.get("search", [""])[0]
+            if query.get("include", [""])[0] == "individuals":
+                return self.name_search(name)
+            return self.decisions(name, int(query.get("page", ["1"])[0]))
+        if len(parts) == 2 and parts[0] == "individuals":
+            return {"data": {"id": parts[1], "attributes": {"nationality": "Norwegian"}}}
+        if len(parts) == 2 and parts[0] == "cases":
+            return self.case(parts[1])
+        return None
+
+    def handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with api._lock:
+                    api.requests += 1
+                    api._in_flight += 1
+                    api.max_in_flight = max(api.max_in_flight, api._in_flight)
+                try:
+                    url = urlparse(self.path)
+                    failed = api.delay()
+                    body = None if failed else api.respond(url.path, parse_qs(url.query))
+                    if failed:
+                        with api._lock:
+                            api.errors += 1
+                        self.send_response(503)
+                        body = {"errors": [{"title": "Service unavailable"}]}
+                    elif body is None:
+                        self.send_response(404)
+                        body = {"errors": [{"title": "Not found"}]}
+                    else:
+                        self.send_response(200)
+                    payload = json.dumps(body).encode("utf-8")
+                    self.send_header("Content-Type", "application/vnd.api+json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                finally:
+                    with api._lock:
+                        api._in_flight -= 1
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self, host="127.0.0.1", port=0):
+        """Serve in a background thread; returns the base URL."""
+        self.server = ThreadingHTTPServer((host, port), self.handler())
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="fake-jusmundi", daemon=True).start()
+        return f"http://{host}:{self.server.server_address[1]}"
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+    def stats(self):
+        with self._lock:
+            return {"requests": self.requests, "errors": self.errors, "max_in_flight": self.max_in_flight}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake JusMundi API for local development and load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Mean added latency per request (default: 200)")
+    parser.add_argument("--jitter-ms", type=float, default=100.0, help="Uniform latency spread around the mean (default: 100)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with 503 (default: 0)")
+    parser.add_argument("--cases", type=int, default=12, help="Cases per arbitrator (default: 12)")
+    args = parser.parse_args()
+
+    api = FakeJusMundi(args.latency_ms, args.jitter_ms, args.error_rate, args.cases)
+    print(f"Fake JusMundi API at {api.start(args.host, args.port)}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        api.stop()
+
+
+if __name__ == "__main__":
+    main()
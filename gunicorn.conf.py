@@ -0,0 +1,25 @@
+# Gunicorn settings for serving wsgi:app with several worker processes.
+# Every value can be overridden from the environment.
+import multiprocessing
+import os
+
+bind = os.environ.get("BIND", f"0.0.0.0:{os.environ.get('PORT', 5001)}")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+# Screenings spend most of their time waiting on JusMundi, so each worker also runs threads
+worker_class = "gthread"
+threads = int(os.environ.get("WEB_THREADS", 8))
+timeout = int(os.environ.get("WEB_TIMEOUT", 120))
+graceful_timeout = 30
+keepalive = 5
+
+# Load the app once in the master and fork workers from it
+preload_app = True
+
+
+def post_fork(server, worker):
+    # Sockets opened in the master must not be shared with workers
+    from app import init_worker
+    from wsgi import app
+
+    # Split the outbound quota between all workers of this server
+    init_worker(app, workers=server.cfg.workers)
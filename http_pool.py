@@ -0,0 +1,156 @@
+"""
+Per-process pooled HTTP session for outbound JusMundi calls.
+
+Each worker process lazily builds its own requests.Session so keep-alive
+connections are reused across requests but never shared across a fork. Slow calls
+can be hedged: hedged_get sends a duplicate once the first copy is slower than a
+given latency (typically a recent percentile from LatencyTracker).
+"""
+
+import collections
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+_settings = {
+    "pool_connections": 10,
+    "pool_maxsize": 20,
+    "max_retries": 0,
+}
+_lock = threading.Lock()
+_session = None
+_pid = None
+
+
+def configure(**settings):
+    """
+    Set the connection pool options used for sessions created from now on.
+
+    Args:
+        pool_connections (int): Number of per-host pools to cache
+        pool_maxsize (int): Maximum connections kept open per host
+        max_retries (int): Retries for failed connections
+    """
+    unknown = set(settings) - set(_settings)
+    if unknown:
+        raise ValueError(f"Unknown HTTP pool settings: {', '.join(sorted(unknown))}")
+    _settings.update(settings)
+    reset()
+
+
+def get_session():
+    """Return this process's pooled session, creating it on first use or after a fork."""
+    global _session, _pid
+    if _session is not None and _pid == os.getpid():
+        return _session
+
+    with _lock:
+        if _session is None or _pid != os.getpid():
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=_settings["pool_connections"],
+                pool_maxsize=_settings["pool_maxsize"],
+                max_retries=_settings["max_retries"],
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+            _pid = os.getpid()
+    return _session
+
+
+def reset():
+    """Drop the current session so the next call to get_session builds a fresh pool."""
+    global _session, _pid
+    with _lock:
+        if _session is not None and _pid == os.getpid():
+            _session.close()
+        _session = None
+        _pid = None
+
+
+class LatencyTracker:
+    def __init__(self, size=200):
+        """Keep the latencies of the last size calls."""
+        self._samples = collections.deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, q, min_samples=20):
+        """The q-th percentile latency in seconds, or None until min_samples calls were seen."""
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * q / 100))]
+
+
+_hedge_executor = None
+_hedge_pid = None
+
+
+def _executor():
+    global _hedge_executor, _hedge_pid
+    # Threads do not survive a fork, so each worker process builds its own pool
+    if _hedge_executor is None or _hedge_pid != os.getpid():
+        with _lock:
+            if _hedge_executor is None or _hedge_pid != os.getpid():
+                from concurrent.futures import ThreadPoolExecutor
+                _hedge_executor = ThreadPoolExecutor(max_workers=_settings["pool_maxsize"], thread_name_prefix="hedge")
+                _hedge_pid = os.getpid()
+    return _hedge_executor
+
+
+def hedged_get(url, hedge_after=None, allow_hedge=None, tracker=None, **kwargs):
+    """
+    GET url, sending one duplicate request if the first is slower than hedge_after.
+
+    Whichever copy answers first wins; the other is left to finish in the background.
+
+    Args:
+        url (str): URL to fetch
+        hedge_after (float, optional): Seconds to wait before hedging (None: never hedge)
+        allow_hedge (callable, optional): Asked before sending the duplicate, e.g. to
+            check the outbound quota
+        tracker (LatencyTracker, optional): Receives the winning call's latency
+        **kwargs: Passed to Session.get (headers, params, timeout, ...)
+
+    Returns:
+        tuple: (response, hedged)
+    """
+    from concurrent.futures import FIRST_COMPLETED, wait
+
+    session = get_session()
+    started = time.monotonic()
+    if hedge_after is None:
+        response = session.get(url, **kwargs)
+        if tracker is not None:
+            tracker.record(time.monotonic() - started)
+        return response, False
+
+    executor = _executor()
+    first = executor.submit(session.get, url, **kwargs)
+    done, _ = wait([first], timeout=hedge_after)
+    if done or (allow_hedge is not None and not allow_hedge()):
+        response = first.result()
+        if tracker is not None:
+            tracker.record(time.monotonic() - started)
+        return response, False
+
+    pending = {first, executor.submit(session.get, url, **kwargs)}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                if tracker is not None:
+                    tracker.record(time.monotonic() - started)
+                return future.result(), True
+            error = future.exception()
+    raise error
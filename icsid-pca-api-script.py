@@ -3,15 +3,32 @@ import requests
 import json
 import sys
 import argparse
-from typing import Dict, List, Any, Optional, Set, Tuple
+from contextlib import nullcontext
+from typing import Dict, Iterator, List, Any, Optional, Set, Tuple
+
+import deadlines
+
+# Relationships requested alongside a case so one round trip covers the whole case
+CASE_INCLUDES = "parties,decisions,decisions.individuals"
+
+# JSON:API resources keyed by (type, id), shared across every document fetched
+IdentityMap = Dict[Tuple[str, str], Dict[str, Any]]
 
 def main():
     parser = argparse.ArgumentParser(description="Fetch and format ICSID & PCA case data")
     parser.add_argument("--api-key", required=True, help="API key for authentication")
     parser.add_argument("--case-id", type=int, help="Specific case ID to retrieve (defaults to first available)")
     parser.add_argument("--arbitrator", type=str, help="Search for arbitrator by name")
+    parser.add_argument("--jsonl", action="store_true", help="Stream the arbitrator's cases as JSON lines, one slim record per case")
+    parser.add_argument("--full", action="store_true", help="With --jsonl, include the raw case, parties and decisions in each record")
+    parser.add_argument("--deadline", type=float, help="Time budget in seconds; cases not fetched by then are reported as missing")
     args = parser.parse_args()
-    
+    budget = deadlines.deadline(args.deadline) if args.deadline is not None else nullcontext()
+    with budget:
+        run(args)
+
+def run(args):
+    """Carry out the command line request in args."""
     # API configuration
     base_url = "https://api.jusmundi.com/stanford"
     headers = {
@@ -20,6 +37,25 @@ def main():
     }
     
     try:
+        # Stream slim case records as they are fetched so memory stays flat
+        if args.arbitrator and args.jsonl:
+            identity_map: IdentityMap = {}
+            arbitrator_info, case_ids = find_arbitrator_cases(base_url, headers, args.arbitrator, identity_map)
+            if not arbitrator_info:
+                print(f"No arbitrator found with name containing '{args.arbitrator}'", file=sys.stderr)
+                sys.exit(0)
+            
+            count = 0
+            missing: List[str] = []
+            for case_info in iter_arbitrator_cases(base_url, headers, arbitrator_info, case_ids, identity_map, full=args.full, missing=missing):
+                sys.stdout.write(json.dumps(case_info, ensure_ascii=False) + "\n")
+                sys.stdout.flush()
+                count += 1
+            print(f"Total cases found: {count}", file=sys.stderr)
+            if missing:
+                print(f"Partial results: {len(missing)} case(s) not fetched in time: {', '.join(map(str, missing))}", file=sys.stderr)
+            sys.exit(0)
+        
         # If arbitrator name is provided, search for arbitrator and related cases
         if args.arbitrator:
             print(f"Searching for arbitrator: {args.arbitrator}")
@@ -45,24 +81,24 @@ def main():
         if args.case_id:
             case_id = args.case_id
             print(f"Fetching case ID: {case_id}")
-            case = get_case_by_id(base_url, headers, case_id)
         else:
             print("Fetching first available case...")
             case = get_first_case(base_url, headers)
             case_id = int(case["id"])
             print(f"Using case ID: {case_id}")
         
-        # Get case details
+        # Get case details, parties, decisions and their individuals in one compound document
         print("Fetching case details...")
-        case_parties = get_case_parties(base_url, headers, case_id)
-        case_decisions = get_case_decisions(base_url, headers, case_id)
+        identity_map: IdentityMap = {}
+        case = get_case_compound(base_url, headers, case_id, identity_map)
+        case_parties = resolve_related(case, "parties", identity_map)
+        case_decisions = resolve_related(case, "decisions", identity_map)
         
         # Get individuals from decisions
         print("Fetching individuals involved in decisions...")
         individuals = []
         for decision in case_decisions:
-            decision_id = int(decision["id"])
-            decision_individuals = get_decision_individuals(base_url, headers, decision_id)
+            decision_individuals = get_decision_individuals_cached(base_url, headers, decision, identity_map)
             individuals.extend(decision_individuals)
         
         # Print formatted result
@@ -84,81 +120,175 @@ def search_arbitrator_with_cases(base_url: str, headers: Dict[str, str], arbitra
     Search for an arbitrator by name and return their information along with related cases.
     Returns a tuple of (arbitrator_info, related_cases).
     """
+    identity_map: IdentityMap = {}
+    
+    try:
+        arbitrator_info, case_ids = find_arbitrator_cases(base_url, headers, arbitrator_name, identity_map)
+        if not arbitrator_info:
+            return None, []
+        
+        missing: List[str] = []
+        related_cases = list(iter_arbitrator_cases(base_url, headers, arbitrator_info, case_ids, identity_map, full=True, missing=missing))
+        
+        # Enhance arbitrator info with case count and other metadata
+        if arbitrator_info and "attributes" in arbitrator_info:
+            arbitrator_info["attributes"]["total_cases_found"] = len(related_cases)
+            if missing:
+                arbitrator_info["attributes"]["partial"] = True
+                arbitrator_info["attributes"]["missing_case_ids"] = missing
+            # Add additional arbitrator metadata if available
+            
+        return arbitrator_info, related_cases
+    
+    except (deadlines.DeadlineExceeded, requests.Timeout):
+        raise
+    except Exception as e:
+        print(f"Error searching for arbitrator: {e}", file=sys.stderr)
+        return None, []
+
+def find_arbitrator_cases(base_url: str, headers: Dict[str, str], arbitrator_name: str, identity_map: IdentityMap) -> Tuple[Optional[Dict[str, Any]], List[str]]:
+    """
+    Search for an arbitrator by name and collect the IDs of the cases in the matching decisions.
+    Returns a tuple of (arbitrator_info, case_ids); arbitrator_info is None if nobody matched.
+    """
     # First, find decisions related to the arbitrator name
     url = f"{base_url}/decisions"
     params = {
         "search": arbitrator_name,
-        "include": "cases",
+        "include": "cases,individuals",
         "count": 10  # Adjust as needed
     }
     
-    try:
-        print(f"Searching for decisions involving '{arbitrator_name}'...")
-        response = requests.get(url, headers=headers, params=params)
-        response.raise_for_status()
-        
-        data = response.json()
-        decisions = data.get("data", [])
-        included = data.get("included", [])
-        
-        # No decisions found
-        if not decisions:
-            return None, []
-        
-        # Collect unique case IDs from decision relationships
-        case_ids = set()
-        for decision in decisions:
-            relationships = decision.get("relationships", {})
-            case_data = relationships.get("cases", {}).get("data", [])
-            for case_ref in case_data:
-                if case_ref.get("id"):
-                    case_ids.add(case_ref.get("id"))
+    print(f"Searching for decisions involving '{arbitrator_name}'...", file=sys.stderr)
+    response = requests.get(url, timeout=deadlines.request_timeout(), headers=headers, params=params)
+    response.raise_for_status()
+    
+    data = response.json()
+    decisions = data.get("data", [])
+    index_resources(data, identity_map)
+    
+    # No decisions found
+    if not decisions:
+        return None, []
+    
+    # Collect unique case IDs from decision relationships
+    case_ids = set()
+    for decision in decisions:
+        relationships = decision.get("relationships", {})
+        case_data = relationships.get("cases", {}).get("data", [])
+        for case_ref in case_data:
+            if case_ref.get("id"):
+                case_ids.add(case_ref.get("id"))
+    
+    # Now for each decision, find the arbitrator
+    arbitrator_info = None
+    
+    for decision in decisions:
+        # Ensure decision is a dictionary
+        if not isinstance(decision, dict):
+            print(f"Warning: Expected decision to be a dictionary, got {type(decision)}", file=sys.stderr)
+            continue
+            
+        decision_id = decision.get("id")
+        if not decision_id:
+            continue
+            
+        # Get individuals involved in this decision
+        individuals = get_decision_individuals_cached(base_url, headers, decision, identity_map)
         
-        # Now for each decision, find the arbitrator
-        arbitrator_info = None
-        related_cases = []
+        # Ensure individuals is a list
+        if not isinstance(individuals, list):
+            print(f"Warning: Expected individuals to be a list, got {type(individuals)}", file=sys.stderr)
+            continue
+            
+        # Look for arbitrators
+        for individual in individuals:
+            # Ensure individual is a dictionary
+            if not isinstance(individual, dict):
+                print(f"Warning: Expected individual to be a dictionary, got {type(individual)}", file=sys.stderr)
+                continue
+                
+            attributes = individual.get("attributes", {})
+            name = attributes.get("name", "")
+            role = attributes.get("role", "").lower()
+            
+            # Check if this individual's name matches our search and they're an arbitrator
+            if (arbitrator_name.lower() in name.lower() and 
+                any(r in role for r in ["arbitrator", "judge", "tribunal", "president"])):
+                arbitrator_info = individual
+                break
         
+        if arbitrator_info:
+            break
+    
+    # If we still haven't found a clear arbitrator, use the first individual that matches by name
+    if not arbitrator_info:
         for decision in decisions:
             # Ensure decision is a dictionary
             if not isinstance(decision, dict):
-                print(f"Warning: Expected decision to be a dictionary, got {type(decision)}")
                 continue
                 
             decision_id = decision.get("id")
             if not decision_id:
                 continue
                 
-            # Get individuals involved in this decision
-            individuals = get_decision_individuals(base_url, headers, int(decision_id))
+            individuals = get_decision_individuals_cached(base_url, headers, decision, identity_map)
             
             # Ensure individuals is a list
             if not isinstance(individuals, list):
-                print(f"Warning: Expected individuals to be a list, got {type(individuals)}")
                 continue
                 
-            # Look for arbitrators
             for individual in individuals:
                 # Ensure individual is a dictionary
                 if not isinstance(individual, dict):
-                    print(f"Warning: Expected individual to be a dictionary, got {type(individual)}")
                     continue
                     
                 attributes = individual.get("attributes", {})
                 name = attributes.get("name", "")
-                role = attributes.get("role", "").lower()
                 
-                # Check if this individual's name matches our search and they're an arbitrator
-                if (arbitrator_name.lower() in name.lower() and 
-                    any(r in role for r in ["arbitrator", "judge", "tribunal", "president"])):
+                if arbitrator_name.lower() in name.lower():
                     arbitrator_info = individual
                     break
             
             if arbitrator_info:
                 break
-        
-        # If we still haven't found a clear arbitrator, use the first individual that matches by name
-        if not arbitrator_info:
-            for decision in decisions:
+    
+    # If we still haven't found the arbitrator, return empty results
+    if not arbitrator_info:
+        return None, []
+    
+    return arbitrator_info, sorted(case_ids)
+
+def iter_arbitrator_cases(base_url: str, headers: Dict[str, str], arbitrator_info: Dict[str, Any], case_ids: List[str], identity_map: IdentityMap, full: bool = False, missing: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield one record per case in which the arbitrator took part in at least one decision.
+    Records are slim (id, title, reference, year, claimant, respondent, arbitrator_roles)
+    unless full is set, which adds the raw case, its parties and the arbitrator's decisions.
+    Each case is resolved against its own copy of identity_map, so its payloads can be
+    freed as soon as its record has been consumed. A case whose fetch times out is
+    appended to missing; when the time budget runs out, the cases not yet fetched are
+    appended to missing and iteration stops.
+    """
+    for position, case_id in enumerate(case_ids):
+        case_map = dict(identity_map)
+        try:
+            # Convert case_id to int if it's a string
+            case_id_int = int(case_id) if isinstance(case_id, str) else case_id
+            
+            # One compound request replaces the case, parties, decisions and
+            # per-decision individuals calls
+            case_details = get_case_compound(base_url, headers, case_id_int, case_map)
+            parties = resolve_related(case_details, "parties", case_map)
+            case_decisions = resolve_related(case_details, "decisions", case_map)
+            
+            # Ensure case_decisions is a list
+            if not isinstance(case_decisions, list):
+                print(f"Warning: Expected case_decisions to be a list, got {type(case_decisions)}", file=sys.stderr)
+                continue
+            
+            # Filter to only include decisions where our arbitrator is involved
+            arbitrator_decisions = []
+            for decision in case_decisions:
                 # Ensure decision is a dictionary
                 if not isinstance(decision, dict):
                     continue
@@ -166,140 +296,91 @@ def search_arbitrator_with_cases(base_url: str, headers: Dict[str, str], arbitra
                 decision_id = decision.get("id")
                 if not decision_id:
                     continue
-                    
-                individuals = get_decision_individuals(base_url, headers, int(decision_id))
                 
-                # Ensure individuals is a list
-                if not isinstance(individuals, list):
+                decision_individuals = get_decision_individuals_cached(base_url, headers, decision, case_map)
+                
+                # Ensure decision_individuals is a list
+                if not isinstance(decision_individuals, list):
+                    continue
+                
+                # Check if arbitrator is in this decision
+                arbitrator_in_decision = False
+                arbitrator_role_in_decision = None
+                
+                # Ensure arbitrator_info is a dictionary
+                if not isinstance(arbitrator_info, dict):
                     continue
                     
-                for individual in individuals:
+                for individual in decision_individuals:
                     # Ensure individual is a dictionary
                     if not isinstance(individual, dict):
                         continue
                         
-                    attributes = individual.get("attributes", {})
-                    name = attributes.get("name", "")
-                    
-                    if arbitrator_name.lower() in name.lower():
-                        arbitrator_info = individual
+                    if individual.get("id") == arbitrator_info.get("id"):
+                        arbitrator_in_decision = True
+                        arbitrator_role_in_decision = individual.get("attributes", {}).get("role")
                         break
                 
-                if arbitrator_info:
-                    break
-        
-        # If we still haven't found the arbitrator, return empty results
-        if not arbitrator_info:
-            return None, []
-        
-        # For each case ID, get detailed information
-        for case_id in case_ids:
-            try:
-                # Convert case_id to int if it's a string
-                case_id_int = int(case_id) if isinstance(case_id, str) else case_id
-                
-                case_details = get_case_by_id(base_url, headers, case_id_int)
-                parties = get_case_parties(base_url, headers, case_id_int)
-                case_decisions = get_case_decisions(base_url, headers, case_id_int)
-                
-                # Ensure case_decisions is a list
-                if not isinstance(case_decisions, list):
-                    print(f"Warning: Expected case_decisions to be a list, got {type(case_decisions)}")
+                if arbitrator_in_decision:
+                    # Add arbitrator's role to the decision
+                    decision_with_role = decision.copy() if full else {}
+                    if "arbitrator_role" not in decision_with_role:
+                        decision_with_role["arbitrator_role"] = arbitrator_role_in_decision
+                    arbitrator_decisions.append(decision_with_role)
+            
+            # Only include case if arbitrator is involved in at least one decision
+            if arbitrator_decisions:
+                # Extract key case information
+                # Ensure case_details is a dictionary
+                if not isinstance(case_details, dict):
                     continue
-                
-                # Filter to only include decisions where our arbitrator is involved
-                arbitrator_decisions = []
-                for decision in case_decisions:
-                    # Ensure decision is a dictionary
-                    if not isinstance(decision, dict):
-                        continue
-                        
-                    decision_id = decision.get("id")
-                    if not decision_id:
-                        continue
-                    
-                    # Convert decision_id to int if it's a string    
-                    decision_id_int = int(decision_id) if isinstance(decision_id, str) else decision_id
-                    
-                    decision_individuals = get_decision_individuals(base_url, headers, decision_id_int)
-                    
-                    # Ensure decision_individuals is a list
-                    if not isinstance(decision_individuals, list):
-                        continue
-                    
-                    # Check if arbitrator is in this decision
-                    arbitrator_in_decision = False
-                    arbitrator_role_in_decision = None
                     
-                    # Ensure arbitrator_info is a dictionary
-                    if not isinstance(arbitrator_info, dict):
-                        continue
-                        
-                    for individual in decision_individuals:
-                        # Ensure individual is a dictionary
-                        if not isinstance(individual, dict):
-                            continue
-                            
-                        if individual.get("id") == arbitrator_info.get("id"):
-                            arbitrator_in_decision = True
-                            arbitrator_role_in_decision = individual.get("attributes", {}).get("role")
-                            break
-                    
-                    if arbitrator_in_decision:
-                        # Add arbitrator's role to the decision
-                        decision_with_role = decision.copy()
-                        if "arbitrator_role" not in decision_with_role:
-                            decision_with_role["arbitrator_role"] = arbitrator_role_in_decision
-                        arbitrator_decisions.append(decision_with_role)
+                case_title = case_details.get("attributes", {}).get("title", "Untitled Case")
+                case_reference = case_details.get("attributes", {}).get("reference", "No Reference")
+                case_year = case_details.get("attributes", {}).get("year")
                 
-                # Only include case if arbitrator is involved in at least one decision
-                if arbitrator_decisions:
-                    # Extract key case information
-                    # Ensure case_details is a dictionary
-                    if not isinstance(case_details, dict):
-                        continue
-                        
-                    case_title = case_details.get("attributes", {}).get("title", "Untitled Case")
-                    case_reference = case_details.get("attributes", {}).get("reference", "No Reference")
-                    case_year = case_details.get("attributes", {}).get("year")
-                    
-                    # Get information about parties (claimant and respondent)
-                    claimant = find_party_by_role(parties, "claimant")
-                    respondent = find_party_by_role(parties, "respondent")
-                    
-                    claimant_name = get_attribute(claimant, "name", "Unknown Claimant")
-                    respondent_name = get_attribute(respondent, "name", "Unknown Respondent")
-                    
-                    case_info = {
-                        "id": case_id,
-                        "title": case_title,
-                        "reference": case_reference,
-                        "year": case_year,
-                        "claimant": claimant_name,
-                        "respondent": respondent_name,
-                        "full_case_details": case_details,
-                        "parties": parties,
-                        "arbitrator_decisions": arbitrator_decisions,
-                    }
-                    related_cases.append(case_info)
-            except Exception as e:
-                print(f"Warning: Error processing case {case_id}: {e}", file=sys.stderr)
+                # Get information about parties (claimant and respondent)
+                claimant = find_party_by_role(parties, "claimant")
+                respondent = find_party_by_role(parties, "respondent")
+                
+                claimant_name = get_attribute(claimant, "name", "Unknown Claimant")
+                respondent_name = get_attribute(respondent, "name", "Unknown Respondent")
+                
+                case_info = {
+                    "id": case_id,
+                    "title": case_title,
+                    "reference": case_reference,
+                    "year": case_year,
+                    "claimant": claimant_name,
+                    "respondent": respondent_name,
+                    "arbitrator_roles": sorted({d["arbitrator_role"] for d in arbitrator_decisions if d["arbitrator_role"]}),
+                }
+                if full:
+                    case_info["full_case_details"] = case_details
+                    case_info["parties"] = parties
+                    case_info["arbitrator_decisions"] = arbitrator_decisions
+        except (deadlines.DeadlineExceeded, requests.Timeout) as e:
+            if not isinstance(e, deadlines.DeadlineExceeded) and not deadlines.expired():
+                # One slow call; the case is still unknown, so report it rather than drop it
+                print(f"Warning: Timed out fetching case {case_id}: {e}", file=sys.stderr)
+                if missing is not None:
+                    missing.append(case_id)
+                continue
+            if missing is not None:
+                missing.extend(case_ids[position:])
+            return
+        except Exception as e:
+            print(f"Warning: Error processing case {case_id}: {e}", file=sys.stderr)
+            continue
         
-        # Enhance arbitrator info with case count and other metadata
-        if arbitrator_info and "attributes" in arbitrator_info:
-            arbitrator_info["attributes"]["total_cases_found"] = len(related_cases)
-            # Add additional arbitrator metadata if available
-            
-        return arbitrator_info, related_cases
-    
-    except Exception as e:
-        print(f"Error searching for arbitrator: {e}", file=sys.stderr)
-        return None, []
+        if arbitrator_decisions:
+            yield case_info
+
 
 def get_case_by_id(base_url: str, headers: Dict[str, str], case_id: int) -> Dict[str, Any]:
     """Get a specific case by ID."""
     url = f"{base_url}/cases/{case_id}"
-    response = requests.get(url, headers=headers)
+    response = requests.get(url, timeout=deadlines.request_timeout(), headers=headers)
     response.raise_for_status()
     
     data = response.json().get("data")
@@ -313,7 +394,7 @@ def get_first_case(base_url: str, headers: Dict[str, str]) -> Dict[str, Any]:
     url = f"{base_url}/cases"
     params = {"page": 1, "count": 1}
     
-    response = requests.get(url, headers=headers, params=params)
+    response = requests.get(url, timeout=deadlines.request_timeout(), headers=headers, params=params)
     response.raise_for_status()
     
     data = response.json().get("data", [])
@@ -325,7 +406,7 @@ def get_first_case(base_url: str, headers: Dict[str, str]) -> Dict[str, Any]:
 def get_case_parties(base_url: str, headers: Dict[str, str], case_id: int) -> List[Dict[str, Any]]:
     """Get parties for a specific case."""
     url = f"{base_url}/cases/{case_id}/parties"
-    response = requests.get(url, headers=headers)
+    response = requests.get(url, timeout=deadlines.request_timeout(), headers=headers)
     response.raise_for_status()
     
     return response.json().get("data", [])
@@ -333,7 +414,7 @@ def get_case_parties(base_url: str, headers: Dict[str, str], case_id: int) -> Li
 def get_case_decisions(base_url: str, headers: Dict[str, str], case_id: int) -> List[Dict[str, Any]]:
     """Get decisions for a specific case."""
     url = f"{base_url}/cases/{case_id}/decisions"
-    response = requests.get(url, headers=headers)
+    response = requests.get(url, timeout=deadlines.request_timeout(), headers=headers)
     response.raise_for_status()
     
     return response.json().get("data", [])
@@ -343,7 +424,7 @@ def get_decision_individuals(base_url: str, headers: Dict[str, str], decision_id
     url = f"{base_url}/decisions/{decision_id}/individuals"
     
     try:
-        response = requests.get(url, headers=headers)
+        response = requests.get(url, timeout=deadlines.request_timeout(), headers=headers)
         response.raise_for_status()
         
         # Parse the JSON response
@@ -361,10 +442,92 @@ def get_decision_individuals(base_url: str, headers: Dict[str, str], decision_id
             return []
             
         return data
+    except (deadlines.DeadlineExceeded, requests.Timeout):
+        # Without the individuals the arbitrator's involvement is unknown; let the
+        # caller report the case as missing instead of treating it as unrelated
+        raise
     except Exception as e:
         print(f"Warning: Could not fetch individuals for decision {decision_id}: {e}", file=sys.stderr)
         return []
 
+def index_resources(document: Dict[str, Any], identity_map: IdentityMap) -> None:
+    """Merge the primary data and the included array of a JSON:API document into the identity map."""
+    data = document.get("data")
+    resources = data if isinstance(data, list) else [data] if data else []
+    resources = resources + document.get("included", [])
+    
+    for resource in resources:
+        if not isinstance(resource, dict) or not resource.get("type") or not resource.get("id"):
+            continue
+        key = (resource["type"], str(resource["id"]))
+        known = identity_map.get(key)
+        if known is None:
+            identity_map[key] = resource
+            continue
+        # The same resource may arrive with different sparse attributes or relationships
+        known.setdefault("attributes", {}).update(resource.get("attributes", {}))
+        known.setdefault("relationships", {}).update(resource.get("relationships", {}))
+
+def resolve_related(resource: Dict[str, Any], relationship: str, identity_map: IdentityMap) -> List[Dict[str, Any]]:
+    """Return the resources linked from a relationship, in linkage order, skipping any not in the identity map."""
+    linkage = resource.get("relationships", {}).get(relationship, {}).get("data") or []
+    if isinstance(linkage, dict):
+        linkage = [linkage]
+    
+    related = []
+    for ref in linkage:
+        known = identity_map.get((ref.get("type", relationship), str(ref.get("id"))))
+        if known is not None:
+            related.append(known)
+    return related
+
+def is_resolved(resource: Dict[str, Any], relationship: str, identity_map: IdentityMap) -> bool:
+    """Check whether a relationship's linkage is present and every linked resource is in the identity map."""
+    linkage = resource.get("relationships", {}).get(relationship, {}).get("data")
+    if linkage is None:
+        return False
+    if isinstance(linkage, dict):
+        linkage = [linkage]
+    return all((ref.get("type", relationship), str(ref.get("id"))) in identity_map for ref in linkage)
+
+def get_case_compound(base_url: str, headers: Dict[str, str], case_id: int, identity_map: IdentityMap) -> Dict[str, Any]:
+    """Get a case together with its parties, decisions and decision individuals in one request."""
+    cached = identity_map.get(("cases", str(case_id)))
+    if cached is not None and is_resolved(cached, "parties", identity_map) and is_resolved(cached, "decisions", identity_map):
+        return cached
+    
+    url = f"{base_url}/cases/{case_id}"
+    response = requests.get(url, timeout=deadlines.request_timeout(), headers=headers, params={"include": CASE_INCLUDES})
+    response.raise_for_status()
+    
+    document = response.json()
+    if not document.get("data"):
+        raise ValueError(f"Case with ID {case_id} not found")
+    index_resources(document, identity_map)
+    case = identity_map[("cases", str(case_id))]
+    
+    # Fall back to the sub-resource endpoints for anything the API did not include
+    if not is_resolved(case, "parties", identity_map):
+        parties = get_case_parties(base_url, headers, case_id)
+        index_resources({"data": parties}, identity_map)
+        case.setdefault("relationships", {})["parties"] = {"data": [{"type": p["type"], "id": p["id"]} for p in parties]}
+    if not is_resolved(case, "decisions", identity_map):
+        decisions = get_case_decisions(base_url, headers, case_id)
+        index_resources({"data": decisions}, identity_map)
+        case.setdefault("relationships", {})["decisions"] = {"data": [{"type": d["type"], "id": d["id"]} for d in decisions]}
+    
+    return case
+
+def get_decision_individuals_cached(base_url: str, headers: Dict[str, str], decision: Dict[str, Any], identity_map: IdentityMap) -> List[Dict[str, Any]]:
+    """Get a decision's individuals from the identity map, fetching them only if they were not included."""
+    if is_resolved(decision, "individuals", identity_map):
+        return resolve_related(decision, "individuals", identity_map)
+    
+    individuals = get_decision_individuals(base_url, headers, int(decision["id"]))
+    index_resources({"data": individuals}, identity_map)
+    decision.setdefault("relationships", {})["individuals"] = {"data": [{"type": i.get("type", "individuals"), "id": i.get("id")} for i in individuals if isinstance(i, dict)]}
+    return individuals
+
 def find_arbitrator(individuals: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
     """Find an arbitrator among individuals."""
     for individual in individuals:
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Bulk import of arbitrators from CSV, JSON lines or a plain list of names.
+
+Rows are streamed from the file and upserted into the Arbitrator table in batches,
+keyed on the arbitrator's name, so the table is never dropped and re-running an
+import only updates what changed.
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+import migrations
+from app import create_app, db, Arbitrator
+
+# Both dialects support INSERT ... ON CONFLICT DO UPDATE with the same API
+INSERTS = {'sqlite': sqlite_insert, 'postgresql': postgresql_insert}
+
+COLUMNS = ['name', 'specialization', 'experience_years', 'cases_handled']
+INTEGER_COLUMNS = {'experience_years', 'cases_handled'}
+
+
+def detect_format(path):
+    """Guess the input format from the file extension."""
+    if path.endswith('.csv'):
+        return 'csv'
+    if path.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    return 'txt'
+
+
+def iter_rows(path, fmt):
+    """
+    Yield arbitrator rows from a roster file one at a time.
+
+    Args:
+        path (str): File to read, or '-' for stdin
+        fmt (str): 'csv' (header row with column names), 'jsonl' (one object per line)
+                   or 'txt' (one name per line, like names.txt)
+
+    Yields:
+        dict: Row with every column in COLUMNS, None where the input had no value
+    """
+    handle = sys.stdin if path == '-' else open(path, newline='', encoding='utf-8')
+    try:
+        if fmt == 'csv':
+            records = csv.DictReader(handle)
+        elif fmt == 'jsonl':
+            records = (json.loads(line) for line in handle if line.strip())
+        else:
+            records = ({'name': line} for line in handle)
+
+        for record in records:
+            row = normalize_row(record)
+            if row is not None:
+                yield row
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def normalize_row(record):
+    """Clean one input record, returning None for rows without a name."""
+    name = (record.get('name') or '').strip()
+    if not name:
+        return None
+
+    row = {'name': name}
+    for column in COLUMNS[1:]:
+        value = record.get(column)
+        if isinstance(value, str):
+            value = value.strip() or None
+        if value is not None and column in INTEGER_COLUMNS:
+            value = int(value)
+        row[column] = value
+    return row
+
+
+def upsert_statement(dialect='sqlite'):
+    """INSERT ... ON CONFLICT(name) DO UPDATE that keeps existing values for missing fields."""
+    table = Arbitrator.__table__
+    stmt = INSERTS[dialect](table)
+    return stmt.on_conflict_do_update(
+        index_elements=['name'],
+        set_={
+            column: func.coalesce(stmt.excluded[column], table.c[column])
+            for column in COLUMNS[1:]
+        },
+    )
+
+
+def upsert_arbitrators(rows, batch_size=5000):
+    """
+    Upsert rows into the Arbitrator table in batches, committing after each batch.
+
+    Must be called inside an app context.
+
+    Args:
+        rows (iterable): Rows as produced by iter_rows
+        batch_size (int): Rows per INSERT statement and transaction
+
+    Returns:
+        int: Number of rows processed
+    """
+    migrations.upgrade(db.engine)
+
+    stmt = upsert_statement(db.engine.dialect.name)
+    total = 0
+    batch = {}
+    for row in rows:
+        # Later rows for the same name win, as they would across batches
+        batch[row['name']] = row
+        if len(batch) >= batch_size:
+            db.session.execute(stmt, list(batch.values()))
+            db.session.commit()
+            total += len(batch)
+            batch = {}
+
+    if batch:
+        db.session.execute(stmt, list(batch.values()))
+        db.session.commit()
+        total += len(batch)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import arbitrators into the database")
+    parser.add_argument("path", help="Roster file (.csv, .jsonl or one name per line), or - for stdin")
+    parser.add_argument("--format", choices=["csv", "jsonl", "txt"], help="Input format (default: from the file extension)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per batch (default: 5000)")
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(args.path)
+    app = create_app()
+    start = time.perf_counter()
+    with app.app_context():
+        total = upsert_arbitrators(iter_rows(args.path, fmt), batch_size=args.batch_size)
+    elapsed = time.perf_counter() - start
+    print(f"Imported {total} arbitrators in {elapsed:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Concurrent-user load test of the web API against a fake JusMundi server.
+
+Starts fake_jusmundi with the requested upstream latency, seeds a throwaway
+database with a roster, serves the real Flask app (in process, or under gunicorn
+with the production settings) and lets N simulated analysts use it: each opens
+the roster, then screens a few arbitrators, with exponential think times in
+between. Reports per endpoint the throughput, p50/p95/p99 latency, error and
+queued rates, and how saturated the server's request slots were.
+
+    python loadtest.py --analysts 20 --duration 60 --latency-ms 300
+    python loadtest.py --serve gunicorn --workers 4 --threads 8 --output gthread.json --compare baseline.json
+
+Results are saved as JSON with the full configuration, so runs before and after a
+serving-model change can be compared with --compare.
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import requests
+
+from fake_jusmundi import FakeJusMundi
+
+RESULTS_VERSION = 1
+
+# Metrics shown by --compare, with whether lower is better
+COMPARED_METRICS = [
+    ("throughput_rps", False),
+    ("p50_ms", True),
+    ("p95_ms", True),
+    ("p99_ms", True),
+    ("error_rate", True),
+    ("queued_rate", True),
+]
+
+
+def percentile(sorted_values, q):
+    """Nearest-rank percentile of an ascending list, None when it is empty."""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class Recorder:
+    def __init__(self):
+        """Collect request samples and the number of requests in flight."""
+        self.samples = []
+        self.in_flight = 0
+        self.in_flight_samples = []
+        self._lock = threading.Lock()
+
+    def call(self, session, endpoint, url, headers, timeout):
+        """Issue one GET and record (endpoint, start, latency seconds, status or None)."""
+        with self._lock:
+            self.in_flight += 1
+        start = time.monotonic()
+        status = None
+        try:
+            response = session.get(url, headers=headers, timeout=timeout)
+            status = response.status_code
+        except requests.RequestException:
+            pass
+        finally:
+            latency = time.monotonic() - start
+            with self._lock:
+                self.in_flight -= 1
+                self.samples.append((endpoint, start, latency, status))
+        return status
+
+    def sample_in_flight(self, stop, interval=0.1):
+        """Record the in-flight count every interval until stop is set."""
+        while not stop.wait(interval):
+            with self._lock:
+                self.in_flight_samples.append((time.monotonic(), self.in_flight))
+
+
+def summarize(samples, duration):
+    """Throughput, latency percentiles and error/queued rates of one set of samples."""
+    latencies = sorted(latency * 1000 for _, _, latency, _ in samples)
+    errors = sum(1 for *_, status in samples if status is None or status >= 400)
+    queued = sum(1 for *_, status in samples if status == 202)
+    count = len(samples)
+    return {
+        "requests": count,
+        "throughput_rps": round(count / duration, 3),
+        "p50_ms": round(percentile(latencies, 50), 1) if count else None,
+        "p95_ms": round(percentile(latencies, 95), 1) if count else None,
+        "p99_ms": round(percentile(latencies, 99), 1) if count else None,
+        "error_rate": round(errors / count, 4) if count else 0.0,
+        "queued_rate": round(queued / count, 4) if count else 0.0,
+        # Little's law: average number of these requests being served at once
+        "mean_in_flight": round(sum(latencies) / 1000 / duration, 2),
+    }
+
+
+def prepare_database(url, size):
+    """Create the schema and a roster of size arbitrators; returns their ids."""
+    # The app is only imported here so --target runs need nothing but requests
+    import migrations
+    from app import Arbitrator, create_app, db
+    from import_arbitrators import upsert_arbitrators
+
+    app = create_app({"SQLALCHEMY_DATABASE_URI": url, "OUTBOUND_RATE": 0})
+    with app.app_context():
+        migrations.upgrade(db.engine)
+        upsert_arbitrators({"name": f"Load Test Arbitrator {n:04d}", "specialization": "Investment Arbitration",
+                            "experience_years": 10 + n % 30, "cases_handled": n % 80} for n in range(size))
+        ids = [arbitrator_id for (arbitrator_id,) in db.session.query(Arbitrator.id).order_by(Arbitrator.id)]
+        db.engine.dispose()
+    return ids
+
+
+def serve_in_process():
+    """Serve the app with the threaded development server; returns (base URL, stop, capacity)."""
+    from werkzeug.serving import make_server
+    from app import create_app
+
+    # One access log line per request would drown the report
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, create_app(), threaded=True)
+    threading.Thread(target=server.serve_forever, name="app-server", daemon=True).start()
+    # A thread per connection, so there is no fixed number of request slots
+    return f"http://127.0.0.1:{server.server_port}", server.shutdown, None
+
+
+def serve_gunicorn(env, workers, threads, startup_timeout=60):
+    """Serve wsgi:app under gunicorn with gunicorn.conf.py; returns (base URL, stop, capacity)."""
+    port = free_port()
+    env = dict(env, BIND=f"127.0.0.1:{port}", WEB_CONCURRENCY=str(workers), WEB_THREADS=str(threads))
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "wsgi:app"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    base = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + startup_timeout
+    while True:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with status {process.returncode}")
+        try:
+            if requests.get(f"{base}/readyz", timeout=1).status_code == 200:
+                break
+        except requests.RequestException:
+            pass
+        if time.monotonic() > deadline:
+            process.terminate()
+            raise RuntimeError("gunicorn did not become ready in time")
+        time.sleep(0.2)
+
+    def stop():
+        process.terminate()
+        process.wait(30)
+    return base, stop, workers * threads
+
+
+def analyst(number, base, ids, args, recorder, stop):
+    """One analyst: open the roster, screen one to max-opens arbitrators, think, repeat."""
+    rng = random.Random(args.seed * 1000 + number if args.seed is not None else None)
+    session = requests.Session()
+    headers = {"X-User": f"analyst-{number}"}
+
+    def think():
+        # Exponential think time, capped so one analyst cannot idle through the run
+        return stop.wait(min(rng.expovariate(1 / args.think_time), 4 * args.think_time)) if args.think_time > 0 else stop.is_set()
+
+    # Analysts arrive spread over the warm-up
+    if stop.wait(rng.uniform(0, args.warmup)):
+        return
+    while not stop.is_set():
+        recorder.call(session, "/api/arbitrators", f"{base}/api/arbitrators", headers, args.timeout)
+        if think():
+            return
+        for _ in range(rng.randint(1, args.max_opens)):
+            arbitrator_id = rng.choice(ids)
+            recorder.call(session, "/api/conflicts/<id>", f"{base}/api/conflicts/{arbitrator_id}", headers, args.timeout)
+            if think():
+                return
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run(args):
+    """Run one load test; returns the results document."""
+    for assignment in args.env:
+        key, _, value = assignment.partition("=")
+        os.environ[key] = value
+
+    upstream = FakeJusMundi(args.latency_ms, args.jitter_ms, args.error_rate, args.cases, seed=args.seed)
+    capacity = args.capacity
+    stop_server = None
+    with tempfile.TemporaryDirectory() as workdir:
+        try:
+            if args.target:
+                base = args.target.rstrip("/")
+                ids = [a["id"] for a in requests.get(f"{base}/api/arbitrators", timeout=args.timeout).json()]
+            else:
+                os.environ.update(
+                    DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'loadtest.db')}",
+                    JUSMUNDI_BASE_URL=upstream.start(),
+                    JUSMUNDI_API_KEY="load-test",
+                    REPORT_DIR=os.path.join(workdir, "reports"),
+                )
+                ids = prepare_database(os.environ["DATABASE_URL"], args.arbitrators)
+                if args.serve == "gunicorn":
+                    base, stop_server, capacity = serve_gunicorn(os.environ, args.workers, args.threads)
+                else:
+                    base, stop_server, capacity = serve_in_process()
+            if not ids:
+                raise RuntimeError("The roster is empty; nothing to screen")
+
+            recorder = Recorder()
+            stop = threading.Event()
+            threads = [threading.Thread(target=analyst, args=(n, base, ids, args, recorder, stop), daemon=True)
+                       for n in range(args.analysts)]
+            sampler = threading.Thread(target=recorder.sample_in_flight, args=(stop,), daemon=True)
+            started = time.monotonic()
+            window_start = started + args.warmup
+            sampler.start()
+            for thread in threads:
+                thread.start()
+            print(f"{args.analysts} analysts against {base} for {args.warmup + args.duration:.0f} s "
+                  f"({args.warmup:.0f} s warm-up)...", file=sys.stderr)
+            time.sleep(args.warmup + args.duration)
+            stop.set()
+            for thread in threads:
+                thread.join(args.timeout)
+            window_end = time.monotonic()
+        finally:
+            if stop_server is not None:
+                stop_server()
+            upstream.stop()
+
+    # Requests started during the warm-up are left out; those still running at the
+    # end are counted, so the window closes when the last one returns
+    duration = window_end - window_start
+    samples = [s for s in recorder.samples if s[1] >= window_start]
+    endpoints = {}
+    for endpoint in sorted({s[0] for s in samples}):
+        endpoints[endpoint] = summarize([s for s in samples if s[0] == endpoint], duration)
+
+    in_flight = [count for at, count in recorder.in_flight_samples if window_start <= at <= started + args.warmup + args.duration]
+    mean_in_flight = sum(in_flight) / len(in_flight) if in_flight else 0.0
+    saturation = {
+        "capacity": capacity,
+        "mean_in_flight": round(mean_in_flight, 2),
+        "max_in_flight": max(in_flight, default=0),
+        # Client-side in-flight requests per server slot; above 1 requests queue in the server
+        "utilisation": round(mean_in_flight / capacity, 3) if capacity else None,
+        # Share of the run with every request slot busy (requests queueing in the server)
+        "saturated_share": round(sum(1 for c in in_flight if c >= capacity) / len(in_flight), 3) if capacity and in_flight else None,
+    }
+
+    return {
+        "version": RESULTS_VERSION,
+        "label": args.label,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "config": {
+            "serve": "target" if args.target else args.serve,
+            "workers": args.workers if args.serve == "gunicorn" else None,
+            "threads": args.threads if args.serve == "gunicorn" else None,
+            "analysts": args.analysts,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "think_time_s": args.think_time,
+            "max_opens": args.max_opens,
+            "arbitrators": args.arbitrators,
+            "upstream_latency_ms": args.latency_ms,
+            "upstream_jitter_ms": args.jitter_ms,
+            "upstream_error_rate": args.error_rate,
+            "cases_per_arbitrator": args.cases,
+            "env": args.env,
+            "seed": args.seed,
+        },
+        "window_s": round(duration, 2),
+        "overall": summarize(samples, duration),
+        "endpoints": endpoints,
+        "saturation": saturation,
+        "upstream": None if args.target else upstream.stats(),
+    }
+
+
+def format_value(value):
+    if value is None:
+        return "-"
+    return f"{value:,.2f}" if isinstance(value, float) else str(value)
+
+
+def print_results(results):
+    print(f"\n{results['label'] or 'run'} ({results['config']['serve']}, {results['config']['analysts']} analysts, "
+          f"upstream {results['config']['upstream_latency_ms']:.0f} ms, {results['window_s']:.0f} s measured)")
+    print(f"  {'endpoint':<22}{'requests':>9}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}{'queued':>8}")
+    for endpoint, m in list(results["endpoints"].items()) + [("overall", results["overall"])]:
+        print(f"  {endpoint:<22}{m['requests']:>9}{m['throughput_rps']:>9.2f}{format_value(m['p50_ms']):>10}"
+              f"{format_value(m['p95_ms']):>10}{format_value(m['p99_ms']):>10}{m['error_rate']:>8.1%}{m['queued_rate']:>8.1%}")
+    s = results["saturation"]
+    capacity = f"{s['utilisation']:.0%} of {s['capacity']} request slots, saturated {s['saturated_share']:.0%} of the time" \
+        if s["capacity"] else "no fixed request slots"
+    print(f"  in flight: mean {s['mean_in_flight']}, max {s['max_in_flight']} ({capacity})")
+    u = results["upstream"]
+    if u:
+        print(f"  upstream: {u['requests']} calls, {u['errors']} failed, max {u['max_in_flight']} concurrent")
+
+
+def print_comparison(baseline, results):
+    """Print the change of every compared metric from baseline to results."""
+    print(f"\nChange from {baseline.get('label') or baseline.get('timestamp')} ({baseline.get('git_commit') or 'unknown commit'}):")
+    for endpoint in sorted(set(baseline["endpoints"]) | set(results["endpoints"])) + ["overall"]:
+        old = baseline["overall"] if endpoint == "overall" else baseline["endpoints"].get(endpoint)
+        new = results["overall"] if endpoint == "overall" else results["endpoints"].get(endpoint)
+        if not old or not new:
+            print(f"  {endpoint}: only in {'baseline' if old else 'this run'}")
+            continue
+        changes = []
+        for metric, lower_is_better in COMPARED_METRICS:
+            before, after = old.get(metric), new.get(metric)
+            if before is None or after is None:
+                continue
+            delta = f"{(after - before) / before:+.0%}" if before else f"{after - before:+g}"
+            better = after < before if lower_is_better else after > before
+            changes.append(f"{metric} {format_value(before)} -> {format_value(after)} ({delta}{'' if after == before else ', better' if better else ', worse'})")
+        print(f"  {endpoint}:\n    " + "\n    ".join(changes))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the web API with concurrent simulated analysts")
+    parser.add_argument("--analysts", type=int, default=10, help="Concurrent simulated analysts (default: 10)")
+    parser.add_argument("--duration", type=float, default=60, help="Measured seconds after the warm-up (default: 60)")
+    parser.add_argument("--warmup", type=float, default=10, help="Seconds over which analysts arrive, not measured (default: 10)")
+    parser.add_argument("--think-time", type=float, default=3.0, help="Mean seconds between an analyst's requests (default: 3)")
+    parser.add_argument("--max-opens", type=int, default=3, help="Most arbitrators screened per roster visit (default: 3)")
+    parser.add_argument("--timeout", type=float, default=120, help="Client timeout per request in seconds (default: 120)")
+    parser.add_argument("--arbitrators", type=int, default=50, help="Roster size seeded into the test database (default: 50)")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Mean fake JusMundi latency per call (default: 200)")
+    parser.add_argument("--jitter-ms", type=float, default=100.0, help="Uniform spread of the upstream latency (default: 100)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of upstream calls failing with 503 (default: 0)")
+    parser.add_argument("--cases", type=int, default=12, help="Cases per arbitrator in the fake API (default: 12)")
+    parser.add_argument("--serve", choices=["inprocess", "gunicorn"], default="inprocess",
+                        help="Serve the app with the threaded dev server or gunicorn.conf.py (default: inprocess)")
+    parser.add_argument("--workers", type=int, default=2, help="gunicorn workers (default: 2)")
+    parser.add_argument("--threads", type=int, default=8, help="Threads per gunicorn worker (default: 8)")
+    parser.add_argument("--target", help="Load an already running app at this URL instead (its own JusMundi backend is used)")
+    parser.add_argument("--capacity", type=int, help="Request slots of the --target server, for the saturation figures")
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE", help="App setting for this run, e.g. OUTBOUND_RATE=0 (repeatable)")
+    parser.add_argument("--seed", type=int, help="Seed for reproducible think times, choices and upstream latencies")
+    parser.add_argument("--label", help="Name of this run in the results")
+    parser.add_argument("--output", help="Save the results as JSON to this file")
+    parser.add_argument("--compare", help="Results JSON of an earlier run to compare against")
+    args = parser.parse_args()
+
+    results = run(args)
+    print_results(results)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("version") != RESULTS_VERSION:
+            print(f"Warning: {args.compare} has results format {baseline.get('version')}, expected {RESULTS_VERSION}", file=sys.stderr)
+        print_comparison(baseline, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Versioned schema migrations for the app database (SQLite or PostgreSQL).
+
+Each migration is a numbered step applied once, in order, and recorded in the
+schema_version table. Steps define the tables they touch themselves rather than
+using the models in app.py, so replaying them on a fresh database always builds
+the schema as it was at that version. The first step adopts databases created
+with db.create_all() by only creating what is missing.
+
+    python migrations.py upgrade      # apply pending migrations
+    python migrations.py current      # show the applied and latest versions
+
+Run the upgrade once per deployment, before starting new web nodes; /readyz
+reports a node as unavailable while the database is behind.
+"""
+
+import argparse
+from datetime import datetime
+
+import sqlalchemy as sa
+
+# Any constant works; it only has to be the same for every node
+PG_LOCK_ID = 0x6D756E6469
+
+version_table = sa.Table(
+    "schema_version",
+    sa.MetaData(),
+    sa.Column("version", sa.Integer, primary_key=True),
+    sa.Column("description", sa.String(200), nullable=False),
+    sa.Column("applied_at", sa.DateTime, nullable=False),
+)
+
+
+def _initial_schema(connection):
+    """Arbitrators, stored cases and screening locks."""
+    metadata = sa.MetaData()
+    sa.Table(
+        "arbitrator",
+        metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("specialization", sa.String(200)),
+        sa.Column("experience_years", sa.Integer),
+        sa.Column("cases_handled", sa.Integer),
+        sa.Index("ix_arbitrator_name", "name", unique=True),
+    )
+    sa.Table(
+        "case_record",
+        metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("arbitrator_id", sa.Integer, sa.ForeignKey("arbitrator.id"), nullable=False),
+        sa.Column("individual", sa.String(200), nullable=False),
+        sa.Column("case_id", sa.String(64), nullable=False),
+        sa.Column("title", sa.String(500)),
+        sa.Column("reference", sa.String(200)),
+        sa.Column("organization", sa.String(100)),
+        sa.Column("status", sa.String(100)),
+        sa.Column("start_date", sa.String(32), nullable=False),
+        sa.Column("end_date", sa.String(32), nullable=False),
+        sa.Column("parties", sa.Text, nullable=False),
+        sa.Column("fetched_at", sa.DateTime, nullable=False),
+        sa.UniqueConstraint("arbitrator_id", "case_id"),
+        sa.Index("ix_case_record_listing", "arbitrator_id", "start_date", "id"),
+    )
+    sa.Table(
+        "screening_lock",
+        metadata,
+        sa.Column("key", sa.String(255), primary_key=True),
+        sa.Column("owner", sa.String(100), nullable=False),
+        sa.Column("acquired_at", sa.DateTime, nullable=False),
+        sa.Column("finished_at", sa.DateTime),
+        sa.Column("result", sa.Text),
+    )
+    metadata.create_all(connection, checkfirst=True)
+    # create_all skips the indexes of tables that already exist
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+def _case_record_fetched_index(connection):
+    """Index case_record.fetched_at, read by the party and interval index version checks."""
+    table = sa.Table("case_record", sa.MetaData(), sa.Column("fetched_at", sa.DateTime))
+    sa.Index("ix_case_record_fetched_at", table.c.fetched_at).create(connection, checkfirst=True)
+
+
+# (version, description, step); append new steps, never edit applied ones
+MIGRATIONS = [
+    (1, "Initial schema", _initial_schema),
+    (2, "Index case_record by fetch time", _case_record_fetched_index),
+]
+
+HEAD = MIGRATIONS[-1][0]
+
+
+def current_version(connection):
+    """Latest applied migration, 0 for a database without any."""
+    if not sa.inspect(connection).has_table(version_table.name):
+        return 0
+    return connection.execute(sa.select(sa.func.max(version_table.c.version))).scalar() or 0
+
+
+def upgrade(engine, target=HEAD, log=None):
+    """
+    Apply the pending migrations up to target.
+
+    All steps run in one transaction, so a failed step leaves the database at its
+    previous version. On PostgreSQL an advisory lock makes nodes starting at the
+    same time apply each step only once.
+
+    Args:
+        engine (Engine): Database to migrate
+        target (int, optional): Version to stop at (default: the latest)
+        log (callable, optional): Called with a message for every applied step
+
+    Returns:
+        list: Versions applied
+    """
+    applied = []
+    with engine.begin() as connection:
+        if connection.dialect.name == "postgresql":
+            connection.execute(sa.text("SELECT pg_advisory_xact_lock(:id)"), {"id": PG_LOCK_ID})
+        version_table.create(connection, checkfirst=True)
+        version = current_version(connection)
+        for number, description, step in MIGRATIONS:
+            if number <= version or number > target:
+                continue
+            step(connection)
+            connection.execute(version_table.insert().values(
+                version=number, description=description, applied_at=datetime.utcnow(),
+            ))
+            applied.append(number)
+            if log:
+                log(f"Applied migration {number}: {description}")
+    return applied
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply or inspect database schema migrations")
+    parser.add_argument("command", choices=["upgrade", "current"])
+    parser.add_argument("--database-url",
+                        help="Database to migrate (default: the app's, i.e. $DATABASE_URL or instance/arbitrators.db)")
+    parser.add_argument("--target", type=int, default=HEAD, help=f"Version to upgrade to (default: {HEAD})")
+    args = parser.parse_args(argv)
+
+    # Resolve the database exactly as the app does, so a relative SQLite path lands
+    # in its instance folder; imported here to keep this module usable on its own
+    from app import create_app, database_url, db
+    app = create_app({"SQLALCHEMY_DATABASE_URI": database_url(args.database_url)} if args.database_url else None)
+
+    with app.app_context():
+        engine = db.engine
+        print(f"Database {engine.url.render_as_string(hide_password=True)}")
+        if args.command == "current":
+            with engine.connect() as connection:
+                print(f"Schema version {current_version(connection)} (latest {HEAD})")
+            return
+
+        applied = upgrade(engine, target=args.target, log=print)
+        if not applied:
+            print("Schema is up to date")
+
+
+if __name__ == "__main__":
+    main()
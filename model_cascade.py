@@ -0,0 +1,323 @@
+"""
+Tiered model cascade for LLM conflict classification.
+
+The cheapest tier of the policy (see model_cascade.json) classifies the encoded case
+data first, answering in a fixed JSON schema that includes its confidence. The next
+tier is only asked when the answer is below the confidence threshold, is in one of
+the classifications that always get a second look (RED/YELLOW by default), or could
+not be parsed. The answer of the last tier asked is the result. Every call records
+its latency, token usage and cost, per call in the result and in running per-tier
+totals for this process.
+"""
+
+import json
+import os
+import threading
+import time
+
+from conflict_rules import SEVERITY
+from tracing import span
+
+DEFAULT_POLICY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "model_cascade.json")
+
+SYSTEM_PROMPT = (
+    "Using the international standard for arbitration conflicts of interest (IBA Guidelines) "
+    "with the Kingdom of Norway, determine whether the arbitrator has any conflict of interest "
+    "in the cases below. Classify the overall result as RED, YELLOW or GREEN (GREEN when there "
+    "is no conflict), list each conflict found with the ids of the cases it rests on, and give "
+    "your confidence in the overall classification from 0 to 1. Be concise."
+)
+
+RESULT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "classification": {"type": "string", "enum": list(SEVERITY)},
+        "confidence": {"type": "number"},
+        "findings": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "classification": {"type": "string", "enum": list(SEVERITY)},
+                    "description": {"type": "string"},
+                    "case_ids": {"type": "array", "items": {"type": "string"}},
+                },
+                "required": ["classification", "description", "case_ids"],
+                "additionalProperties": False,
+            },
+        },
+        "rationale": {"type": "string"},
+    },
+    "required": ["classification", "confidence", "findings", "rationale"],
+    "additionalProperties": False,
+}
+
+_totals = {}
+_totals_lock = threading.Lock()
+
+
+def load_policy(path=DEFAULT_POLICY_PATH):
+    """
+    Load and validate a cascade policy.
+
+    Returns:
+        dict: 'tiers' (cheapest first), 'escalate_below_confidence' and
+              'escalate_classifications'
+    """
+    with open(path, encoding="utf-8") as f:
+        policy = json.load(f)
+
+    if not policy.get("tiers"):
+        raise ValueError("A cascade policy needs at least one tier")
+    for tier in policy["tiers"]:
+        if not tier.get("name") or not tier.get("model"):
+            raise ValueError(f"Tier {tier!r} must have a name and a model")
+    for classification in policy.setdefault("escalate_classifications", []):
+        if classification not in SEVERITY:
+            raise ValueError(f"Invalid escalation classification {classification!r}")
+    policy.setdefault("escalate_below_confidence", 0.0)
+    return policy
+
+
+def tier_cost(tier, prompt_tokens, completion_tokens):
+    """Cost in USD of one call at the tier's per-million-token prices."""
+    return (prompt_tokens * tier.get("input_usd_per_mtok", 0)
+            + completion_tokens * tier.get("output_usd_per_mtok", 0)) / 1_000_000
+
+
+def escalation_reason(result, policy):
+    """Why a tier's answer needs the next tier, or None when it can stand."""
+    if result is None:
+        return "no valid answer"
+    if result["classification"] in policy["escalate_classifications"]:
+        return f"{result['classification']} result"
+    if result["confidence"] < policy["escalate_below_confidence"]:
+        return f"confidence {result['confidence']:.2f}"
+    return None
+
+
+def parse_result(content):
+    """Validate a tier's JSON answer, returning None when it does not fit the schema."""
+    try:
+        result = json.loads(content or "")
+    except ValueError:
+        return None
+    if not isinstance(result, dict) or result.get("classification") not in SEVERITY:
+        return None
+    try:
+        result["confidence"] = min(max(float(result.get("confidence")), 0.0), 1.0)
+    except (TypeError, ValueError):
+        return None
+    result.setdefault("findings", [])
+    result.setdefault("rationale", "")
+    return result
+
+
+def record(call):
+    """Add one call to the running per-tier totals."""
+    with _totals_lock:
+        totals = _totals.setdefault(call["tier"], {
+            "model": call["model"], "calls": 0, "failures": 0, "escalations": 0,
+            "latency_ms": 0.0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0,
+        })
+        totals["calls"] += 1
+        totals["failures"] += call["error"] is not None
+        totals["escalations"] += call["escalated"]
+        totals["latency_ms"] += call["latency_ms"]
+        totals["prompt_tokens"] += call["prompt_tokens"]
+        totals["completion_tokens"] += call["completion_tokens"]
+        totals["cost_usd"] += call["cost_usd"]
+
+
+def stats():
+    """Running per-tier totals of this process, with mean latency per call."""
+    with _totals_lock:
+        snapshot = {name: dict(totals) for name, totals in _totals.items()}
+    for totals in snapshot.values():
+        totals["mean_latency_ms"] = round(totals["latency_ms"] / totals["calls"], 1)
+        totals["cost_usd"] = round(totals["cost_usd"], 6)
+    return snapshot
+
+
+def _new_call(tier):
+    return {"tier": tier["name"], "model": tier["model"], "latency_ms": 0.0, "prompt_tokens": 0,
+            "completion_tokens": 0, "cost_usd": 0.0, "error": None, "escalated": False}
+
+
+def _request(tier, text, instructions):
+    """Arguments of the chat completion asking tier for a structured classification."""
+    return dict(
+        model=tier["model"],
+        messages=[
+            {"role": "system", "content": instructions},
+            {"role": "user", "content": text},
+        ],
+        temperature=0,
+        max_tokens=tier.get("max_tokens", 1000),
+        response_format={
+            "type": "json_schema",
+            "json_schema": {"name": "conflict_classification", "strict": True, "schema": RESULT_SCHEMA},
+        },
+    )
+
+
+def _finish(call, tier, started, content, refusal=None):
+    """Parse a tier's answer and complete its call record."""
+    result = parse_result(content)
+    if result is None and call["error"] is None:
+        call["error"] = refusal or "Answer did not match the schema"
+    call["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    call["cost_usd"] = tier_cost(tier, call["prompt_tokens"], call["completion_tokens"])
+    return result, call
+
+
+def ask_tier(client, tier, text, instructions=SYSTEM_PROMPT):
+    """
+    Ask one tier for a structured classification.
+
+    Returns:
+        tuple: (result or None, call record with latency, tokens, cost and any error)
+    """
+    call = _new_call(tier)
+    content = refusal = None
+    started = time.perf_counter()
+    try:
+        with span(f"llm_{tier['name']}"):
+            response = client.chat.completions.create(**_request(tier, text, instructions))
+        if response.usage is not None:
+            call["prompt_tokens"] = response.usage.prompt_tokens
+            call["completion_tokens"] = response.usage.completion_tokens
+        message = response.choices[0].message
+        content, refusal = message.content, getattr(message, "refusal", None)
+    except Exception as e:
+        call["error"] = str(e)
+    return _finish(call, tier, started, content, refusal)
+
+
+def stream_tier(client, tier, text, instructions=SYSTEM_PROMPT):
+    """
+    Ask one tier like ask_tier, yielding the answer text as it is generated.
+
+    Yields:
+        str: Pieces of the JSON answer in order
+
+    Returns:
+        tuple: (result or None, call record), as the generator's return value
+    """
+    call = _new_call(tier)
+    pieces = []
+    refusal = None
+    started = time.perf_counter()
+    try:
+        with span(f"llm_{tier['name']}"):
+            stream = client.chat.completions.create(
+                **_request(tier, text, instructions), stream=True, stream_options={"include_usage": True},
+            )
+            for chunk in stream:
+                if getattr(chunk, "usage", None) is not None:
+                    call["prompt_tokens"] = chunk.usage.prompt_tokens
+                    call["completion_tokens"] = chunk.usage.completion_tokens
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta
+                refusal = getattr(delta, "refusal", None) or refusal
+                if delta.content:
+                    pieces.append(delta.content)
+                    yield delta.content
+    except Exception as e:
+        call["error"] = str(e)
+    return _finish(call, tier, started, "".join(pieces), refusal)
+
+
+def iter_cascade(text, api_key="", policy=None, client=None, instructions=SYSTEM_PROMPT, stream=False):
+    """
+    Ask the policy's tiers in turn, reporting each one as it finishes.
+
+    Args:
+        text (str): Case information, e.g. from prompt_encoder.encode_prompt
+        api_key (str, optional): OpenAI API key, used when no client is given
+        policy (dict, optional): Policy as returned by load_policy (default: model_cascade.json)
+        client (OpenAI, optional): Client to reuse
+        instructions (str, optional): System prompt
+        stream (bool, optional): Also report the answer text of each tier as it is generated
+
+    Yields:
+        tuple: (kind, data, answer) where kind is 'token' (data is {'tier', 'delta'},
+               only when streaming) or 'tier' (data is the call record of the tier
+               just asked), and answer is the best answer so far or None
+    """
+    policy = load_policy() if policy is None else policy
+    if client is None:
+        # Imported here so the web app starts without the OpenAI SDK
+        from openai import OpenAI
+        client = OpenAI(api_key=api_key)
+
+    answer = None
+    tiers = policy["tiers"]
+    for position, tier in enumerate(tiers):
+        if stream:
+            pieces = stream_tier(client, tier, text, instructions)
+            while True:
+                try:
+                    piece = next(pieces)
+                except StopIteration as done:
+                    result, call = done.value
+                    break
+                yield "token", {"tier": tier["name"], "delta": piece}, answer
+        else:
+            result, call = ask_tier(client, tier, text, instructions)
+        if result is not None:
+            answer = dict(result, tier=tier["name"], model=tier["model"])
+        reason = escalation_reason(result, policy)
+        escalate = reason is not None and position < len(tiers) - 1
+        if escalate:
+            call["escalated"] = True
+            call["escalation_reason"] = reason
+        record(call)
+        yield "tier", call, answer
+        if not escalate:
+            return
+
+
+def classify_conflicts(text, api_key="", policy=None, client=None, instructions=SYSTEM_PROMPT):
+    """
+    Classify conflicts in encoded case data, escalating through the policy's tiers.
+
+    Args:
+        text (str): Case information, e.g. from prompt_encoder.encode_prompt
+        api_key (str, optional): OpenAI API key, used when no client is given
+        policy (dict, optional): Policy as returned by load_policy (default: model_cascade.json)
+        client (OpenAI, optional): Client to reuse
+        instructions (str, optional): System prompt
+
+    Returns:
+        dict: The answer ('classification', 'confidence', 'findings', 'rationale') of
+              the last tier that gave a valid one, the 'tier' and 'model' it came
+              from, 'calls' with one record per tier asked, and their total
+              'cost_usd' and 'latency_ms'
+
+    Raises:
+        RuntimeError: If no tier gave a valid answer
+    """
+    calls = []
+    answer = None
+    for _, call, answer in iter_cascade(text, api_key, policy, client, instructions):
+        calls.append(call)
+    return finish_cascade(answer, calls)
+
+
+def finish_cascade(answer, calls):
+    """
+    Combine the final answer of a cascade with its call records and totals.
+
+    Raises:
+        RuntimeError: If no tier gave a valid answer
+    """
+    if answer is None:
+        raise RuntimeError(f"No model tier gave a valid classification: {calls[-1]['error']}")
+    return dict(
+        answer,
+        calls=calls,
+        cost_usd=round(sum(call["cost_usd"] for call in calls), 6),
+        latency_ms=round(sum(call["latency_ms"] for call in calls), 1),
+    )
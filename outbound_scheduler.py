@@ -0,0 +1,227 @@
+"""
+Fair scheduling of outbound JusMundi calls shared by every user of the app.
+
+All screenings go out under one API key, so each worker process holds a single
+token bucket sized to its equal share of that key's quota (app.init_worker does
+the split). Calls that find the bucket empty wait in a
+weighted fair queue: each (user, job class) pair is its own flow, and a flow's
+calls are tagged with virtual finish times scaled by the job class weight. The
+call with the smallest tag goes next, so one user's batch run cannot starve
+another user's interactive screening, and interactive work overtakes batch work.
+
+Callers bind their identity for the duration of a request with `with client(...)`;
+code below it calls wait_turn() before each outbound request. Outside a client
+binding, or when no scheduler is installed, wait_turn() returns immediately.
+"""
+
+import contextvars
+import heapq
+import itertools
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+import deadlines
+from tracing import span
+
+DEFAULT_WEIGHTS = {"interactive": 8, "batch": 1}
+
+_current = contextvars.ContextVar("outbound_client", default=None)
+_scheduler = None
+
+
+class Queued(Exception):
+    """The quota is oversubscribed; the call was not (or is no longer) waiting."""
+
+    def __init__(self, position, retry_after):
+        super().__init__(f"Outbound API quota is busy; {position} call(s) ahead, retry in {retry_after}s")
+        self.position = position
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        """
+        Create a full bucket.
+
+        Args:
+            rate (float): Tokens added per second
+            burst (int): Bucket capacity
+        """
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def take(self):
+        """Take one token if available. Not thread-safe; the scheduler holds its lock."""
+        self.refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def seconds_until(self, tokens=1):
+        """Seconds until the bucket holds the given number of tokens."""
+        self.refill()
+        return max(0.0, (tokens - self.tokens) / self.rate)
+
+
+class FairScheduler:
+    def __init__(self, rate, burst, weights=None, max_wait=30.0):
+        """
+        Create a scheduler for one outbound quota.
+
+        Args:
+            rate (float): Sustained outbound calls per second
+            burst (int): Calls allowed back to back after an idle period
+            weights (dict, optional): Job class -> share of the quota (default: DEFAULT_WEIGHTS)
+            max_wait (float): Longest a caller is admitted to wait, in seconds
+        """
+        self.bucket = TokenBucket(rate, burst)
+        self.weights = dict(weights or DEFAULT_WEIGHTS)
+        self.max_wait = max_wait
+        self._cond = threading.Condition()
+        self._heap = []  # (finish tag, sequence, flow)
+        self._finish = {}  # flow -> finish tag of its last queued call
+        self._vtime = 0.0
+        self._sequence = itertools.count()
+
+    def _tag(self, flow):
+        weight = self.weights[flow[1]]
+        return max(self._vtime, self._finish.get(flow, 0.0)) + 1.0 / weight
+
+    def _ahead_of(self, tag):
+        return sum(1 for entry in self._heap if entry[0] <= tag)
+
+    def estimate(self, user, job_class, calls=1):
+        """
+        Predict how long a job of this many calls would wait for the quota.
+
+        Returns:
+            tuple: (calls queued ahead of it, estimated seconds)
+        """
+        with self._cond:
+            tag = self._tag((user, job_class))
+            ahead = self._ahead_of(tag)
+            return ahead, self.bucket.seconds_until(ahead + calls)
+
+    def admit(self, user, job_class, calls=1):
+        """
+        Admission control for a job of the given number of calls.
+
+        Raises:
+            Queued: If the job would wait longer than max_wait
+        """
+        ahead, wait = self.estimate(user, job_class, calls)
+        if wait > self.max_wait:
+            raise Queued(ahead, math.ceil(wait - self.max_wait))
+
+    def acquire(self, user, job_class, timeout=None):
+        """
+        Wait for this flow's turn and take one token.
+
+        Raises:
+            Queued: If the turn does not come within timeout (default: max_wait)
+        """
+        if job_class not in self.weights:
+            raise ValueError(f"Unknown job class {job_class!r}")
+        flow = (user, job_class)
+        deadline = time.monotonic() + (self.max_wait if timeout is None else timeout)
+
+        with self._cond:
+            if not self._heap and self.bucket.take():
+                return
+            tag = self._tag(flow)
+            self._finish[flow] = tag
+            entry = (tag, next(self._sequence), flow)
+            heapq.heappush(self._heap, entry)
+
+            while True:
+                if self._heap[0] is entry and self.bucket.take():
+                    heapq.heappop(self._heap)
+                    self._vtime = tag
+                    if not self._heap:
+                        self._finish.clear()
+                    self._cond.notify_all()
+                    return
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    position = self._ahead_of(tag) - 1
+                    self._heap.remove(entry)
+                    heapq.heapify(self._heap)
+                    self._cond.notify_all()
+                    raise Queued(position, math.ceil(self.bucket.seconds_until(position + 1)))
+                self._cond.wait(min(remaining, max(self.bucket.seconds_until(), 0.005)))
+
+    def try_acquire(self, user, job_class):
+        """Take a token only if one is free and nobody is waiting."""
+        with self._cond:
+            return not self._heap and self.bucket.take()
+
+    def stats(self):
+        """Queue depth per flow and the tokens currently available."""
+        with self._cond:
+            depth = {}
+            for _, _, (user, job_class) in self._heap:
+                depth[f"{user}/{job_class}"] = depth.get(f"{user}/{job_class}", 0) + 1
+            self.bucket.refill()
+            return {"tokens": round(self.bucket.tokens, 2), "queued": depth}
+
+
+def install(scheduler):
+    """Make scheduler the one wait_turn() uses in this process (None to disable)."""
+    global _scheduler
+    _scheduler = scheduler
+
+
+def get_scheduler():
+    """The installed scheduler, or None."""
+    return _scheduler
+
+
+@contextmanager
+def client(user, job_class="interactive"):
+    """Attribute the outbound calls made inside the block to user and job_class."""
+    token = _current.set((user, job_class))
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def wait_turn():
+    """
+    Block until the bound client may make one outbound call.
+
+    Raises:
+        Queued: If the turn does not come within the scheduler's max_wait
+        deadlines.DeadlineExceeded: If the search's deadline passes first
+    """
+    bound = _current.get()
+    if _scheduler is None or bound is None:
+        return
+    left = deadlines.remaining()
+    with span("quota_wait"):
+        if left is None or left >= _scheduler.max_wait:
+            _scheduler.acquire(*bound)
+            return
+        try:
+            _scheduler.acquire(*bound, timeout=max(left, 0))
+        except Queued:
+            raise deadlines.DeadlineExceeded("Search time budget exhausted waiting for the API quota")
+
+
+def try_turn():
+    """Take a turn for an optional call (such as a hedge) only if it needs no waiting."""
+    bound = _current.get()
+    if _scheduler is None or bound is None:
+        return True
+    return _scheduler.try_acquire(*bound)
@@ -0,0 +1,80 @@
+"""
+Reverse index from normalized party names to the arbitrators who sat in their cases.
+
+Answers the screening question for a new dispute: given its parties, which
+arbitrators on the roster sat in earlier cases involving any of them? Only case
+parties are indexed; the stored cases carry no counsel data. Names are reduced
+to the canonical key of conflict_rules.party_key (case, accents, punctuation, state
+prefixes and corporate suffixes removed, then mapped through party_aliases.json) so
+that "Norway" and "Kingdom of Norway", or "Statoil ASA" and "Equinor", meet in the
+same posting list, exactly as they do in the conflict pre-screen.
+"""
+
+from collections import defaultdict, namedtuple
+
+# One normalizer and alias table for the index and the conflict pre-screen
+from conflict_rules import load_aliases, party_key
+
+Posting = namedtuple("Posting", "arbitrator_id arbitrator case_id title reference start_date party role")
+
+
+class PartyIndex:
+    def __init__(self, aliases=None):
+        """
+        Create an empty index.
+
+        Args:
+            aliases (dict, optional): Normalized alias -> canonical key, as from load_aliases
+        """
+        self.aliases = load_aliases() if aliases is None else aliases
+        self.postings = defaultdict(list)
+
+    def key(self, name):
+        """Canonical posting key for a party name."""
+        return party_key(name, self.aliases)
+
+    def add(self, posting):
+        """Add one (arbitrator, case, party) posting."""
+        key = self.key(posting.party)
+        if key:
+            self.postings[key].append(posting)
+
+    def lookup(self, name):
+        """Postings for every case where a party with this name (or an alias) appeared."""
+        return self.postings.get(self.key(name), [])
+
+    def screen(self, parties):
+        """
+        Find every arbitrator linked to any of the given parties.
+
+        Args:
+            parties (list): Party and state names of the new dispute
+
+        Returns:
+            dict: 'arbitrators' with their links, most links first, and the
+                  'unmatched' names that appear in no indexed case
+        """
+        arbitrators = {}
+        unmatched = []
+        for name in parties:
+            postings = self.lookup(name)
+            if not postings:
+                unmatched.append(name)
+            for posting in postings:
+                entry = arbitrators.setdefault(posting.arbitrator_id, {
+                    "id": posting.arbitrator_id,
+                    "name": posting.arbitrator,
+                    "links": [],
+                })
+                entry["links"].append({
+                    "query": name,
+                    "matched_party": posting.party,
+                    "role": posting.role,
+                    "case_id": posting.case_id,
+                    "title": posting.title,
+                    "reference": posting.reference,
+                    "start_date": posting.start_date,
+                })
+
+        ranked = sorted(arbitrators.values(), key=lambda a: (-len(a["links"]), a["name"]))
+        return {"arbitrators": ranked, "unmatched": unmatched}
@@ -0,0 +1,166 @@
+"""
+Compact, token-efficient encoding of case data for LLM prompts.
+
+format_search_results is written for people: every case repeats field labels and
+full party descriptions. For the model, parties and arbitrators are listed once in
+reference tables and each case becomes one line of fixed columns, with empty fields
+left blank so every value stays in its column, and roles abbreviated. When the
+encoded data exceeds the token budget, whole cases are left out (oldest first)
+instead of cutting the text mid-case, and the exact token count of what will be
+sent is reported.
+"""
+
+from conflict_rules import normalize_name
+
+DEFAULT_MODEL = "gpt-4o-mini"
+DEFAULT_TOKEN_BUDGET = 8000
+
+ROLE_CODES = {"claimant": "C", "respondent": "R", "applicant": "C"}
+
+LEGEND = (
+    "Format: A = arbitrators, P = parties (name|type), then one case per line: "
+    "id|title|ref|status|start..end|parties as P#:role (C=claimant, R=respondent)|arbitrators as A#. "
+    "Every case line has all 7 fields; unknown ones are left empty."
+)
+
+
+def role_code(role):
+    """Short code for a party role."""
+    role = (role or "").strip()
+    return ROLE_CODES.get(role.lower(), role)
+
+
+def _clean(value):
+    """Field text without the separators used by the encoding."""
+    return " ".join(str(value).replace("|", "/").split()) if value else ""
+
+
+def encode_cases(individuals, max_cases=None):
+    """
+    Encode individuals and their cases as compact prompt text.
+
+    Args:
+        individuals (list): Individuals as returned by search_arbitrator_cases
+        max_cases (int, optional): Keep only the most recent cases
+
+    Returns:
+        tuple: (text, number of cases encoded, number of distinct cases available)
+    """
+    arbitrator_refs = {}
+    arbitrator_lines = []
+    cases = {}
+    case_arbitrators = {}
+    for individual in individuals:
+        if individual["id"] not in arbitrator_refs:
+            ref = arbitrator_refs[individual["id"]] = f"A{len(arbitrator_refs) + 1}"
+            details = individual.get("details") or {}
+            extras = [f"{key}={_clean(details[key])}" for key in ("firm", "nationality", "role") if details.get(key)]
+            arbitrator_lines.append("|".join([ref, _clean(individual["name"])] + extras))
+        ref = arbitrator_refs[individual["id"]]
+        for case in individual.get("cases", []):
+            case_id = str(case["id"])
+            cases.setdefault(case_id, case)
+            case_arbitrators.setdefault(case_id, []).append(ref)
+
+    # Most recent first, so a budget cut drops the oldest cases
+    ordered = sorted(cases.values(), key=lambda c: c.get("startDate") or "", reverse=True)
+    available = len(ordered)
+    if max_cases is not None:
+        ordered = ordered[:max_cases]
+
+    party_refs = {}
+    party_lines = []
+    case_lines = []
+    for case in ordered:
+        parties = []
+        for party in case.get("parties") or []:
+            key = normalize_name(party.get("name"))
+            if not key:
+                continue
+            if key not in party_refs:
+                party_refs[key] = f"P{len(party_refs) + 1}"
+                party_lines.append("|".join([party_refs[key], _clean(party.get("name")), _clean(party.get("type"))]))
+            parties.append(f"{party_refs[key]}:{role_code(party.get('role'))}".rstrip(":"))
+
+        start, end = case.get("startDate") or "", case.get("endDate") or ""
+        fields = [
+            _clean(case["id"]),
+            _clean(case.get("title")),
+            _clean(case.get("reference")),
+            _clean(case.get("status")),
+            f"{start[:10]}..{end[:10]}" if start or end else "",
+            ",".join(parties),
+            ",".join(case_arbitrators[str(case["id"])]),
+        ]
+        case_lines.append("|".join(fields))
+
+    sections = [LEGEND, "A:", *arbitrator_lines]
+    if party_lines:
+        sections += ["P:", *party_lines]
+    sections += ["Cases:", *case_lines]
+    return "\n".join(sections), len(ordered), available
+
+
+def count_tokens(text, model=DEFAULT_MODEL):
+    """
+    Count the tokens text takes for model.
+
+    Returns:
+        tuple: (tokens, exact) where exact is False when tiktoken is not installed
+               and the count is a characters/4 estimate
+    """
+    # Imported here so the web app starts without tiktoken
+    try:
+        import tiktoken
+    except ImportError:
+        return (len(text) + 3) // 4, False
+    try:
+        encoding = tiktoken.encoding_for_model(model)
+    except KeyError:
+        encoding = tiktoken.get_encoding("o200k_base")
+    return len(encoding.encode(text)), True
+
+
+def encode_prompt(individuals, budget=DEFAULT_TOKEN_BUDGET, model=DEFAULT_MODEL):
+    """
+    Encode as many of the most recent cases as fit in the token budget.
+
+    Args:
+        individuals (list): Individuals as returned by search_arbitrator_cases
+        budget (int, optional): Maximum tokens for the encoded data
+        model (str, optional): Model whose tokenizer is used for counting
+
+    Returns:
+        dict: 'text', its 'tokens' (and whether the count is 'exact'), and the
+              number of 'cases' included out of 'cases_available'
+
+    Raises:
+        ValueError: If the legend and reference tables alone exceed the budget
+    """
+    text, included, available = encode_cases(individuals)
+    tokens, exact = count_tokens(text, model)
+
+    if tokens > budget:
+        # Largest number of cases that fits, by binary search over exact counts
+        low, high = 1, included - 1
+        text, included, _ = encode_cases(individuals, 0)
+        tokens, exact = count_tokens(text, model)
+        if tokens > budget:
+            raise ValueError(f"Token budget {budget} is too small for the prompt header alone ({tokens} tokens)")
+        while low <= high:
+            middle = (low + high + 1) // 2
+            candidate_text, candidate_included, _ = encode_cases(individuals, middle)
+            candidate_tokens, _ = count_tokens(candidate_text, model)
+            if candidate_tokens <= budget:
+                text, included, tokens = candidate_text, candidate_included, candidate_tokens
+                low = middle + 1
+            else:
+                high = middle - 1
+
+    return {
+        "text": text,
+        "tokens": tokens,
+        "exact": exact,
+        "cases": included,
+        "cases_available": available,
+    }
@@ -0,0 +1,144 @@
+"""
+Server-side conflict report rendering with content-addressed artifacts.
+
+A report is rendered from the structured results stored for one arbitrator (their
+cases and the rule pre-screen over them). The artifact is stored under the
+arbitrator's id and a digest of that data, so a report is rendered once per data
+version and served from disk until a new screening changes the data. Rendering
+runs on a small per-process thread pool; callers get 'rendering' back until the
+file is ready. A failed render is reported for a while (RETRY_FAILED_SECONDS),
+then the next request renders it again.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+# Bump when the report layout changes so every report is rendered again
+TEMPLATE_VERSION = 1
+
+FORMATS = {"html": "text/html", "pdf": "application/pdf"}
+
+# A failed render is reported for this long, then the next request tries again
+RETRY_FAILED_SECONDS = 30
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+_env = Environment(loader=FileSystemLoader(TEMPLATE_DIR), autoescape=select_autoescape(["html"]))
+
+
+def data_version(data):
+    """Digest identifying the report data and template version."""
+    canonical = json.dumps([TEMPLATE_VERSION, data], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+def render_html(data, context=None):
+    """Render the report for one arbitrator as a standalone HTML document."""
+    return _env.get_template("report.html").render(**data, **(context or {}))
+
+
+def render_pdf(html):
+    """
+    Convert a rendered HTML report to PDF.
+
+    Raises:
+        RuntimeError: If WeasyPrint is not installed
+    """
+    # Imported here so the web app starts (and serves HTML reports) without it
+    try:
+        from weasyprint import HTML
+    except ImportError:
+        raise RuntimeError("PDF reports need WeasyPrint (pip install weasyprint)")
+    return HTML(string=html).write_pdf()
+
+
+class ReportRenderer:
+    def __init__(self, report_dir, workers=2, retry_failed_after=RETRY_FAILED_SECONDS):
+        """
+        Create a renderer storing artifacts under report_dir.
+
+        Args:
+            report_dir (str): Artifact directory, one subdirectory per arbitrator
+            workers (int): Reports rendered at the same time
+            retry_failed_after (float): Seconds a failed render is reported before
+                the next request tries it again
+        """
+        self.report_dir = os.path.abspath(report_dir)
+        self.workers = workers
+        self.retry_failed_after = retry_failed_after
+        self._executor = None
+        self._lock = threading.Lock()
+        self._jobs = {}
+        self._errors = {}
+
+    def path(self, arbitrator_id, version, fmt):
+        """Where the artifact for this arbitrator, data version and format lives."""
+        return os.path.join(self.report_dir, str(arbitrator_id), f"{version}.{fmt}")
+
+    def ensure(self, arbitrator_id, data, fmt, context=None):
+        """
+        Return the artifact for data, starting a background render if it is missing.
+
+        Args:
+            arbitrator_id (int): Arbitrator the report is about
+            data (dict): Report data, as passed to the template
+            fmt (str): 'html' or 'pdf'
+            context (dict, optional): Further template values that are not part of
+                the data version, such as when the cases were fetched
+
+        Returns:
+            tuple: (state, path, version) where state is 'ready', 'rendering' or
+                   'failed' (path is then the error message)
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown report format {fmt!r}")
+        version = data_version(data)
+        path = self.path(arbitrator_id, version, fmt)
+        if os.path.exists(path):
+            return "ready", path, version
+
+        key = (arbitrator_id, version, fmt)
+        with self._lock:
+            if key in self._errors:
+                message, failed_at = self._errors[key]
+                if time.monotonic() - failed_at < self.retry_failed_after:
+                    return "failed", message, version
+                del self._errors[key]
+            if key not in self._jobs:
+                if self._executor is None:
+                    # Imported on first render to keep it off the app's startup path
+                    from concurrent.futures import ThreadPoolExecutor
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="report")
+                self._jobs[key] = self._executor.submit(self._render, key, data, context, path)
+        return "rendering", None, version
+
+    def _render(self, key, data, context, path):
+        try:
+            html = render_html(data, context)
+            content = html.encode("utf-8") if key[2] == "html" else render_pdf(html)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write under a temporary name so readers never see a partial file
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            with self._lock:
+                # Failures of this arbitrator's earlier data versions no longer matter
+                for stale in [k for k in self._errors if k[0] == key[0] and k[2] == key[2]]:
+                    del self._errors[stale]
+                self._errors[key] = (str(e), time.monotonic())
+        finally:
+            with self._lock:
+                self._jobs.pop(key, None)
+
+    def wait(self, timeout=None):
+        """Block until the renders started so far have finished (for scripts and tests)."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.result(timeout)
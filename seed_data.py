@@ -1,4 +1,8 @@
-from app import app, db, Arbitrator
+import migrations
+from app import create_app, db, Arbitrator
+from import_arbitrators import normalize_row, upsert_arbitrators
+
+app = create_app()
 
 # Real arbitrator data
 arbitrators = [
@@ -30,16 +34,10 @@ arbitrators = [
 
 def seed_database():
     with app.app_context():
-        # Clear existing data
-        db.drop_all()
-        db.create_all()
-        
-        # Add arbitrators
-        for arb_data in arbitrators:
-            arbitrator = Arbitrator(**arb_data)
-            db.session.add(arbitrator)
+        migrations.upgrade(db.engine)
         
-        db.session.commit()
+        # Add or update arbitrators without dropping existing data
+        upsert_arbitrators(normalize_row(arb_data) for arb_data in arbitrators)
         print("Database seeded successfully!")
 
 if __name__ == '__main__':
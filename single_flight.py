@@ -0,0 +1,82 @@
+"""
+Single-flight request coalescing.
+
+Concurrent callers asking for the same key attach to one in-flight computation
+and share its result (or its exception) instead of each running their own. A
+caller inside a deadline (see deadlines.py) waits for the shared call no longer
+than its own time budget.
+"""
+
+import threading
+
+import deadlines
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    def __init__(self):
+        """Create an empty group of in-flight calls."""
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        """
+        Run fn(*args, **kwargs) unless a call for the same key is already running.
+
+        Args:
+            key (hashable): Identity of the computation
+            fn (callable): Function computing the result
+
+        Returns:
+            tuple: (result, shared) where shared is True if the result came from
+                   a call started by another thread
+
+        Raises:
+            deadlines.DeadlineExceeded: If the caller's deadline passes while it
+                waits for another thread's call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = _Call()
+                self._calls[key] = call
+                leader = True
+            else:
+                call.waiters += 1
+                leader = False
+
+        if not leader:
+            timeout = deadlines.remaining()
+            if not call.done.wait(None if timeout is None else max(timeout, 0)):
+                with self._lock:
+                    call.waiters -= 1
+                raise deadlines.DeadlineExceeded("Time budget exhausted waiting for an identical request in flight")
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # Forget the call before waking waiters so that requests arriving
+            # after completion start a fresh computation
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result, False
+
+    def in_flight(self):
+        """Return the keys currently being computed."""
+        with self._lock:
+            return list(self._calls)
@@ -0,0 +1,35 @@
+from arbitrator_finder import best_match, select_candidates
+
+
+def candidate(name, score):
+    return {"id": name, "name": name, "role": "arbitrator", "appearances": 1, "score": score}
+
+
+def test_clear_best_match_is_expanded_alone():
+    candidates = [candidate("Jane Doe", 1.4), candidate("Jane Doe-Smith", 1.1)]
+
+    expand, rest = select_candidates(candidates, top_k=2)
+
+    assert [c["name"] for c in expand] == ["Jane Doe"]
+    assert [c["name"] for c in rest] == ["Jane Doe-Smith"]
+
+
+def test_tied_candidates_are_expanded_up_to_top_k():
+    candidates = [candidate("J. Doe", 1.2), candidate("Jane Doe", 1.2), candidate("John Doe", 1.19)]
+
+    expand, rest = select_candidates(candidates, top_k=2)
+
+    assert [c["name"] for c in expand] == ["J. Doe", "Jane Doe"]
+    assert [c["name"] for c in rest] == ["John Doe"]
+
+
+def test_no_candidates():
+    assert select_candidates([], top_k=2) == ([], [])
+
+
+def test_best_match_drops_runners_up():
+    individuals = [{"name": "J. Doe", "best_match": True}, {"name": "Jane Doe", "best_match": False}]
+
+    assert best_match(individuals) == individuals[:1]
+    # Mock data and saved searches from before the flag keep all their individuals
+    assert best_match([{"name": "Jane Doe"}]) == [{"name": "Jane Doe"}]
@@ -0,0 +1,52 @@
+import pytest
+
+import app as appmod
+import migrations
+
+CASES = 45
+
+
+def fake_search(api_key, name, max_cases=10, base_url=None, suggestions=None):
+    cases = [{
+        "id": f"c{n:02d}", "title": f"Case {n}", "reference": f"ARB/{n}", "organization": "ICSID", "status": "Pending",
+        "startDate": f"20{n % 20 + 5:02d}-01-{n % 28 + 1:02d}", "endDate": "", "parties": [],
+    } for n in range(CASES)]
+    cases[0]["startDate"] += "T09:30:00Z"
+    return [{"id": "i1", "name": name, "best_match": True, "details": {}, "cases": cases[:max_cases]}]
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(appmod, "search_arbitrator_cases", fake_search)
+    app = appmod.create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'app.db'}", "TESTING": True,
+                             "SCREENING_MAX_CASES": 50, "OUTBOUND_RATE": 0})
+    with app.app_context():
+        migrations.upgrade(appmod.db.engine)
+        arbitrator = appmod.Arbitrator(name="Jane Doe")
+        appmod.db.session.add(arbitrator)
+        appmod.db.session.commit()
+    yield app.test_client()
+    with app.app_context():
+        appmod.db.engine.dispose()
+
+
+def test_listing_pages_through_every_screened_case(client):
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = client.get("/api/arbitrators/1/cases", query_string={"limit": 20, **({"cursor": cursor} if cursor else {})}).get_json()
+        seen += [case["id"] for case in page["cases"]]
+        pages += 1
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert pages == 3
+    assert sorted(seen) == sorted(f"c{n:02d}" for n in range(CASES))
+    dates = [case["start_date"] for case in client.get("/api/arbitrators/1/cases?limit=100").get_json()["cases"]]
+    assert dates == sorted(dates, reverse=True)
+
+
+def test_date_to_includes_timestamps_on_that_day(client):
+    client.get("/api/arbitrators/1/cases")
+    page = client.get("/api/arbitrators/1/cases", query_string={"date_from": "2005-01-01", "date_to": "2005-01-01"}).get_json()
+    assert [case["id"] for case in page["cases"]] == ["c00"]
@@ -0,0 +1,71 @@
+from datetime import date
+
+import pytest
+
+from conflict_rules import load_aliases, normalize_party_name, party_key, prescreen
+from party_index import PartyIndex, Posting
+
+RULES = [{"id": "prior-case-with-party", "classification": "GREEN", "parties": ["Equinor"]}]
+
+
+def individual(*party_names):
+    return [{"name": "Jane Doe", "cases": [
+        {"id": f"c{n}", "title": f"Case {n}", "startDate": "2020-01-01", "endDate": "2021-01-01",
+         "status": "Concluded", "parties": [{"name": name, "role": "Respondent"}]}
+        for n, name in enumerate(party_names)
+    ]}]
+
+
+def test_normalize_party_name():
+    assert normalize_party_name("The Government of the Kingdom of Norway") == "norway"
+    assert normalize_party_name("Équinor ASA") == "equinor"
+
+
+def test_prescreen_and_party_index_agree():
+    aliases = load_aliases()
+    names = ["Statoil ASA", "Den norske stats oljeselskap a.s.", "Equinor Energy AS", "Statoil Norway AS"]
+    screening = prescreen(individual(*names), RULES, as_of=date(2026, 1, 1), aliases=aliases)
+
+    index = PartyIndex(aliases)
+    for n, name in enumerate(names):
+        index.add(Posting(1, "Jane Doe", f"c{n}", "", "", "2020-01-01", name, "Respondent"))
+
+    flagged = {case["id"] for finding in screening["findings"] for case in finding["evidence"]}
+    indexed = {posting.case_id for posting in index.lookup("Equinor")}
+    assert flagged == indexed == {f"c{n}" for n, name in enumerate(names) if party_key(name, aliases) == "equinor"} == {"c0"}
+    # The rest contain "Equinor" or an alias of it but are not the same name: left to the LLM
+    assert {case["id"] for case in screening["ambiguous"]} == {f"c{n}" for n in range(len(names))} - flagged
+    assert not screening["decided"]
+
+
+@pytest.mark.parametrize("name", ["Ministry of Petroleum and Energy of the Kingdom of Norway", "Norway (Government of)"])
+def test_near_match_is_ambiguous_not_green(name):
+    rules = [{"id": "pending-case-with-party", "classification": "YELLOW", "parties": ["Kingdom of Norway"], "pending": True}]
+    case = {"id": "c1", "title": "", "startDate": "2025-01-01", "endDate": "", "status": "Pending",
+            "parties": [{"name": name, "role": "Respondent"}]}
+
+    screening = prescreen([{"name": "Jane Doe", "cases": [case]}], rules, as_of=date(2026, 1, 1), aliases=load_aliases())
+
+    assert screening["classification"] is None
+    assert not screening["decided"]
+    assert [c["id"] for c in screening["ambiguous"]] == ["c1"]
+
+
+def test_party_index_screens_parties_only():
+    index = PartyIndex(load_aliases())
+    index.add(Posting(1, "Jane Doe", "c1", "", "", "2020-01-01", "Acme Energy AS", "Claimant"))
+
+    result = index.screen(["Acme Energy", "Kingdom of Norway"])
+
+    assert [(a["name"], [link["matched_party"] for link in a["links"]]) for a in result["arbitrators"]] == [("Jane Doe", ["Acme Energy AS"])]
+    assert "type" not in result["arbitrators"][0]["links"][0]
+    assert result["unmatched"] == ["Kingdom of Norway"]
+
+
+def test_appointment_analytics_uses_party_keys():
+    from appointment_analytics import AppointmentMatrices
+
+    names = ["Statoil ASA", "StatoilHydro", "Kingdom of Norway", "Norway"]
+    matrices = AppointmentMatrices(individual(*names), load_aliases())
+    assert matrices.parties == ["equinor", "norway"]
+    assert str(matrices.case_start[0]) == "2020-01-01"
@@ -0,0 +1,24 @@
+from dossier_index import index_dossier, remove_dossier, search
+
+STAGE = {"arbitrator_name": "Jane Doe", "raw_findings": "Former partner at Lenz & Staehelin."}
+
+
+def test_master_dossier_is_the_only_hit(tmp_path):
+    path = str(tmp_path / "dossiers.db")
+    stage_file, master_file = tmp_path / "web_research.json", tmp_path / "Jane_Doe_master_data.json"
+    # Indexed by earlier versions, which indexed stage files too
+    index_dossier(STAGE, str(stage_file), path=path)
+    index_dossier({"web_research": STAGE}, str(master_file), path=path)
+
+    assert remove_dossier(str(stage_file), path=path) == 1
+    hits = search("Lenz & Staehelin", path=path)["hits"]
+    assert [(hit["arbitrator"], hit["source"]) for hit in hits] == [("Jane Doe", master_file.name)]
+
+
+def test_reindexing_replaces_rows(tmp_path):
+    path = str(tmp_path / "dossiers.db")
+    index_dossier(STAGE, str(tmp_path / "dossier.json"), path=path)
+    index_dossier(dict(STAGE, raw_findings="Advised Acme Energy AS."), str(tmp_path / "dossier.json"), path=path)
+
+    assert search("Lenz & Staehelin", path=path)["hits"] == []
+    assert len(search("Acme Energy", path=path)["hits"]) == 1
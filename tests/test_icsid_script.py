@@ -0,0 +1,42 @@
+import importlib.util
+import os
+
+import requests
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "icsid-pca-api-script.py")
+spec = importlib.util.spec_from_file_location("icsid_script", SCRIPT)
+icsid = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(icsid)
+
+
+class FakeResponse:
+    def __init__(self, document):
+        self.document = document
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.document
+
+
+def fake_get(url, timeout=None, headers=None, params=None):
+    if url.endswith("/individuals"):
+        if "/decisions/102/" in url:
+            raise requests.Timeout("read timed out")
+        return FakeResponse({"data": [{"type": "individuals", "id": "a1", "attributes": {"role": "President"}}]})
+    case_id = url.rsplit("/", 1)[1]
+    decision = {"type": "decisions", "id": f"10{case_id}"}
+    return FakeResponse({
+        "data": {"type": "cases", "id": case_id, "attributes": {"title": f"Case {case_id}"},
+                 "relationships": {"parties": {"data": []}, "decisions": {"data": [decision]}}},
+        "included": [decision],
+    })
+
+
+def test_timed_out_individuals_report_the_case_as_missing(monkeypatch):
+    monkeypatch.setattr(icsid.requests, "get", fake_get)
+    missing = []
+    cases = list(icsid.iter_arbitrator_cases("https://api", {}, {"id": "a1"}, ["1", "2", "3"], {}, missing=missing))
+    assert [case["id"] for case in cases] == ["1", "3"]
+    assert missing == ["2"]
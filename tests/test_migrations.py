@@ -0,0 +1,75 @@
+import os
+import uuid
+
+import pytest
+import sqlalchemy as sa
+
+import migrations
+from app import create_app, db
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = sa.create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    yield engine
+    engine.dispose()
+
+
+def indexes(engine, table):
+    return {index["name"] for index in sa.inspect(engine).get_indexes(table)}
+
+
+def test_fresh_upgrade_builds_schema(engine):
+    assert migrations.upgrade(engine) == [number for number, _, _ in migrations.MIGRATIONS]
+
+    inspector = sa.inspect(engine)
+    assert {"arbitrator", "case_record", "screening_lock", "schema_version"} <= set(inspector.get_table_names())
+    assert {"ix_case_record_listing", "ix_case_record_fetched_at"} <= indexes(engine, "case_record")
+    with engine.connect() as connection:
+        assert migrations.current_version(connection) == migrations.HEAD
+
+
+def test_upgrade_adopts_create_all_database(tmp_path):
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'app.db'}"})
+    with app.app_context():
+        db.create_all()
+        db.session.execute(sa.text("INSERT INTO arbitrator (name) VALUES ('Jane Doe')"))
+        db.session.commit()
+
+        assert migrations.upgrade(db.engine) == [number for number, _, _ in migrations.MIGRATIONS]
+        assert "ix_case_record_fetched_at" in indexes(db.engine, "case_record")
+        assert db.session.execute(sa.text("SELECT name FROM arbitrator")).scalars().all() == ["Jane Doe"]
+        assert app.test_client().get("/readyz").status_code == 200
+
+
+def test_upgrade_is_idempotent(engine):
+    migrations.upgrade(engine)
+
+    assert migrations.upgrade(engine) == []
+    with engine.connect() as connection:
+        assert migrations.current_version(connection) == migrations.HEAD
+        assert connection.execute(sa.select(sa.func.count()).select_from(migrations.version_table)).scalar() == len(migrations.MIGRATIONS)
+
+
+def test_upgrade_stops_at_target(engine):
+    assert migrations.upgrade(engine, target=1) == [1]
+    assert migrations.upgrade(engine) == [number for number, _, _ in migrations.MIGRATIONS[1:]]
+
+
+def test_cli_migrates_the_database_the_app_uses(tmp_path, monkeypatch):
+    # A relative SQLite URL must land in the app's instance folder, not the working directory
+    name = f"migrations-test-{uuid.uuid4().hex}.db"
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{name}")
+    monkeypatch.chdir(tmp_path)
+    app = create_app()
+    try:
+        migrations.main(["upgrade"])
+
+        assert not (tmp_path / name).exists()
+        assert app.test_client().get("/readyz").status_code == 200
+    finally:
+        with app.app_context():
+            db.engine.dispose()
+        path = os.path.join(app.instance_path, name)
+        if os.path.exists(path):
+            os.remove(path)
@@ -0,0 +1,80 @@
+import json
+from types import SimpleNamespace as NS
+
+import pytest
+
+import model_cascade
+
+POLICY = {
+    "escalate_below_confidence": 0.8,
+    "escalate_classifications": ["RED", "YELLOW"],
+    "tiers": [
+        {"name": "fast", "model": "small", "input_usd_per_mtok": 1.0, "output_usd_per_mtok": 2.0},
+        {"name": "strong", "model": "large", "input_usd_per_mtok": 10.0, "output_usd_per_mtok": 20.0},
+    ],
+}
+
+
+class FakeClient:
+    """Answers each call with the next scripted answer, streamed in small pieces when asked."""
+
+    def __init__(self, *answers):
+        self.answers = list(answers)
+        self.chat = NS(completions=self)
+
+    def create(self, stream=False, **request):
+        content = json.dumps(self.answers.pop(0))
+        usage = NS(prompt_tokens=100, completion_tokens=20)
+        if not stream:
+            return NS(usage=usage, choices=[NS(message=NS(content=content, refusal=None))])
+        pieces = [content[i:i + 8] for i in range(0, len(content), 8)]
+        return iter([NS(usage=None, choices=[NS(delta=NS(content=piece, refusal=None))]) for piece in pieces]
+                    + [NS(usage=usage, choices=[])])
+
+
+def answer(classification, confidence):
+    return {"classification": classification, "confidence": confidence, "findings": [], "rationale": classification}
+
+
+def test_escalates_until_an_answer_stands():
+    client = FakeClient(answer("YELLOW", 0.9), answer("GREEN", 0.95))
+
+    result = model_cascade.classify_conflicts("cases", policy=POLICY, client=client)
+
+    assert (result["classification"], result["tier"]) == ("GREEN", "strong")
+    assert [call["escalated"] for call in result["calls"]] == [True, False]
+    assert result["calls"][0]["escalation_reason"] == "YELLOW result"
+    assert result["cost_usd"] == pytest.approx((100 * 1 + 20 * 2 + 100 * 10 + 20 * 20) / 1e6)
+
+
+def test_streamed_tokens_make_up_each_tier_answer():
+    client = FakeClient(answer("GREEN", 0.5), answer("GREEN", 0.9))
+
+    events = list(model_cascade.iter_cascade("cases", policy=POLICY, client=client, stream=True))
+
+    kinds = [kind for kind, _, _ in events]
+    assert kinds[0] == "token" and kinds.count("tier") == 2
+    first_tier = kinds.index("tier")
+    text = "".join(data["delta"] for kind, data, _ in events[:first_tier])
+    assert json.loads(text) == answer("GREEN", 0.5)
+    call = events[first_tier][1]
+    assert (call["prompt_tokens"], call["completion_tokens"], call["escalation_reason"]) == (100, 20, "confidence 0.50")
+    assert events[-1][2]["tier"] == "strong"
+
+
+def test_no_valid_answer_raises():
+    client = FakeClient("not a classification", "still not")
+
+    with pytest.raises(RuntimeError, match="No model tier"):
+        model_cascade.classify_conflicts("cases", policy=POLICY, client=client)
+
+
+def test_stats_endpoint_reports_tier_totals(tmp_path, monkeypatch):
+    import app as appmod
+
+    monkeypatch.setattr(model_cascade, "_totals", {})
+    model_cascade.classify_conflicts("cases", policy=POLICY, client=FakeClient(answer("RED", 0.95), answer("RED", 0.9)))
+    app = appmod.create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'app.db'}", "TESTING": True})
+    tiers = app.test_client().get("/api/llm/stats").get_json()["tiers"]
+    assert {name: (t["calls"], t["escalations"]) for name, t in tiers.items()} == {"fast": (1, 1), "strong": (1, 0)}
+    assert tiers["strong"]["cost_usd"] == pytest.approx(0.0014)
@@ -0,0 +1,26 @@
+import app as appmod
+import outbound_scheduler
+
+
+def make_app(tmp_path, **config):
+    return appmod.create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'app.db'}", "TESTING": True,
+                              "OUTBOUND_RATE": 8, "OUTBOUND_BURST": 10, **config})
+
+
+def test_workers_split_the_key_quota(tmp_path):
+    app = make_app(tmp_path)
+    appmod.init_worker(app, workers=4)
+    bucket = outbound_scheduler.get_scheduler().bucket
+    assert (bucket.rate, bucket.burst) == (2, 2)
+
+
+def test_worker_count_defaults_to_web_concurrency(tmp_path):
+    app = make_app(tmp_path, WEB_CONCURRENCY=16)
+    appmod.init_worker(app)
+    bucket = outbound_scheduler.get_scheduler().bucket
+    assert (bucket.rate, bucket.burst) == (0.5, 1)
+
+
+def test_zero_rate_disables_scheduling(tmp_path):
+    appmod.init_worker(make_app(tmp_path, OUTBOUND_RATE=0), workers=4)
+    assert outbound_scheduler.get_scheduler() is None
@@ -0,0 +1,52 @@
+import pytest
+
+from prompt_encoder import encode_cases, encode_prompt
+
+
+def individual(*cases):
+    return {"id": "i1", "name": "Jane Doe", "details": {}, "cases": list(cases)}
+
+
+def case(case_id, start, **fields):
+    return dict({"id": case_id, "title": f"Case {case_id}", "reference": "ARB/20/1", "status": "Pending",
+                 "startDate": start, "endDate": "", "parties": []}, **fields)
+
+
+def case_lines(text):
+    return text.split("Cases:\n", 1)[1].splitlines()
+
+
+def test_case_lines_keep_their_columns():
+    text, _, _ = encode_cases([individual(
+        case("c1", "2021-01-01"),
+        case("c2", "2020-01-01", reference="", status="Concluded"),
+    )])
+
+    first, second = (line.split("|") for line in case_lines(text))
+    assert len(first) == len(second) == 7
+    assert second[2] == ""
+    assert second[3] == "Concluded"
+
+
+def test_party_lines_keep_their_columns():
+    text, _, _ = encode_cases([individual(case("c1", "2021-01-01", parties=[
+        {"name": "Acme Energy AS", "role": "Claimant", "type": ""},
+    ]))])
+
+    assert "P1|Acme Energy AS|" in text.splitlines()
+
+
+def test_budget_drops_oldest_cases():
+    cases = [case(f"c{n}", f"20{10 + n}-01-01") for n in range(8)]
+    full = encode_prompt([individual(*cases)], budget=100000)
+    header = encode_prompt([individual(*cases)], budget=full["tokens"] - 1)
+
+    assert full["cases"] == 8
+    assert header["cases"] < 8
+    assert header["tokens"] <= full["tokens"] - 1
+    assert [line.split("|")[0] for line in case_lines(header["text"])] == [f"c{n}" for n in range(7, 7 - header["cases"], -1)]
+
+
+def test_budget_below_header_raises():
+    with pytest.raises(ValueError, match="too small"):
+        encode_prompt([individual(case("c1", "2021-01-01"))], budget=10)
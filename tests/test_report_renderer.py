@@ -0,0 +1,39 @@
+import pytest
+
+import report_renderer
+from report_renderer import ReportRenderer, data_version
+
+DATA = {"arbitrator": {"id": 1, "name": "Jane Doe", "specialization": ""}, "cases": [],
+        "prescreen": {"classification": None, "decided": False, "findings": [], "ambiguous": []}}
+
+
+@pytest.fixture
+def renderer(tmp_path):
+    return ReportRenderer(str(tmp_path), workers=1)
+
+
+def test_fetch_time_does_not_change_the_version(renderer):
+    renderer.ensure(1, DATA, "html", context={"fetched_at": "2026-01-01 10:00 UTC"})
+    renderer.wait()
+
+    state, path, version = renderer.ensure(1, DATA, "html", context={"fetched_at": "2026-01-02 10:00 UTC"})
+
+    assert state == "ready"
+    assert version == data_version(DATA)
+    assert "2026-01-01 10:00 UTC" in open(path, encoding="utf-8").read()
+
+
+def test_failed_render_is_retried(renderer, monkeypatch):
+    monkeypatch.setattr(report_renderer, "render_html", lambda data, context=None: 1 / 0)
+    renderer.ensure(1, DATA, "html")
+    renderer.wait()
+
+    state, message, _ = renderer.ensure(1, DATA, "html")
+    assert state == "failed"
+    assert "division by zero" in message
+
+    monkeypatch.undo()
+    renderer.retry_failed_after = 0
+    assert renderer.ensure(1, DATA, "html")[0] == "rendering"
+    renderer.wait()
+    assert renderer.ensure(1, DATA, "html")[0] == "ready"
@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import app as appmod
+import deadlines
+import migrations
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(appmod, "screen_arbitrator", lambda arbitrator_id, name, max_cases=10: {"status": "success", "arbitrator": name})
+    app = appmod.create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'app.db'}", "TESTING": True})
+    with app.app_context():
+        migrations.upgrade(appmod.db.engine)
+        yield app
+        appmod.db.session.remove()
+        appmod.db.engine.dispose()
+
+
+def hold_lock(age):
+    appmod.db.session.add(appmod.ScreeningLock(key="k", owner="other:1", acquired_at=datetime.utcnow() - age))
+    appmod.db.session.commit()
+
+
+def test_waiting_on_a_held_lock_stops_at_the_deadline(app):
+    hold_lock(timedelta(seconds=1))
+
+    with deadlines.deadline(0.3), pytest.raises(deadlines.DeadlineExceeded):
+        appmod.screen_arbitrator_locked("k", 1, "Jane Doe")
+
+
+def test_stale_lock_is_taken_over(app):
+    hold_lock(timedelta(seconds=app.config["SCREENING_LOCK_STALE_SECONDS"] + 1))
+
+    with deadlines.deadline(1):
+        assert appmod.screen_arbitrator_locked("k", 1, "Jane Doe")["status"] == "success"
+    assert appmod.db.session.get(appmod.ScreeningLock, "k").owner != "other:1"
@@ -0,0 +1,45 @@
+import threading
+
+import pytest
+
+import deadlines
+from single_flight import SingleFlight
+
+
+def start_leader(group, key, release):
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "result"
+
+    thread = threading.Thread(target=group.do, args=(key, slow))
+    thread.start()
+    started.wait(5)
+    return thread
+
+
+def test_follower_shares_the_leaders_result():
+    group, release = SingleFlight(), threading.Event()
+    leader = start_leader(group, "key", release)
+    results = []
+    follower = threading.Thread(target=lambda: results.append(group.do("key", lambda: "own")))
+    follower.start()
+    release.set()
+    follower.join(5)
+    leader.join(5)
+
+    assert results == [("result", True)]
+
+
+def test_follower_wait_is_bounded_by_its_deadline():
+    group, release = SingleFlight(), threading.Event()
+    leader = start_leader(group, "key", release)
+    try:
+        with deadlines.deadline(0.1), pytest.raises(deadlines.DeadlineExceeded):
+            group.do("key", lambda: "own")
+    finally:
+        release.set()
+        leader.join(5)
+    assert group.in_flight() == []
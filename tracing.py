@@ -0,0 +1,82 @@
+"""
+Lightweight per-request stage tracing.
+
+A trace lives in a context variable for the duration of a request. Code anywhere
+below the request handler wraps its stages in `with span("name"):`; each stage
+accumulates its total duration and the number of times it ran. Outside a trace,
+span() does nothing, so library code can be instrumented unconditionally.
+"""
+
+import contextvars
+import time
+from contextlib import contextmanager
+
+_current = contextvars.ContextVar("trace", default=None)
+
+
+class Trace:
+    def __init__(self):
+        """Start timing a new trace."""
+        self.started = time.perf_counter()
+        self.stages = {}
+
+    def record(self, name, seconds):
+        """Add one run of a stage."""
+        stage = self.stages.setdefault(name, [0.0, 0])
+        stage[0] += seconds
+        stage[1] += 1
+
+    def elapsed(self):
+        """Seconds since the trace started."""
+        return time.perf_counter() - self.started
+
+    def summary(self):
+        """Stages as {name: {'ms': total milliseconds, 'calls': count}}, in first-seen order."""
+        return {
+            name: {"ms": round(seconds * 1000, 2), "calls": calls}
+            for name, (seconds, calls) in self.stages.items()
+        }
+
+    def server_timing(self):
+        """Format the stages and the total as a Server-Timing header value."""
+        metrics = [
+            f'{name};dur={seconds * 1000:.1f};desc="{calls} call{"s" if calls != 1 else ""}"'
+            for name, (seconds, calls) in self.stages.items()
+        ]
+        metrics.append(f"total;dur={self.elapsed() * 1000:.1f}")
+        return ", ".join(metrics)
+
+
+def start_trace():
+    """
+    Begin a trace in the current context.
+
+    Returns:
+        tuple: (trace, token) where token is passed to end_trace
+    """
+    trace = Trace()
+    return trace, _current.set(trace)
+
+
+def end_trace(token):
+    """Detach the trace started with start_trace."""
+    _current.reset(token)
+
+
+def current_trace():
+    """The active trace, or None."""
+    return _current.get()
+
+
+@contextmanager
+def span(name):
+    """Time the enclosed block as one run of the named stage of the active trace."""
+    trace = _current.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.record(name, time.perf_counter() - start)